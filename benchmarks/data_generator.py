@@ -0,0 +1,165 @@
+"""Deterministic synthetic data for benchmarks.
+
+Every generator takes a random.Random instance, so the same seed and
+scale always produce the same rows.
+"""
+import csv
+from datetime import date, datetime, timedelta
+
+JMENA = ['Karel', 'Jan', 'Petr', 'Jana', 'Marie', 'Eva', 'Josef', 'Božena',
+         'Jaroslav', 'Milan', 'Vítězslav', 'Alena', 'Ludvík', 'Věra', 'Bohumil']
+PRIJMENI = ['Čapek', 'Hašek', 'Němcová', 'Kundera', 'Hrabal', 'Seifert', 'Nezval',
+            'Škvorecký', 'Havel', 'Vaculík', 'Klíma', 'Viewegh', 'Körner', 'Erben', 'Mácha']
+ZEME = ['Česko', 'Slovensko', 'Německo', 'Rakousko', 'Polsko', None]
+SLOVA = ['válka', 'mlok', 'dobrý', 'voják', 'babička', 'žert', 'nesnesitelná', 'lehkost',
+         'bytí', 'ostře', 'sledované', 'vlaky', 'krysař', 'kytice', 'máj', 'zbabělci',
+         'hora', 'noc', 'město', 'řeka', 'zahrada', 'cesta', 'dům', 'světlo']
+ZANRY = ['Román', 'Poezie', 'Drama', 'Sci-fi', 'Fantasy', 'Detektivka', 'Historický',
+         'Povídky', 'Biografie', 'Cestopis', 'Horor', 'Thriller', 'Humor', 'Pohádky',
+         'Naučná', 'Filozofie', 'Psychologie', 'Kuchařka', 'Komiks', 'Encyklopedie']
+
+# Fixed reference point so generated dates do not depend on the current day
+EPOCH = date(2020, 1, 1)
+
+
+def scaled_sizes(scale):
+    """Row counts for a scale factor"""
+    return {
+        'zanry': len(ZANRY),
+        'autori': int(200 * scale),
+        'knihy': int(2000 * scale),
+        'ctenari': int(500 * scale),
+        'vypujcky': int(10000 * scale)
+    }
+
+
+def isbn13(number, prefix='978'):
+    """Build a valid ISBN-13 from a running number"""
+    digits = f"{prefix}{number % 10 ** (12 - len(prefix)):0{12 - len(prefix)}d}"
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits))
+    return digits + str((10 - total % 10) % 10)
+
+
+def generate_zanry():
+    """Rows (nazev, popis)"""
+    return [(nazev, f"Žánr {nazev.lower()}") for nazev in ZANRY]
+
+
+def generate_autori(rng, count):
+    """Rows (jmeno, prijmeni, datum_narozeni, zeme_puvodu)"""
+    rows = []
+    for i in range(count):
+        prijmeni = rng.choice(PRIJMENI)
+        if i >= len(PRIJMENI):
+            prijmeni = f"{prijmeni}{i}"
+        rows.append((
+            rng.choice(JMENA),
+            prijmeni,
+            EPOCH - timedelta(days=rng.randint(20 * 365, 90 * 365)),
+            rng.choice(ZEME)
+        ))
+    return rows
+
+
+def generate_title(rng):
+    return ' '.join(rng.choice(SLOVA) for _ in range(rng.randint(1, 4))).capitalize()
+
+
+def generate_knihy(rng, count, zanr_count, isbn_offset=0):
+    """Rows (nazev, isbn, rok_vydani, pocet_stran, hodnoceni, dostupna, zanr_id)"""
+    rows = []
+    for i in range(count):
+        rows.append((
+            f"{generate_title(rng)} {i}",
+            isbn13(isbn_offset + i) if rng.random() < 0.9 else None,
+            rng.randint(1850, 2024),
+            rng.randint(40, 900),
+            round(rng.uniform(0, 5), 1),
+            True,
+            rng.randint(1, zanr_count) if rng.random() < 0.95 else None
+        ))
+    return rows
+
+
+def generate_knihy_autori(rng, kniha_count, autor_count):
+    """Rows (kniha_id, autor_id, poradi), one to three autori per kniha"""
+    rows = []
+    for kniha_id in range(1, kniha_count + 1):
+        autori = rng.sample(range(1, autor_count + 1), min(autor_count, rng.choice((1, 1, 1, 2, 3))))
+        for poradi, autor_id in enumerate(autori, start=1):
+            rows.append((kniha_id, autor_id, poradi))
+    return rows
+
+
+def generate_ctenari(rng, count):
+    """Rows (jmeno, prijmeni, email, telefon, registrovan_od, aktivni)"""
+    rows = []
+    for i in range(count):
+        rows.append((
+            rng.choice(JMENA),
+            rng.choice(PRIJMENI),
+            f"ctenar{i}@example.com",
+            f"+420{rng.randint(600000000, 799999999)}",
+            EPOCH - timedelta(days=rng.randint(0, 3650)),
+            rng.random() < 0.9
+        ))
+    return rows
+
+
+def generate_vypujcky(rng, count, kniha_count, ctenar_count):
+    """
+    Rows (kniha_id, ctenar_id, datum_vypujceni, datum_vraceni,
+    predpokladane_vraceni, stav, poznamka) and the set of kniha IDs that
+    end up lent. The newest 5 % of loans stay open, each on a distinct kniha.
+    """
+    rows = []
+    lent = set()
+    open_from = int(count * 0.95)
+
+    for i in range(count):
+        datum_vypujceni = datetime.combine(EPOCH, datetime.min.time()) + timedelta(
+            days=i * 1800 // max(count, 1), minutes=rng.randint(0, 600))
+        predpokladane_vraceni = datum_vypujceni.date() + timedelta(days=30)
+        kniha_id = rng.randint(1, kniha_count)
+
+        if i >= open_from and kniha_id not in lent and len(lent) < kniha_count // 2:
+            lent.add(kniha_id)
+            stav = rng.choice(('active', 'active', 'overdue'))
+            datum_vraceni = None
+        else:
+            stav = 'returned' if rng.random() < 0.97 else 'cancelled'
+            datum_vraceni = datum_vypujceni + timedelta(days=rng.randint(1, 45))
+
+        rows.append((kniha_id, rng.randint(1, ctenar_count), datum_vypujceni, datum_vraceni,
+                     predpokladane_vraceni, stav, None))
+    return rows, lent
+
+
+def write_autori_csv(path, rng, count):
+    """Write an autori import file"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['jmeno', 'prijmeni', 'datum_narozeni', 'zeme_puvodu'])
+        for jmeno, prijmeni, datum_narozeni, zeme_puvodu in generate_autori(rng, count):
+            writer.writerow([jmeno, prijmeni, datum_narozeni.isoformat(), zeme_puvodu or ''])
+    return path
+
+
+def write_knihy_csv(path, rng, count, autor_prijmeni, isbn_offset):
+    """Write a knihy import file referencing existing zanry and autori"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nazev', 'isbn', 'rok_vydani', 'pocet_stran', 'hodnoceni',
+                         'dostupna', 'zanr_nazev', 'autor_prijmeni'])
+        for i in range(count):
+            writer.writerow([
+                f"{generate_title(rng)} import {i}",
+                isbn13(isbn_offset + i),
+                rng.randint(1850, 2024),
+                rng.randint(40, 900),
+                round(rng.uniform(0, 5), 1),
+                'ano',
+                rng.choice(ZANRY),
+                rng.choice(autor_prijmeni) if rng.random() < 0.8 else ''
+            ])
+    return path
@@ -0,0 +1,635 @@
+"""Benchmark suite for DAO, import, report and transaction hot paths.
+
+Creates a throwaway database, fills it with deterministic synthetic data
+and writes timings as JSON so runs can be compared over time:
+
+    python benchmarks/run_benchmarks.py --scale 1 --output bench.json
+    python benchmarks/run_benchmarks.py --output new.json --compare bench.json
+    python benchmarks/run_benchmarks.py --backend sqlite --output bench_sqlite.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from database import Database
+from dao import AutorDAO, ZanrDAO, KnihaDAO, CtenarDAO, VypujckaDAO, StatistikyDAO, LRUCache, CachedAutorDAO, CachedZanrDAO
+from dao.vypujcka_dao import VYPUJCKA_FIELDS
+from services import ImportService, ReportService, TransactionService
+import data_generator
+
+INSERT_CHUNK = 1000
+# Throwaway databases are dropped and recreated, only names ending like this
+THROWAWAY_SUFFIXES = ('_bench', '_stress')
+BENCHMARKS = []
+
+
+class Benchmark:
+    """One timed operation; fn(ctx) returns the number of operations done"""
+
+    def __init__(self, group, name, fn, teardown=None):
+        self.group = group
+        self.name = name
+        self.fn = fn
+        self.teardown = teardown
+
+
+def benchmark(group, teardown=None):
+    def register(fn):
+        BENCHMARKS.append(Benchmark(group, fn.__name__, fn, teardown))
+        return fn
+    return register
+
+
+class BenchmarkContext:
+    """Database, DAOs and services shared by all benchmarks"""
+
+    def __init__(self, db, sizes, seed, workdir):
+        self.db = db
+        self.sizes = sizes
+        self.seed = seed
+        self.workdir = workdir
+
+        self.autor_dao = AutorDAO(db)
+        self.zanr_dao = ZanrDAO(db)
+        self.kniha_dao = KnihaDAO(db)
+        self.ctenar_dao = CtenarDAO(db)
+        self.vypujcka_dao = VypujckaDAO(db)
+        self.import_service = ImportService(db, self.autor_dao, self.kniha_dao, self.zanr_dao)
+        # No summary cache, every call must hit the database
+        self.report_service = ReportService(db, summary_ttl=0)
+        self.transaction_service = TransactionService(db, self.kniha_dao, self.vypujcka_dao)
+
+        self._files = {}
+        self.baseline_ids = {}
+
+    def rng(self, name):
+        """Independent deterministic random stream per benchmark"""
+        return random.Random(f"{self.seed}:{name}")
+
+    def knihy_csv(self):
+        if 'knihy' not in self._files:
+            prijmeni = [row[1] for row in data_generator.generate_autori(self.rng('autori'), self.sizes['autori'])]
+            self._files['knihy'] = data_generator.write_knihy_csv(
+                os.path.join(self.workdir, 'knihy.csv'), self.rng('knihy_csv'),
+                max(self.sizes['knihy'] // 4, 1), prijmeni, isbn_offset=10 ** 8)
+        return self._files['knihy']
+
+    def autori_csv(self):
+        if 'autori' not in self._files:
+            self._files['autori'] = data_generator.write_autori_csv(
+                os.path.join(self.workdir, 'autori.csv'), self.rng('autori_csv'),
+                max(self.sizes['autori'], 1))
+        return self._files['autori']
+
+    def remember_max_ids(self):
+        for table in ('autori', 'knihy', 'vypujcky'):
+            result = self.db.execute_select(f"SELECT COALESCE(MAX(id), 0) as max_id FROM {table}")
+            self.baseline_ids[table] = result[0]['max_id']
+
+    def restore(self, table):
+        """Delete rows added by a benchmark run"""
+        self.db.execute_query(f"DELETE FROM {table} WHERE id > %s", (self.baseline_ids[table],))
+
+    def available_kniha_ids(self, count):
+        rows = self.db.execute_select(
+            "SELECT id FROM knihy WHERE dostupna = TRUE ORDER BY id LIMIT %s", (count,))
+        return [row['id'] for row in rows]
+
+    def output(self, name):
+        return os.path.join(self.workdir, name)
+
+
+# ==================== IMPORT ====================
+
+@benchmark('import', teardown=lambda ctx: ctx.restore('autori'))
+def import_autori(ctx):
+    return ctx.import_service.import_autori_from_csv(ctx.autori_csv())['imported']
+
+
+# Second run of the same file, every row is already present
+@benchmark('import', teardown=lambda ctx: ctx.restore('autori'))
+def import_autori_resync(ctx):
+    ctx.import_service.import_autori_from_csv(ctx.autori_csv())
+    return ctx.import_service.import_autori_from_csv(ctx.autori_csv())['skipped']
+
+
+@benchmark('import', teardown=lambda ctx: ctx.restore('knihy'))
+def import_knihy_per_row(ctx):
+    return ctx.import_service.import_knihy_from_csv(ctx.knihy_csv())['imported']
+
+
+@benchmark('import', teardown=lambda ctx: ctx.restore('knihy'))
+def import_knihy_batched(ctx):
+    return ctx.import_service.import_knihy_from_csv(ctx.knihy_csv(), batch_size=1000)['imported']
+
+
+# ==================== REPORTS ====================
+
+@benchmark('report')
+def knihy_report(ctx):
+    ctx.report_service.generate_knihy_report(ctx.output('report_knihy.csv'))
+    return ctx.report_service.last_report_stats['rows']
+
+
+@benchmark('report')
+def vypujcky_report(ctx):
+    ctx.report_service.generate_vypujcky_report(ctx.output('report_vypujcky.csv'))
+    return ctx.report_service.last_report_stats['rows']
+
+
+@benchmark('report')
+def ctenari_statistics(ctx):
+    ctx.report_service.generate_ctenari_statistics(ctx.output('report_ctenari.csv'))
+    return ctx.report_service.last_report_stats['rows']
+
+
+@benchmark('report')
+def summary_statistics(ctx):
+    for _ in range(20):
+        ctx.report_service.get_summary_statistics()
+    return 20
+
+
+@benchmark('report')
+def rebuild_statistics(ctx):
+    counts = StatistikyDAO(ctx.db).rebuild()
+    return sum(counts.values())
+
+
+def restore_archived(ctx):
+    """Move loans archived by a benchmark run back to vypujcky"""
+    with ctx.db.transaction() as cursor:
+        cursor.execute(f"INSERT INTO vypujcky ({VYPUJCKA_FIELDS}) SELECT {VYPUJCKA_FIELDS} FROM vypujcky_archiv")
+        cursor.execute("DELETE FROM vypujcky_archiv")
+
+
+# Closed loans from the first four of the five generated years
+@benchmark('report', teardown=restore_archived)
+def archive_closed_loans(ctx):
+    before = datetime.combine(data_generator.EPOCH + timedelta(days=4 * 365), datetime.min.time())
+    return ctx.vypujcka_dao.archive_closed_loans(before, batch_size=1000)
+
+
+# ==================== TRANSACTIONS ====================
+
+@benchmark('transaction', teardown=lambda ctx: ctx.restore('vypujcky'))
+def borrow_and_return(ctx):
+    kniha_ids = ctx.available_kniha_ids(200)
+    ctenar_count = ctx.sizes['ctenari']
+    termin = date.today() + timedelta(days=30)
+
+    loans = []
+    for i, kniha_id in enumerate(kniha_ids):
+        vypujcka_id = ctx.transaction_service.create_vypujcka_transaction(
+            kniha_id, i % ctenar_count + 1, termin)
+        loans.append((vypujcka_id, kniha_id))
+
+    for vypujcka_id, kniha_id in loans:
+        ctx.transaction_service.return_book_transaction(vypujcka_id, kniha_id)
+
+    return 2 * len(loans)
+
+
+@benchmark('transaction', teardown=lambda ctx: ctx.restore('vypujcky'))
+def borrow_and_return_batched(ctx):
+    kniha_ids = ctx.available_kniha_ids(200)
+    termin = date.today() + timedelta(days=30)
+
+    # Same 200 loans as borrow_and_return, in batches of 20 per ctenar
+    vypujcka_ids = []
+    for start in range(0, len(kniha_ids), 20):
+        result = ctx.transaction_service.borrow_books_transaction(
+            kniha_ids[start:start + 20], start // 20 % ctx.sizes['ctenari'] + 1, termin)
+        vypujcka_ids.extend(item['vypujcka_id'] for item in result['succeeded'])
+
+    for start in range(0, len(vypujcka_ids), 20):
+        ctx.transaction_service.return_books_transaction(vypujcka_ids[start:start + 20])
+
+    return 2 * len(vypujcka_ids)
+
+
+# ==================== DAO ====================
+
+@benchmark('dao')
+def knihy_get_all(ctx):
+    return len(ctx.kniha_dao.get_all())
+
+
+@benchmark('dao')
+def knihy_get_all_with_autori(ctx):
+    return len(ctx.kniha_dao.get_all(with_autori=True))
+
+
+@benchmark('dao')
+def knihy_get_available(ctx):
+    return len(ctx.kniha_dao.get_available())
+
+
+def get_knihy_by_id(ctx, prepared):
+    previous = ctx.db.prepared_statements
+    ctx.db.prepared_statements = prepared
+    try:
+        rng = ctx.rng('get_by_id')
+        for _ in range(1000):
+            ctx.kniha_dao.get_by_id(rng.randint(1, ctx.sizes['knihy']))
+        return 1000
+    finally:
+        ctx.db.prepared_statements = previous
+
+
+@benchmark('dao')
+def knihy_get_by_id(ctx):
+    return get_knihy_by_id(ctx, prepared=False)
+
+
+@benchmark('dao')
+def knihy_get_by_id_prepared(ctx):
+    return get_knihy_by_id(ctx, prepared=True)
+
+
+def isbn10(isbn13):
+    """Hyphenated ISBN-10 form of a 978 ISBN-13"""
+    digits = isbn13[3:12]
+    check = (11 - sum(int(d) * (10 - i) for i, d in enumerate(digits)) % 11) % 11
+    return f"{digits[0]}-{digits[1:9]}-{'X' if check == 10 else check}"
+
+
+@benchmark('dao')
+def knihy_get_by_isbn(ctx):
+    # Scans repeat: 1000 lookups over 200 distinct codes, half of them typed as ISBN-10
+    rows = ctx.db.execute_select_tuples("SELECT isbn FROM knihy WHERE isbn IS NOT NULL ORDER BY id LIMIT 200")
+    codes = [isbn if i % 2 else isbn10(isbn) for i, (isbn,) in enumerate(rows)]
+    rng = ctx.rng('get_by_isbn')
+    for _ in range(1000):
+        if ctx.kniha_dao.get_by_isbn(rng.choice(codes)) is None:
+            raise Exception("ISBN lookup missed a stored kniha")
+    return 1000
+
+
+@benchmark('dao')
+def knihy_page_walk(ctx):
+    pages = 0
+    after = None
+    while pages < 20:
+        page = ctx.kniha_dao.get_all_page(after=after, limit=100)
+        pages += 1
+        after = page['next_cursor']
+        if after is None:
+            break
+    return pages
+
+
+@benchmark('dao')
+def knihy_search_by_title(ctx):
+    for word in data_generator.SLOVA:
+        ctx.kniha_dao.search_by_title(word, limit=50)
+    return len(data_generator.SLOVA)
+
+
+@benchmark('dao')
+def autori_get_all(ctx):
+    return len(ctx.autor_dao.get_all())
+
+
+@benchmark('dao')
+def autori_get_by_id(ctx):
+    rng = ctx.rng('autori_get_by_id')
+    for _ in range(1000):
+        ctx.autor_dao.get_by_id(rng.randint(1, ctx.sizes['autori']))
+    return 1000
+
+
+@benchmark('dao')
+def autori_get_by_id_cached(ctx):
+    rng = ctx.rng('autori_get_by_id')
+    cached = CachedAutorDAO(ctx.autor_dao, LRUCache(capacity=ctx.sizes['autori']))
+    for _ in range(1000):
+        cached.get_by_id(rng.randint(1, ctx.sizes['autori']))
+    return 1000
+
+
+@benchmark('dao')
+def zanry_get_all_cached(ctx):
+    cached = CachedZanrDAO(ctx.zanr_dao, LRUCache(capacity=10))
+    for _ in range(1000):
+        cached.get_all()
+    return 1000
+
+
+@benchmark('dao')
+def autori_search_by_name(ctx):
+    for prijmeni in data_generator.PRIJMENI:
+        ctx.autor_dao.search_by_name(prijmeni)
+    return len(data_generator.PRIJMENI)
+
+
+@benchmark('dao')
+def ctenari_get_all(ctx):
+    return len(ctx.ctenar_dao.get_all())
+
+
+@benchmark('dao')
+def ctenari_search_by_name(ctx):
+    for jmeno in data_generator.JMENA:
+        ctx.ctenar_dao.search_by_name(jmeno)
+    return len(data_generator.JMENA)
+
+
+@benchmark('dao')
+def vypujcky_get_all(ctx):
+    return len(ctx.vypujcka_dao.get_all())
+
+
+@benchmark('dao')
+def vypujcky_get_active(ctx):
+    return len(ctx.vypujcka_dao.get_active()) + len(ctx.vypujcka_dao.get_overdue())
+
+
+@benchmark('dao')
+def vypujcky_get_by_ctenar(ctx):
+    count = min(ctx.sizes['ctenari'], 200)
+    for ctenar_id in range(1, count + 1):
+        ctx.vypujcka_dao.get_by_ctenar(ctenar_id)
+    return count
+
+
+@benchmark('dao')
+def vypujcky_get_by_ctenar_with_archive(ctx):
+    count = min(ctx.sizes['ctenari'], 200)
+    for ctenar_id in range(1, count + 1):
+        ctx.vypujcka_dao.get_by_ctenar(ctenar_id, include_archive=True)
+    return count
+
+
+# ==================== SETUP ====================
+
+def split_sql(script):
+    """Split an SQL script into statements, dropping comment lines"""
+    lines = [line for line in script.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def create_mysql_database(db_config, name):
+    """(Re)create the throwaway benchmark database from sql/schema.sql and views.sql"""
+    import mysql.connector
+
+    check_throwaway_name(db_config, name)
+
+    script = ''
+    for file_name in ('schema.sql', 'views.sql'):
+        with open(os.path.join(ROOT, 'sql', file_name), encoding='utf-8') as f:
+            script += f.read().replace('knihovna_db', name) + ';\n'
+
+    connection = mysql.connector.connect(
+        host=db_config['host'],
+        port=db_config.get('port', 3306),
+        user=db_config['user'],
+        password=db_config['password']
+    )
+    cursor = connection.cursor()
+    for statement in split_sql(script):
+        cursor.execute(statement)
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+
+def drop_mysql_database(db, name):
+    check_throwaway_name({}, name)
+    db.execute_query(f"DROP DATABASE IF EXISTS {name}")
+
+
+def sqlite_files(path):
+    return [path, path + '-wal', path + '-shm']
+
+
+def check_throwaway_name(db_config, name):
+    """Refuse names that could point at a real database, they are dropped without asking"""
+    if not re.match(r'^\w+$', name):
+        raise ValueError(f"Invalid benchmark database name {name!r}")
+    if name == db_config.get('database') or not name.endswith(THROWAWAY_SUFFIXES):
+        raise ValueError(f"Refusing to drop database {name!r}, "
+                         f"benchmark database names must end with {' or '.join(THROWAWAY_SUFFIXES)}")
+
+
+def create_database(db_config, backend, name):
+    """Create an empty throwaway database, returns the config to open it with"""
+    check_throwaway_name(db_config, name)
+    if backend == 'sqlite':
+        # Database file in the current directory, the schema is created on connect
+        path = os.path.abspath(f"{name}.db")
+        for file_name in sqlite_files(path):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+        return dict(db_config, engine='sqlite', sqlite=dict(db_config.get('sqlite') or {}, path=path))
+
+    db_config = dict(db_config, engine='mysql', database=name)
+    create_mysql_database(db_config, name)
+    return db_config
+
+
+def close_database(db, db_config, drop):
+    """Close the throwaway database, dropping it unless it should be kept"""
+    if db_config['engine'] == 'sqlite':
+        db.close()
+        if drop:
+            for file_name in sqlite_files(db_config['sqlite']['path']):
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+        return
+
+    if drop:
+        drop_mysql_database(db, db_config['database'])
+    db.close()
+
+
+def insert_chunked(db, query, rows):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        db.execute_many(query, rows[start:start + INSERT_CHUNK])
+
+
+def load_data(db, sizes, seed):
+    """Fill an empty database with synthetic data"""
+    rng = random.Random(seed)
+
+    insert_chunked(db, "INSERT INTO zanry (nazev, popis) VALUES (%s, %s)",
+                   data_generator.generate_zanry())
+    insert_chunked(db, """
+        INSERT INTO autori (jmeno, prijmeni, datum_narozeni, zeme_puvodu)
+        VALUES (%s, %s, %s, %s)
+    """, data_generator.generate_autori(rng, sizes['autori']))
+    insert_chunked(db, """
+        INSERT INTO knihy (nazev, isbn, rok_vydani, pocet_stran, hodnoceni, dostupna, zanr_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, data_generator.generate_knihy(rng, sizes['knihy'], sizes['zanry']))
+    # Generated ISBNs are already canonical ISBN-13
+    db.execute_query("UPDATE knihy SET isbn13 = isbn WHERE isbn IS NOT NULL")
+    insert_chunked(db, "INSERT INTO knihy_autori (kniha_id, autor_id, poradi) VALUES (%s, %s, %s)",
+                   data_generator.generate_knihy_autori(rng, sizes['knihy'], sizes['autori']))
+    insert_chunked(db, """
+        INSERT INTO ctenari (jmeno, prijmeni, email, telefon, registrovan_od, aktivni)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, data_generator.generate_ctenari(rng, sizes['ctenari']))
+
+    vypujcky, lent = data_generator.generate_vypujcky(rng, sizes['vypujcky'], sizes['knihy'], sizes['ctenari'])
+    insert_chunked(db, """
+        INSERT INTO vypujcky (kniha_id, ctenar_id, datum_vypujceni, datum_vraceni,
+                              predpokladane_vraceni, stav, poznamka)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, vypujcky)
+    # One exemplar per kniha, the lent ones held by their open vypujcka
+    db.execute_query("INSERT INTO exemplare (kniha_id) SELECT id FROM knihy")
+    lent_ids = [(kniha_id,) for kniha_id in sorted(lent)]
+    insert_chunked(db, "UPDATE knihy SET dostupna = FALSE, dostupne_exemplare = 0 WHERE id = %s", lent_ids)
+    insert_chunked(db, "UPDATE exemplare SET stav = 'vypujceny' WHERE kniha_id = %s", lent_ids)
+    db.execute_query("""
+        UPDATE vypujcky
+        SET exemplar_id = (SELECT MIN(e.id) FROM exemplare e WHERE e.kniha_id = vypujcky.kniha_id)
+        WHERE stav IN ('active', 'overdue')
+    """)
+    StatistikyDAO(db).rebuild()
+
+
+# ==================== RUNNER ====================
+
+def run_benchmark(ctx, bench, repeat):
+    times = []
+    ops = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ops = bench.fn(ctx)
+        times.append(time.perf_counter() - started)
+        if bench.teardown:
+            bench.teardown(ctx)
+
+    best = min(times)
+    return {
+        'group': bench.group,
+        'name': bench.name,
+        'ops': ops,
+        'times': times,
+        'min': best,
+        'median': statistics.median(times),
+        'ops_per_sec': ops / best if best > 0 else None
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_file):
+    """Print median ratios against a previous results file"""
+    with open(baseline_file, encoding='utf-8') as f:
+        baseline = {(r['group'], r['name']): r for r in json.load(f)['results']}
+
+    print(f"\n{'benchmark':45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in results:
+        previous = baseline.get((result['group'], result['name']))
+        if not previous:
+            continue
+        ratio = result['median'] / previous['median'] if previous['median'] else float('nan')
+        print(f"{result['group'] + '.' + result['name']:45} "
+              f"{previous['median']:10.4f} {result['median']:10.4f} {ratio:7.2f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run Knihovna benchmarks")
+    parser.add_argument('--config', default=os.path.join(ROOT, 'config.json'),
+                        help="config file with database credentials")
+    parser.add_argument('--database', default='knihovna_bench',
+                        help="throwaway database name (dropped and recreated)")
+    parser.add_argument('--backend', choices=('mysql', 'sqlite'), default='mysql',
+                        help="storage engine to benchmark")
+    parser.add_argument('--scale', type=float, default=1.0, help="data size multiplier")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--group', action='append',
+                        help="only run this group (import, report, transaction, dao)")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="previous results file to compare against")
+    parser.add_argument('--keep', action='store_true', help="keep the benchmark database")
+    parser.add_argument('--query-stats', action='store_true',
+                        help="record per-statement timings and add the top statements to the output")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = data_generator.scaled_sizes(args.scale)
+
+    db_config = create_database(Config(args.config).get_database_config(), args.backend, args.database)
+    db_config['query_stats'] = {'enabled': args.query_stats, 'slow_query_ms': None}
+    db = Database(db_config)
+    workdir = tempfile.mkdtemp(prefix='knihovna_bench_')
+
+    try:
+        started = time.perf_counter()
+        load_data(db, sizes, args.seed)
+        print(f"Loaded synthetic data {sizes} in {time.perf_counter() - started:.1f}s")
+
+        ctx = BenchmarkContext(db, sizes, args.seed, workdir)
+        ctx.remember_max_ids()
+        db.reset_query_stats()
+
+        results = []
+        for bench in BENCHMARKS:
+            if args.group and bench.group not in args.group:
+                continue
+            result = run_benchmark(ctx, bench, args.repeat)
+            results.append(result)
+            print(f"{bench.group + '.' + bench.name:45} {result['median']:9.4f}s  {result['ops']} ops")
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'backend': args.backend,
+                'scale': args.scale,
+                'seed': args.seed,
+                'repeat': args.repeat,
+                'sizes': sizes,
+                'pool': db.get_pool_stats()
+            },
+            'results': results
+        }
+        if args.query_stats:
+            report['queries'] = db.get_query_stats(limit=25)['queries']
+            print("Most expensive statements:")
+            for query in report['queries'][:10]:
+                print(f"{query['total_ms']:10.1f}ms {query['count']:7} x  p95 {query['p95_ms']}ms  "
+                      f"{query['caller']}  {query['fingerprint'][:80]}")
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+        if args.compare:
+            compare(results, args.compare)
+
+    finally:
+        close_database(db, db_config, drop=not args.keep)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Concurrent borrow stress test.
+
+Many threads keep borrowing and returning a small set of knihy through
+TransactionService at the same time, then the database is checked for
+double lending: no exemplar may have more than one open vypujcka, every
+open vypujcka must hold a lent exemplar, and the knihy counters and loan
+statistics must match the rows they count.
+
+    python benchmarks/stress_borrow.py --threads 16 --knihy 20 --copies 3 --seconds 30
+
+Exits with status 1 when an invariant is violated.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+from run_benchmarks import ROOT, create_database, close_database, load_data
+from config import Config
+from database import Database
+from dao import KnihaDAO, VypujckaDAO, ExemplarDAO
+from models import Exemplar
+from services import TransactionService, BookAlreadyLentError, VypujckaNotActiveError
+import data_generator
+
+
+def worker(service, kniha_ids, ctenar_count, deadline, seed, counters, lock):
+    rng = random.Random(seed)
+    mine = []
+    local = {'borrowed': 0, 'already_lent': 0, 'returned': 0, 'errors': 0}
+
+    while time.monotonic() < deadline:
+        try:
+            # Return about half of the time so knihy keep changing hands
+            if mine and rng.random() < 0.5:
+                vypujcka_id, kniha_id = mine.pop(rng.randrange(len(mine)))
+                service.return_book_transaction(vypujcka_id, kniha_id)
+                local['returned'] += 1
+            else:
+                kniha_id = rng.choice(kniha_ids)
+                vypujcka_id = service.create_vypujcka_transaction(
+                    kniha_id, rng.randint(1, ctenar_count), date.today() + timedelta(days=30))
+                mine.append((vypujcka_id, kniha_id))
+                local['borrowed'] += 1
+        except BookAlreadyLentError:
+            local['already_lent'] += 1
+        except VypujckaNotActiveError:
+            local['errors'] += 1
+        except Exception as e:
+            local['errors'] += 1
+            print(f"error: {e}", file=sys.stderr)
+
+    with lock:
+        for key, value in local.items():
+            counters[key] += value
+
+
+def check_invariants(db, kniha_ids):
+    """Return a list of violations"""
+    placeholders = ', '.join(['%s'] * len(kniha_ids))
+    violations = []
+
+    rows = db.execute_select(f"""
+        SELECT exemplar_id, COUNT(*) AS pocet FROM vypujcky
+        WHERE stav IN ('active', 'overdue') AND kniha_id IN ({placeholders})
+        GROUP BY exemplar_id HAVING COUNT(*) > 1
+    """, tuple(kniha_ids))
+    for row in rows:
+        violations.append(f"exemplar {row['exemplar_id']} has {row['pocet']} open vypujcky")
+
+    rows = db.execute_select(f"""
+        SELECT v.id FROM vypujcky v LEFT JOIN exemplare e ON e.id = v.exemplar_id
+        WHERE v.stav IN ('active', 'overdue') AND v.kniha_id IN ({placeholders})
+          AND (e.id IS NULL OR e.stav != 'vypujceny')
+    """, tuple(kniha_ids))
+    for row in rows:
+        violations.append(f"vypujcka {row['id']} is open but its exemplar is not lent")
+
+    rows = db.execute_select(f"""
+        SELECT k.id, k.dostupna, k.dostupne_exemplare,
+               (SELECT COUNT(*) FROM exemplare e WHERE e.kniha_id = k.id AND e.stav = 'dostupny') AS skutecne
+        FROM knihy k WHERE k.id IN ({placeholders})
+    """, tuple(kniha_ids))
+    for row in rows:
+        if row['dostupne_exemplare'] != row['skutecne'] or bool(row['dostupna']) != (row['skutecne'] > 0):
+            violations.append(f"kniha {row['id']} counts {row['dostupne_exemplare']} available exemplare "
+                              f"(dostupna={bool(row['dostupna'])}) but has {row['skutecne']}")
+
+    rows = db.execute_select(f"""
+        SELECT k.id,
+               COALESCE(s.aktivnich_vypujcek + s.po_terminu, 0) AS pocitano,
+               (SELECT COUNT(*) FROM vypujcky v
+                WHERE v.kniha_id = k.id AND v.stav IN ('active', 'overdue')) AS skutecne
+        FROM knihy k LEFT JOIN statistiky_knih s ON s.kniha_id = k.id
+        WHERE k.id IN ({placeholders})
+    """, tuple(kniha_ids))
+    for row in rows:
+        if row['pocitano'] != row['skutecne']:
+            violations.append(f"kniha {row['id']} statistics count {row['pocitano']} open vypujcky "
+                              f"but has {row['skutecne']}")
+
+    return violations
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent borrow stress test")
+    parser.add_argument('--config', default=os.path.join(ROOT, 'config.json'))
+    parser.add_argument('--database', default='knihovna_stress',
+                        help="throwaway database name (dropped and recreated)")
+    parser.add_argument('--backend', choices=('mysql', 'sqlite'), default='mysql')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--knihy', type=int, default=20, help="number of contended knihy")
+    parser.add_argument('--copies', type=int, default=1, help="exemplare per contended kniha")
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help="keep the stress database")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = data_generator.scaled_sizes(0.1)
+
+    db_config = create_database(Config(args.config).get_database_config(), args.backend, args.database)
+    # Every thread needs its own connection
+    pool_config = dict(db_config.get('pool') or {}, enabled=True)
+    pool_config['size'] = max(pool_config.get('size', 5), args.threads)
+    db_config['pool'] = pool_config
+
+    db = Database(db_config)
+
+    try:
+        load_data(db, sizes, args.seed)
+        rows = db.execute_select(
+            "SELECT id FROM knihy WHERE dostupna = TRUE ORDER BY id LIMIT %s", (args.knihy,))
+        kniha_ids = [row['id'] for row in rows]
+        exemplar_dao = ExemplarDAO(db)
+        for kniha_id in kniha_ids:
+            for _ in range(args.copies - 1):
+                exemplar_dao.create(Exemplar(kniha_id=kniha_id))
+
+        service = TransactionService(db, KnihaDAO(db), VypujckaDAO(db))
+        counters = {'borrowed': 0, 'already_lent': 0, 'returned': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + args.seconds
+
+        threads = [
+            threading.Thread(target=worker, args=(service, kniha_ids, sizes['ctenari'], deadline,
+                                                  args.seed + i, counters, lock))
+            for i in range(args.threads)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        attempts = counters['borrowed'] + counters['already_lent']
+        print(f"{args.threads} threads, {len(kniha_ids)} knihy x {args.copies} exemplare, {elapsed:.1f}s")
+        print(f"borrowed {counters['borrowed']}, already lent {counters['already_lent']}, "
+              f"returned {counters['returned']}, errors {counters['errors']}, "
+              f"{attempts / elapsed:.0f} borrow attempts/s")
+
+        violations = check_invariants(db, kniha_ids)
+        for violation in violations:
+            print(f"VIOLATION: {violation}")
+        if violations:
+            return 1
+        print("OK: no double lending")
+        return 0
+    finally:
+        close_database(db, db_config, drop=not args.keep)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
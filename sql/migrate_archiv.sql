@@ -0,0 +1,24 @@
+-- Migrace: archiv uzavřených výpůjček
+-- Přesun starých výpůjček provádí src/archive_vypujcky.py (po dávkách, lze spouštět opakovaně)
+USE knihovna_db;
+
+CREATE TABLE vypujcky_archiv (
+    id INT PRIMARY KEY,
+    kniha_id INT NOT NULL,
+    exemplar_id INT,
+    ctenar_id INT NOT NULL,
+    datum_vypujceni DATETIME NOT NULL,
+    datum_vraceni DATETIME,
+    predpokladane_vraceni DATE NOT NULL,
+    stav ENUM('returned', 'cancelled') NOT NULL,
+    poznamka TEXT,
+    created_at DATETIME,
+    archivovano DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE,
+    FOREIGN KEY (exemplar_id) REFERENCES exemplare(id) ON DELETE SET NULL,
+    FOREIGN KEY (ctenar_id) REFERENCES ctenari(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE INDEX idx_archiv_datum ON vypujcky_archiv(datum_vypujceni, id);
+CREATE INDEX idx_archiv_ctenar_datum ON vypujcky_archiv(ctenar_id, datum_vypujceni, id);
+CREATE INDEX idx_archiv_kniha_datum ON vypujcky_archiv(kniha_id, datum_vypujceni, id);
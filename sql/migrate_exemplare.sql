@@ -0,0 +1,49 @@
+-- Migrace existující databáze na model s exempláři (výtisky)
+-- Každá kniha dostane jeden exemplář, aktivní výpůjčky se k němu připojí.
+USE knihovna_db;
+
+ALTER TABLE knihy
+    ADD COLUMN pocet_exemplaru INT NOT NULL DEFAULT 1 AFTER dostupna,
+    ADD COLUMN dostupne_exemplare INT NOT NULL DEFAULT 1 AFTER pocet_exemplaru;
+
+CREATE TABLE exemplare (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    kniha_id INT NOT NULL,
+    inventarni_cislo VARCHAR(30) UNIQUE,
+    stav ENUM('dostupny', 'vypujceny', 'vyrazeny') NOT NULL DEFAULT 'dostupny',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+ALTER TABLE vypujcky
+    ADD COLUMN exemplar_id INT AFTER kniha_id,
+    ADD FOREIGN KEY (exemplar_id) REFERENCES exemplare(id) ON DELETE SET NULL;
+
+CREATE INDEX idx_exemplare_kniha_stav ON exemplare(kniha_id, stav);
+CREATE INDEX idx_knihy_dostupna ON knihy(dostupna, nazev, id);
+
+-- Jeden exemplář na knihu, která je dostupná nebo má otevřenou výpůjčku.
+-- Stav exempláře určuje otevřená výpůjčka, ne příznak dostupna (ten šlo
+-- dříve nastavit i bez výpůjčky). Kniha nedostupná bez výpůjčky nedostane
+-- žádný exemplář, stejně jako nová kniha z KnihaDAO.create.
+INSERT INTO exemplare (kniha_id, stav)
+SELECT k.id,
+       IF(EXISTS (SELECT 1 FROM vypujcky v
+                  WHERE v.kniha_id = k.id AND v.stav IN ('active', 'overdue')),
+          'vypujceny', 'dostupny')
+FROM knihy k
+WHERE k.dostupna
+   OR EXISTS (SELECT 1 FROM vypujcky v
+              WHERE v.kniha_id = k.id AND v.stav IN ('active', 'overdue'));
+
+-- Otevřené výpůjčky drží exemplář své knihy
+UPDATE vypujcky v
+JOIN exemplare e ON e.kniha_id = v.kniha_id
+SET v.exemplar_id = e.id
+WHERE v.stav IN ('active', 'overdue');
+
+-- Počty podle skutečných exemplářů (MySQL přiřazuje zleva doprava)
+UPDATE knihy k
+SET pocet_exemplaru = (SELECT COUNT(*) FROM exemplare e WHERE e.kniha_id = k.id),
+    dostupne_exemplare = (SELECT COUNT(*) FROM exemplare e WHERE e.kniha_id = k.id AND e.stav = 'dostupny'),
+    dostupna = dostupne_exemplare > 0;
@@ -0,0 +1,8 @@
+-- Migrace: kanonický sloupec isbn13 pro vyhledávání podle ISBN / čárového kódu
+-- Existující ISBN (ISBN-10 i ISBN-13 s pomlčkami) převede na ISBN-13:
+--     python src/backfill_isbn13.py --config config.json
+USE knihovna_db;
+
+ALTER TABLE knihy
+    ADD COLUMN isbn13 CHAR(13) NULL AFTER isbn,
+    ADD UNIQUE KEY uq_knihy_isbn13 (isbn13);
@@ -0,0 +1,47 @@
+-- Migrace: tabulky statistik výpůjček naplněné z historie výpůjček
+-- Stejný výpočet provádí src/rebuild_statistics.py
+USE knihovna_db;
+
+CREATE TABLE statistiky_knih (
+    kniha_id INT PRIMARY KEY,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE statistiky_ctenaru (
+    ctenar_id INT PRIMARY KEY,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME,
+    FOREIGN KEY (ctenar_id) REFERENCES ctenari(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+INSERT INTO statistiky_knih (kniha_id, pocet_vypujcek, aktivnich_vypujcek, vraceno,
+                             po_terminu, zruseno, posledni_vypujcka)
+SELECT kniha_id, COUNT(*),
+       SUM(CASE WHEN stav = 'active' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'returned' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'overdue' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'cancelled' THEN 1 ELSE 0 END),
+       MAX(datum_vypujceni)
+FROM vypujcky
+GROUP BY kniha_id;
+
+INSERT INTO statistiky_ctenaru (ctenar_id, pocet_vypujcek, aktivnich_vypujcek, vraceno,
+                                po_terminu, zruseno, posledni_vypujcka)
+SELECT ctenar_id, COUNT(*),
+       SUM(CASE WHEN stav = 'active' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'returned' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'overdue' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN stav = 'cancelled' THEN 1 ELSE 0 END),
+       MAX(datum_vypujceni)
+FROM vypujcky
+GROUP BY ctenar_id;
@@ -23,19 +23,35 @@ CREATE TABLE zanry (
 
 -- Tabulka: knihy
 -- Obsahuje: VARCHAR (nazev, isbn), FLOAT (hodnoceni), BOOLEAN (dostupna), DATE (rok_vydani)
+-- isbn13 je kanonický tvar isbn (ISBN-13 bez pomlček) pro vyhledávání podle čárového kódu
+-- pocet_exemplaru a dostupne_exemplare jsou udržované čítače nad tabulkou exemplare,
+-- dostupna = (dostupne_exemplare > 0)
 CREATE TABLE knihy (
     id INT AUTO_INCREMENT PRIMARY KEY,
     nazev VARCHAR(255) NOT NULL,
     isbn VARCHAR(20) UNIQUE,
+    isbn13 CHAR(13) UNIQUE,
     rok_vydani INT,
     pocet_stran INT,
     hodnoceni FLOAT DEFAULT 0.0 CHECK (hodnoceni >= 0.0 AND hodnoceni <= 5.0),
     dostupna BOOLEAN DEFAULT TRUE,
+    pocet_exemplaru INT NOT NULL DEFAULT 1,
+    dostupne_exemplare INT NOT NULL DEFAULT 1,
     zanr_id INT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (zanr_id) REFERENCES zanry(id) ON DELETE SET NULL
 ) ENGINE=InnoDB;
 
+-- Tabulka: exemplare (jednotlivé výtisky knihy)
+CREATE TABLE exemplare (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    kniha_id INT NOT NULL,
+    inventarni_cislo VARCHAR(30) UNIQUE,
+    stav ENUM('dostupny', 'vypujceny', 'vyrazeny') NOT NULL DEFAULT 'dostupny',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 -- Tabulka: ctenari
 CREATE TABLE ctenari (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -53,6 +69,7 @@ CREATE TABLE ctenari (
 CREATE TABLE vypujcky (
     id INT AUTO_INCREMENT PRIMARY KEY,
     kniha_id INT NOT NULL,
+    exemplar_id INT,
     ctenar_id INT NOT NULL,
     datum_vypujceni DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     datum_vraceni DATETIME,
@@ -61,6 +78,28 @@ CREATE TABLE vypujcky (
     poznamka TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE,
+    FOREIGN KEY (exemplar_id) REFERENCES exemplare(id) ON DELETE SET NULL,
+    FOREIGN KEY (ctenar_id) REFERENCES ctenari(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Tabulka: vypujcky_archiv
+-- Uzavřené (returned / cancelled) výpůjčky starší než archive.older_than_days,
+-- přesouvá je src/archive_vypujcky.py; vypujcky tak obsahuje jen živá data.
+-- Ve statistikách zůstávají započítané.
+CREATE TABLE vypujcky_archiv (
+    id INT PRIMARY KEY,
+    kniha_id INT NOT NULL,
+    exemplar_id INT,
+    ctenar_id INT NOT NULL,
+    datum_vypujceni DATETIME NOT NULL,
+    datum_vraceni DATETIME,
+    predpokladane_vraceni DATE NOT NULL,
+    stav ENUM('returned', 'cancelled') NOT NULL,
+    poznamka TEXT,
+    created_at DATETIME,
+    archivovano DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE,
+    FOREIGN KEY (exemplar_id) REFERENCES exemplare(id) ON DELETE SET NULL,
     FOREIGN KEY (ctenar_id) REFERENCES ctenari(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
@@ -74,8 +113,52 @@ CREATE TABLE knihy_autori (
     FOREIGN KEY (autor_id) REFERENCES autori(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
+-- Tabulky: statistiky_knih, statistiky_ctenaru
+-- Průběžně udržované čítače výpůjček (TransactionService, VypujckaDAO),
+-- opravu provede src/rebuild_statistics.py
+CREATE TABLE statistiky_knih (
+    kniha_id INT PRIMARY KEY,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME,
+    FOREIGN KEY (kniha_id) REFERENCES knihy(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE statistiky_ctenaru (
+    ctenar_id INT PRIMARY KEY,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME,
+    FOREIGN KEY (ctenar_id) REFERENCES ctenari(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 -- Indexy pro lepší výkon
 CREATE INDEX idx_knihy_zanr ON knihy(zanr_id);
 CREATE INDEX idx_vypujcky_kniha ON vypujcky(kniha_id);
 CREATE INDEX idx_vypujcky_ctenar ON vypujcky(ctenar_id);
 CREATE INDEX idx_vypujcky_stav ON vypujcky(stav);
+CREATE INDEX idx_vypujcky_stav_termin ON vypujcky(stav, predpokladane_vraceni);
+CREATE INDEX idx_exemplare_kniha_stav ON exemplare(kniha_id, stav);
+CREATE INDEX idx_knihy_dostupna ON knihy(dostupna, nazev, id);
+
+-- Indexy pro stránkování (keyset) podle řazení seznamů
+CREATE INDEX idx_knihy_nazev ON knihy(nazev, id);
+CREATE INDEX idx_autori_jmeno ON autori(prijmeni, jmeno, id);
+CREATE INDEX idx_ctenari_jmeno ON ctenari(prijmeni, jmeno, id);
+CREATE INDEX idx_vypujcky_datum ON vypujcky(datum_vypujceni, id);
+CREATE INDEX idx_vypujcky_ctenar_datum ON vypujcky(ctenar_id, datum_vypujceni, id);
+CREATE INDEX idx_vypujcky_kniha_datum ON vypujcky(kniha_id, datum_vypujceni, id);
+CREATE INDEX idx_archiv_datum ON vypujcky_archiv(datum_vypujceni, id);
+CREATE INDEX idx_archiv_ctenar_datum ON vypujcky_archiv(ctenar_id, datum_vypujceni, id);
+CREATE INDEX idx_archiv_kniha_datum ON vypujcky_archiv(kniha_id, datum_vypujceni, id);
+
+-- Fulltextové indexy pro vyhledávání (search mode "fulltext")
+CREATE FULLTEXT INDEX ft_knihy_nazev ON knihy(nazev);
+CREATE FULLTEXT INDEX ft_autori_jmeno ON autori(jmeno, prijmeni);
+CREATE FULLTEXT INDEX ft_ctenari_jmeno ON ctenari(jmeno, prijmeni);
@@ -0,0 +1,180 @@
+-- Schéma pro vestavěný SQLite backend (database.engine = "sqlite")
+-- Odpovídá schema.sql; SQLite backend ho použije při prvním otevření prázdné databáze.
+-- ENUM je nahrazen CHECK omezením, časy se ukládají v lokálním čase jako MySQL.
+
+-- Tabulka: autori
+CREATE TABLE autori (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jmeno VARCHAR(100) NOT NULL,
+    prijmeni VARCHAR(100) NOT NULL,
+    datum_narozeni DATE,
+    zeme_puvodu VARCHAR(100),
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: zanry
+CREATE TABLE zanry (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nazev VARCHAR(50) NOT NULL UNIQUE,
+    popis TEXT,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: knihy
+-- isbn13 je kanonický tvar isbn (ISBN-13 bez pomlček) pro vyhledávání podle čárového kódu
+-- pocet_exemplaru a dostupne_exemplare jsou udržované čítače nad tabulkou exemplare,
+-- dostupna = (dostupne_exemplare > 0)
+CREATE TABLE knihy (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nazev VARCHAR(255) NOT NULL,
+    isbn VARCHAR(20) UNIQUE,
+    isbn13 CHAR(13) UNIQUE,
+    rok_vydani INT,
+    pocet_stran INT,
+    hodnoceni FLOAT DEFAULT 0.0 CHECK (hodnoceni >= 0.0 AND hodnoceni <= 5.0),
+    dostupna BOOLEAN DEFAULT TRUE,
+    pocet_exemplaru INT NOT NULL DEFAULT 1,
+    dostupne_exemplare INT NOT NULL DEFAULT 1,
+    zanr_id INT REFERENCES zanry(id) ON DELETE SET NULL,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: exemplare (jednotlivé výtisky knihy)
+CREATE TABLE exemplare (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kniha_id INT NOT NULL REFERENCES knihy(id) ON DELETE CASCADE,
+    inventarni_cislo VARCHAR(30) UNIQUE,
+    stav VARCHAR(10) NOT NULL DEFAULT 'dostupny'
+        CHECK (stav IN ('dostupny', 'vypujceny', 'vyrazeny')),
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: ctenari
+CREATE TABLE ctenari (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jmeno VARCHAR(100) NOT NULL,
+    prijmeni VARCHAR(100) NOT NULL,
+    email VARCHAR(150) UNIQUE NOT NULL,
+    telefon VARCHAR(20),
+    registrovan_od DATE NOT NULL,
+    aktivni BOOLEAN DEFAULT TRUE,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: vypujcky
+CREATE TABLE vypujcky (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kniha_id INT NOT NULL REFERENCES knihy(id) ON DELETE CASCADE,
+    exemplar_id INT REFERENCES exemplare(id) ON DELETE SET NULL,
+    ctenar_id INT NOT NULL REFERENCES ctenari(id) ON DELETE CASCADE,
+    datum_vypujceni DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    datum_vraceni DATETIME,
+    predpokladane_vraceni DATE NOT NULL,
+    stav VARCHAR(10) NOT NULL DEFAULT 'active'
+        CHECK (stav IN ('active', 'returned', 'overdue', 'cancelled')),
+    poznamka TEXT,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Tabulka: vypujcky_archiv (uzavřené výpůjčky, viz schema.sql)
+CREATE TABLE vypujcky_archiv (
+    id INTEGER PRIMARY KEY,
+    kniha_id INT NOT NULL REFERENCES knihy(id) ON DELETE CASCADE,
+    exemplar_id INT REFERENCES exemplare(id) ON DELETE SET NULL,
+    ctenar_id INT NOT NULL REFERENCES ctenari(id) ON DELETE CASCADE,
+    datum_vypujceni DATETIME NOT NULL,
+    datum_vraceni DATETIME,
+    predpokladane_vraceni DATE NOT NULL,
+    stav VARCHAR(10) NOT NULL CHECK (stav IN ('returned', 'cancelled')),
+    poznamka TEXT,
+    created_at DATETIME,
+    archivovano DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Vazební tabulka: knihy_autori (M:N vazba)
+CREATE TABLE knihy_autori (
+    kniha_id INT NOT NULL REFERENCES knihy(id) ON DELETE CASCADE,
+    autor_id INT NOT NULL REFERENCES autori(id) ON DELETE CASCADE,
+    poradi INT DEFAULT 1,
+    PRIMARY KEY (kniha_id, autor_id)
+);
+
+-- Tabulky: statistiky_knih, statistiky_ctenaru
+CREATE TABLE statistiky_knih (
+    kniha_id INT PRIMARY KEY REFERENCES knihy(id) ON DELETE CASCADE,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME
+);
+
+CREATE TABLE statistiky_ctenaru (
+    ctenar_id INT PRIMARY KEY REFERENCES ctenari(id) ON DELETE CASCADE,
+    pocet_vypujcek INT NOT NULL DEFAULT 0,
+    aktivnich_vypujcek INT NOT NULL DEFAULT 0,
+    vraceno INT NOT NULL DEFAULT 0,
+    po_terminu INT NOT NULL DEFAULT 0,
+    zruseno INT NOT NULL DEFAULT 0,
+    posledni_vypujcka DATETIME
+);
+
+-- Indexy pro lepší výkon
+CREATE INDEX idx_knihy_zanr ON knihy(zanr_id);
+CREATE INDEX idx_vypujcky_kniha ON vypujcky(kniha_id);
+CREATE INDEX idx_vypujcky_ctenar ON vypujcky(ctenar_id);
+CREATE INDEX idx_vypujcky_exemplar ON vypujcky(exemplar_id);
+CREATE INDEX idx_vypujcky_stav ON vypujcky(stav);
+CREATE INDEX idx_vypujcky_stav_termin ON vypujcky(stav, predpokladane_vraceni);
+CREATE INDEX idx_exemplare_kniha_stav ON exemplare(kniha_id, stav);
+CREATE INDEX idx_knihy_dostupna ON knihy(dostupna, nazev, id);
+CREATE INDEX idx_knihy_autori_autor ON knihy_autori(autor_id);
+
+-- Indexy pro stránkování (keyset) podle řazení seznamů
+CREATE INDEX idx_knihy_nazev ON knihy(nazev, id);
+CREATE INDEX idx_autori_jmeno ON autori(prijmeni, jmeno, id);
+CREATE INDEX idx_ctenari_jmeno ON ctenari(prijmeni, jmeno, id);
+CREATE INDEX idx_vypujcky_datum ON vypujcky(datum_vypujceni, id);
+CREATE INDEX idx_vypujcky_ctenar_datum ON vypujcky(ctenar_id, datum_vypujceni, id);
+CREATE INDEX idx_vypujcky_kniha_datum ON vypujcky(kniha_id, datum_vypujceni, id);
+CREATE INDEX idx_archiv_datum ON vypujcky_archiv(datum_vypujceni, id);
+CREATE INDEX idx_archiv_ctenar_datum ON vypujcky_archiv(ctenar_id, datum_vypujceni, id);
+CREATE INDEX idx_archiv_kniha_datum ON vypujcky_archiv(kniha_id, datum_vypujceni, id);
+
+-- Views (viz views.sql)
+CREATE VIEW v_aktualni_vypujcky AS
+SELECT
+    v.id AS vypujcka_id,
+    k.nazev AS kniha_nazev,
+    k.isbn,
+    c.jmeno || ' ' || c.prijmeni AS ctenar_jmeno,
+    c.email AS ctenar_email,
+    c.telefon AS ctenar_telefon,
+    v.datum_vypujceni,
+    v.predpokladane_vraceni,
+    CAST(julianday(date('now', 'localtime')) - julianday(date(v.predpokladane_vraceni)) AS INTEGER) AS dny_po_terminu,
+    v.stav
+FROM vypujcky v
+JOIN knihy k ON v.kniha_id = k.id
+JOIN ctenari c ON v.ctenar_id = c.id
+WHERE v.stav IN ('active', 'overdue')
+ORDER BY v.datum_vypujceni DESC;
+
+CREATE VIEW v_statistiky_knih AS
+SELECT
+    k.id AS kniha_id,
+    k.nazev AS kniha_nazev,
+    z.nazev AS zanr,
+    COALESCE(s.pocet_vypujcek, 0) AS pocet_vypujcek,
+    COALESCE(s.aktivnich_vypujcek, 0) AS aktivnich_vypujcek,
+    COALESCE(s.vraceno, 0) AS vraceno,
+    s.posledni_vypujcka,
+    k.hodnoceni,
+    k.dostupna,
+    k.pocet_exemplaru,
+    k.dostupne_exemplare
+FROM knihy k
+LEFT JOIN zanry z ON k.zanr_id = z.id
+LEFT JOIN statistiky_knih s ON s.kniha_id = k.id
+ORDER BY pocet_vypujcek DESC;
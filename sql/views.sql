@@ -19,20 +19,21 @@ JOIN ctenari c ON v.ctenar_id = c.id
 WHERE v.stav IN ('active', 'overdue')
 ORDER BY v.datum_vypujceni DESC;
 
--- View 2: Statistiky knih - agregovaná data ze tří tabulek
+-- View 2: Statistiky knih - čte průběžně udržovanou tabulku statistiky_knih
 CREATE OR REPLACE VIEW v_statistiky_knih AS
 SELECT 
     k.id AS kniha_id,
     k.nazev AS kniha_nazev,
     z.nazev AS zanr,
-    COUNT(v.id) AS pocet_vypujcek,
-    COUNT(CASE WHEN v.stav = 'active' THEN 1 END) AS aktivnich_vypujcek,
-    COUNT(CASE WHEN v.stav = 'returned' THEN 1 END) AS vraceno,
-    MAX(v.datum_vypujceni) AS posledni_vypujcka,
+    COALESCE(s.pocet_vypujcek, 0) AS pocet_vypujcek,
+    COALESCE(s.aktivnich_vypujcek, 0) AS aktivnich_vypujcek,
+    COALESCE(s.vraceno, 0) AS vraceno,
+    s.posledni_vypujcka,
     k.hodnoceni,
-    k.dostupna
+    k.dostupna,
+    k.pocet_exemplaru,
+    k.dostupne_exemplare
 FROM knihy k
 LEFT JOIN zanry z ON k.zanr_id = z.id
-LEFT JOIN vypujcky v ON k.id = v.kniha_id
-GROUP BY k.id, k.nazev, z.nazev, k.hodnoceni, k.dostupna
+LEFT JOIN statistiky_knih s ON s.kniha_id = k.id
 ORDER BY pocet_vypujcek DESC;
@@ -0,0 +1,60 @@
+"""Move old returned and cancelled loans from vypujcky to vypujcky_archiv.
+
+Keeps the live loans table small; archived loans stay in the statistics
+and are read with include_archive=True. Safe to run while the library is
+open, each batch is a short transaction:
+
+    python src/archive_vypujcky.py --older-than-days 365 --batch-size 1000
+"""
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from config import Config
+from database import Database
+from dao import VypujckaDAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old closed vypujcky")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--older-than-days', type=int, default=None,
+                        help="archive loans borrowed more than this many days ago (default: archive.older_than_days)")
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help="loans moved per transaction (default: archive.batch_size)")
+    args = parser.parse_args()
+
+    config = Config(args.config)
+    archive_config = config.get('archive', {})
+    # An explicit 0 days is valid (archive everything closed before today)
+    if args.older_than_days is not None:
+        older_than_days = args.older_than_days
+    else:
+        older_than_days = archive_config.get('older_than_days', 365)
+    if args.batch_size is not None:
+        batch_size = args.batch_size
+    else:
+        batch_size = archive_config.get('batch_size', 1000)
+    if older_than_days < 0:
+        parser.error("--older-than-days must not be negative")
+    if batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    before = datetime.combine(date.today() - timedelta(days=older_than_days), datetime.min.time())
+
+    db = Database(config.get_database_config())
+    try:
+        started = time.perf_counter()
+        moved = VypujckaDAO(db).archive_closed_loans(before, batch_size=batch_size)
+        print(f"Archived {moved} vypujcky borrowed before {before:%Y-%m-%d} "
+              f"in {time.perf_counter() - started:.2f}s")
+        return 0
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
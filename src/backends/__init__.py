@@ -0,0 +1,19 @@
+"""Storage engines behind Database, selected by database.engine in config.json"""
+
+ENGINES = ('mysql', 'sqlite')
+
+
+def create_backend(config):
+    """Create the backend for a database config section"""
+    engine = config.get('engine', 'mysql')
+    # Imported on demand so the SQLite engine runs without mysql-connector installed
+    if engine == 'mysql':
+        from backends.mysql_backend import MysqlBackend
+        return MysqlBackend(config)
+    if engine == 'sqlite':
+        from backends.sqlite_backend import SqliteBackend
+        return SqliteBackend(config['sqlite'])
+    raise ValueError(f"Unknown database engine: {engine}")
+
+
+__all__ = ['ENGINES', 'create_backend']
@@ -0,0 +1,24 @@
+import mysql.connector
+
+
+class MysqlBackend:
+    """MySQL / MariaDB server through mysql.connector"""
+
+    name = 'mysql'
+    supports_fulltext = True
+    supports_prepared = True
+    Error = mysql.connector.Error
+    connect_hint = "Please check your database configuration and ensure MySQL is running"
+
+    def __init__(self, config):
+        self.config = config
+
+    def connect(self):
+        """Open a new connection"""
+        return mysql.connector.connect(
+            host=self.config['host'],
+            port=self.config.get('port', 3306),
+            database=self.config['database'],
+            user=self.config['user'],
+            password=self.config['password']
+        )
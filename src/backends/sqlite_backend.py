@@ -0,0 +1,211 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+
+from backends.sqlite_dialect import translate
+
+# MySQL lock wait timeout; TransactionService retries errors with this errno
+LOCK_WAIT_ERRNO = 1205
+
+# Upsert with a conflict target (ON CONFLICT(key) DO UPDATE)
+MIN_SQLITE_VERSION = (3, 24, 0)
+
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(__file__), '..', '..', 'sql', 'schema_sqlite.sql')
+
+# Dates are stored as ISO text and parsed back by declared column type,
+# so DAOs get date / datetime objects like from mysql.connector
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()[:10]))
+for _type in ('DATETIME', 'TIMESTAMP'):
+    sqlite3.register_converter(_type, lambda value: datetime.fromisoformat(value.decode()))
+
+
+class SqliteError(Exception):
+    """sqlite3 error with a MySQL-style errno where one applies"""
+
+    def __init__(self, msg, errno=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+
+    @classmethod
+    def wrap(cls, error):
+        code = getattr(error, 'sqlite_errorcode', None)
+        busy = code in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED) or 'locked' in str(error)
+        return cls(str(error), LOCK_WAIT_ERRNO if busy else None)
+
+
+class SqliteCursor:
+    """Cursor with the part of the mysql.connector cursor API used by Database and the DAOs"""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.raw.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, operation, params=None):
+        try:
+            self._cursor.execute(translate(operation), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+    def executemany(self, operation, seq_params):
+        try:
+            self._cursor.executemany(translate(operation), [tuple(params) for params in seq_params])
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self._cursor.description or ())
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+
+class SqliteConnection:
+    """sqlite3 connection behind the mysql.connector connection API"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._closed = False
+
+    def cursor(self, dictionary=False, buffered=None, prepared=False):
+        # sqlite3 caches compiled statements itself, prepared is ignored
+        return SqliteCursor(self, dictionary)
+
+    def start_transaction(self):
+        # Take the write lock up front: a deferred transaction that reads
+        # first could fail to upgrade and SELECT ... FOR UPDATE would not hold
+        try:
+            self.raw.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def commit(self):
+        try:
+            self.raw.commit()
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+    def rollback(self):
+        try:
+            self.raw.rollback()
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+    def ping(self, reconnect=False):
+        if self._closed:
+            raise SqliteError("Connection is closed")
+        self.raw.execute("SELECT 1").fetchone()
+
+    def is_connected(self):
+        return not self._closed
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # Lets SQLite refresh statistics for tables queried on this connection
+            self.raw.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        self.raw.close()
+
+
+class SqliteBackend:
+    """Embedded SQLite database file, tuned for a single branch"""
+
+    name = 'sqlite'
+    supports_fulltext = False
+    supports_prepared = False
+    Error = SqliteError
+    connect_hint = "Please check the database.sqlite.path setting"
+
+    def __init__(self, config):
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise Exception(f"SQLite {sqlite3.sqlite_version} is too old for the sqlite engine, "
+                            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required")
+        self.path = config['path']
+        self.schema = config.get('schema') or DEFAULT_SCHEMA
+        self.init_schema = config.get('init_schema', True)
+        self.statement_cache_size = config.get('statement_cache_size', 128)
+        self.pragmas = [
+            ('journal_mode', config.get('journal_mode', 'WAL').upper()),
+            ('synchronous', config.get('synchronous', 'NORMAL').upper()),
+            ('foreign_keys', 'ON'),
+            ('busy_timeout', int(config.get('busy_timeout', 5000))),
+            ('cache_size', int(config.get('cache_size', -65536))),
+            ('mmap_size', int(config.get('mmap_size', 268435456))),
+            ('temp_store', config.get('temp_store', 'MEMORY').upper()),
+        ]
+        self._schema_lock = threading.Lock()
+        self._schema_checked = False
+
+    def connect(self):
+        """Open a new connection with the configured pragmas"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            raw = sqlite3.connect(
+                self.path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+                cached_statements=self.statement_cache_size
+            )
+            for name, value in self.pragmas:
+                raw.execute(f"PRAGMA {name} = {value}").fetchall()
+        except sqlite3.Error as e:
+            raise SqliteError.wrap(e) from e
+
+        self._ensure_schema(raw)
+        return SqliteConnection(raw)
+
+    def _ensure_schema(self, raw):
+        """Create the tables on first use of an empty database file"""
+        if self._schema_checked or not self.init_schema:
+            return
+        with self._schema_lock:
+            if self._schema_checked:
+                return
+            try:
+                exists = raw.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'knihy'"
+                ).fetchone()
+                if not exists:
+                    with open(self.schema, encoding='utf-8') as f:
+                        raw.executescript(f.read())
+            except sqlite3.Error as e:
+                raise SqliteError.wrap(e) from e
+            self._schema_checked = True
@@ -0,0 +1,117 @@
+import functools
+import re
+
+# Quoted string literals are never rewritten
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+
+_REPLACEMENTS = [
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\bCURDATE\(\)', re.I), "date('now', 'localtime')"),
+    (re.compile(r'\bNOW\(\)', re.I), "datetime('now', 'localtime')"),
+    # SQLite transactions hold the database write lock (BEGIN IMMEDIATE),
+    # so row locks are not needed
+    (re.compile(r'\s+FOR\s+UPDATE(\s+SKIP\s+LOCKED|\s+NOWAIT)?', re.I), ''),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.I), 'INSERT OR IGNORE'),
+    (re.compile(r'\bVALUES\((\w+)\)', re.I), r'excluded.\1'),
+]
+
+_SEPARATOR = re.compile(r'\s+SEPARATOR\s+(\x00\d+\x00)\s*$', re.I)
+_ON_DUPLICATE = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.I)
+_INSERT_KEY = re.compile(r'\bINSERT\s+(?:OR\s+\w+\s+)?INTO\s+\w+\s*\(\s*(\w+)', re.I)
+
+
+def split_args(args):
+    """Split a function argument list on top-level commas"""
+    parts = []
+    depth = 0
+    current = ''
+    for char in args:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += char
+    parts.append(current.strip())
+    return parts
+
+
+def rewrite_function(sql, name, rewrite):
+    """Replace every name(...) call by rewrite(argument string), innermost calls included"""
+    pattern = re.compile(r'\b' + name + r'\s*\(', re.I)
+    position = 0
+    while True:
+        match = pattern.search(sql, position)
+        if match is None:
+            return sql
+        depth = 1
+        end = match.end()
+        while depth:
+            if end >= len(sql):
+                raise ValueError(f"Unbalanced parentheses in {name}()")
+            if sql[end] == '(':
+                depth += 1
+            elif sql[end] == ')':
+                depth -= 1
+            end += 1
+        replacement = rewrite(rewrite_function(sql[match.end():end - 1], name, rewrite))
+        sql = sql[:match.start()] + replacement + sql[end:]
+        position = match.start() + len(replacement)
+
+
+def upsert(sql):
+    """
+    ON DUPLICATE KEY UPDATE -> ON CONFLICT(key) DO UPDATE SET. The first
+    inserted column is taken as the conflict target, the upserts (loan
+    statistics) insert their primary key first. An explicit target keeps
+    this working on SQLite 3.24+, a bare ON CONFLICT DO UPDATE needs 3.35.
+    """
+    if not _ON_DUPLICATE.search(sql):
+        return sql
+    match = _INSERT_KEY.search(sql)
+    if match is None:
+        raise ValueError("ON DUPLICATE KEY UPDATE needs an INSERT with a column list")
+    return _ON_DUPLICATE.sub(f"ON CONFLICT({match.group(1)}) DO UPDATE SET", sql)
+
+
+def _concat(args):
+    return '(' + ' || '.join(split_args(args)) + ')'
+
+
+def _group_concat(args):
+    match = _SEPARATOR.search(args)
+    if match:
+        return f"group_concat({args[:match.start()]}, {match.group(1)})"
+    return f"group_concat({args})"
+
+
+def _datediff(args):
+    first, second = split_args(args)
+    return f"CAST(julianday(date({first})) - julianday(date({second})) AS INTEGER)"
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql):
+    """
+    Rewrite a MySQL statement as used by the DAOs into SQLite syntax.
+    Results are cached, the DAOs reuse a small set of statement texts.
+    """
+    literals = []
+
+    def protect(match):
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    sql = _LITERAL.sub(protect, sql)
+    for pattern, replacement in _REPLACEMENTS:
+        sql = pattern.sub(replacement, sql)
+    sql = upsert(sql)
+    sql = rewrite_function(sql, 'GROUP_CONCAT', _group_concat)
+    sql = rewrite_function(sql, 'CONCAT', _concat)
+    sql = rewrite_function(sql, 'DATEDIFF', _datediff)
+    sql = rewrite_function(sql, 'GREATEST', lambda args: f"max({args})")
+    sql = rewrite_function(sql, 'LEAST', lambda args: f"min({args})")
+    return re.sub(r'\x00(\d+)\x00', lambda match: literals[int(match.group(1))], sql)
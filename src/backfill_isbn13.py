@@ -0,0 +1,38 @@
+"""Fill knihy.isbn13 for knihy stored before the column existed.
+
+Run once after sql/migrate_isbn13.sql:
+
+    python src/backfill_isbn13.py --config config.json
+"""
+import argparse
+import sys
+
+from config import Config
+from database import Database
+from dao import KnihaDAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the canonical knihy.isbn13 column")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    db = Database(Config(args.config).get_database_config())
+    try:
+        counts = KnihaDAO(db).backfill_isbn13(args.batch_size)
+        print(f"Updated {counts['updated']} knihy")
+        if counts['invalid']:
+            print(f"{counts['invalid']} knihy have an invalid ISBN and no isbn13")
+        if counts['duplicate']:
+            print(f"{counts['duplicate']} knihy repeat an ISBN of another kniha in a different form")
+        return 0
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -43,11 +43,40 @@ class Config:
                 raise ValueError(f"Missing required configuration field: {field}")
         
         # Validate database config
+        db_config = self.config_data['database']
+        engine = db_config.get('engine', 'mysql')
+        if engine not in ('mysql', 'sqlite'):
+            raise ValueError(f"Invalid database engine: {engine} (expected mysql or sqlite)")
+        
+        if engine == 'sqlite':
+            self._validate_sqlite_config(db_config.get('sqlite'))
+            return
+        
         db_required = ['host', 'database', 'user', 'password']
         for field in db_required:
-            if field not in self.config_data['database']:
+            if field not in db_config:
                 raise ValueError(f"Missing required database field: {field}")
     
+    def _validate_sqlite_config(self, sqlite_config):
+        """Validate the database.sqlite section used by the embedded engine"""
+        if not sqlite_config or not sqlite_config.get('path'):
+            raise ValueError("Missing required database field: sqlite.path")
+        
+        allowed = {
+            'journal_mode': ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF'),
+            'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+            'temp_store': ('DEFAULT', 'FILE', 'MEMORY')
+        }
+        for field, values in allowed.items():
+            value = sqlite_config.get(field)
+            if value is not None and str(value).upper() not in values:
+                raise ValueError(f"Invalid database.sqlite.{field}: {value}")
+        
+        for field in ('busy_timeout', 'cache_size', 'mmap_size'):
+            value = sqlite_config.get(field)
+            if value is not None and not isinstance(value, int):
+                raise ValueError(f"database.sqlite.{field} must be an integer")
+    
     def get_database_config(self):
         """Get database configuration"""
         return self.config_data['database']
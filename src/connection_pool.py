@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import deque
+
+class ConnectionPool:
+    """Thread-safe connection pool with overflow, idle timeout and pre-ping"""
+
+    def __init__(self, connect, size=5, max_overflow=10, idle_timeout=300,
+                 pre_ping=True, timeout=30, ping=None, on_close=None):
+        self._connect = connect
+        self._ping = ping or self._default_ping
+        # Called with every connection the pool closes, before closing it
+        self._on_close = on_close
+        self.size = size
+        self.max_overflow = max_overflow
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        # Idle connections as (connection, returned_at) pairs, most recent on the right
+        self._idle = deque()
+        self._condition = threading.Condition()
+        self._opened = 0
+
+        # Statistics
+        self._checked_out = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._discarded = 0
+
+    def acquire(self):
+        """Check out a connection, waiting if the pool is exhausted"""
+        wait_started = None
+        deadline = None
+
+        with self._condition:
+            while True:
+                self._expire_idle()
+
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    break
+
+                if self._opened < self.size + self.max_overflow:
+                    # Reserve the slot before connecting outside of the lock
+                    self._opened += 1
+                    connection = None
+                    break
+
+                if wait_started is None:
+                    wait_started = time.monotonic()
+                    deadline = wait_started + self.timeout
+                    self._waits += 1
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._wait_time += time.monotonic() - wait_started
+                    raise Exception(f"Connection pool exhausted (timeout {self.timeout}s)")
+                self._condition.wait(remaining)
+
+            if wait_started is not None:
+                self._wait_time += time.monotonic() - wait_started
+            self._checked_out += 1
+            self._checkouts += 1
+
+        try:
+            if connection is None:
+                connection = self._connect()
+            elif self.pre_ping and not self._ping(connection):
+                self._close_quietly(connection)
+                with self._condition:
+                    self._discarded += 1
+                connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._opened -= 1
+                self._checked_out -= 1
+                self._condition.notify()
+            raise
+
+        return connection
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool"""
+        with self._condition:
+            self._checked_out -= 1
+
+            # Overflow connections are closed instead of being kept idle
+            if discard or len(self._idle) >= self.size:
+                self._opened -= 1
+                if discard:
+                    self._discarded += 1
+                self._condition.notify()
+                close = True
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                close = False
+
+        if close:
+            self._close_quietly(connection)
+
+    def get_stats(self):
+        """Get pool statistics"""
+        with self._condition:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'opened': self._opened,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time': self._wait_time,
+                'discarded': self._discarded
+            }
+
+    def close(self):
+        """Close all idle connections"""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._opened -= len(idle)
+            self._idle.clear()
+
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def _expire_idle(self):
+        """Drop connections idle for longer than idle_timeout (caller holds lock)"""
+        if not self.idle_timeout:
+            return
+
+        threshold = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < threshold:
+            connection, _ = self._idle.popleft()
+            self._opened -= 1
+            self._close_quietly(connection)
+
+    @staticmethod
+    def _default_ping(connection):
+        """Check that a connection is still usable"""
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _close_quietly(self, connection):
+        if self._on_close is not None:
+            try:
+                self._on_close(connection)
+            except Exception:
+                pass
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -3,5 +3,11 @@ from .zanr_dao import ZanrDAO
 from .kniha_dao import KnihaDAO
 from .ctenar_dao import CtenarDAO
 from .vypujcka_dao import VypujckaDAO
+from .exemplar_dao import ExemplarDAO
+from .statistiky_dao import StatistikyDAO, StatistikyDelta
+from .search_index import SearchIndex
+from .cache import LRUCache, SqliteCacheBackend, CachedZanrDAO, CachedAutorDAO
 
-__all__ = ['AutorDAO', 'ZanrDAO', 'KnihaDAO', 'CtenarDAO', 'VypujckaDAO']
+__all__ = ['AutorDAO', 'ZanrDAO', 'KnihaDAO', 'CtenarDAO', 'VypujckaDAO', 'ExemplarDAO',
+           'StatistikyDAO', 'StatistikyDelta', 'SearchIndex',
+           'LRUCache', 'SqliteCacheBackend', 'CachedZanrDAO', 'CachedAutorDAO']
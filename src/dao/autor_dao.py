@@ -1,10 +1,21 @@
 from models.autor import Autor
+from dao.pagination import fetch_page
+from dao.search_index import fulltext_query, SearchIndexMixin
 
-class AutorDAO:
+# Column order expected by AutorDAO._map_tuple
+AUTOR_COLUMNS = "id, jmeno, prijmeni, datum_narozeni, zeme_puvodu, created_at"
+
+class AutorDAO(SearchIndexMixin):
     """Data Access Object for Autor table"""
     
-    def __init__(self, database):
+    SEARCH_TABLE = 'autori'
+    SEARCH_COLUMNS = ('jmeno', 'prijmeni')
+    
+    def __init__(self, database, search_index=None, fulltext=False):
         self.db = database
+        # In-process SearchIndex over jmeno and prijmeni, or MySQL FULLTEXT when fulltext is set
+        self.search_index = search_index
+        self.fulltext = fulltext
     
     def create(self, autor):
         """Insert new autor"""
@@ -17,6 +28,8 @@ class AutorDAO:
         try:
             autor_id = self.db.execute_query(query, params)
             autor.id = autor_id
+            if self.search_index is not None:
+                self.search_index.add(autor.id, autor.jmeno, autor.prijmeni)
             return autor
         except Exception as e:
             raise Exception(f"Failed to create autor: {e}")
@@ -35,14 +48,33 @@ class AutorDAO:
     
     def get_all(self):
         """Get all autori"""
-        query = "SELECT * FROM autori ORDER BY prijmeni, jmeno"
+        query = f"SELECT {AUTOR_COLUMNS} FROM autori ORDER BY prijmeni, jmeno"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get all autori: {e}")
     
+    def get_all_page(self, after=None, limit=50):
+        """Get one page of autori ordered by prijmeni, jmeno (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, "SELECT * FROM autori",
+                [('prijmeni', 'prijmeni', False), ('jmeno', 'jmeno', False), ('id', 'id', False)],
+                self._map_to_object, after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get autori page: {e}")
+    
+    def count(self):
+        """Get number of autori"""
+        try:
+            results = self.db.execute_select("SELECT COUNT(*) AS pocet FROM autori")
+            return results[0]['pocet']
+        except Exception as e:
+            raise Exception(f"Failed to count autori: {e}")
+    
     def update(self, autor):
         """Update autor"""
         query = """
@@ -55,6 +87,8 @@ class AutorDAO:
         
         try:
             self.db.execute_query(query, params)
+            if self.search_index is not None:
+                self.search_index.add(autor.id, autor.jmeno, autor.prijmeni)
             return autor
         except Exception as e:
             raise Exception(f"Failed to update autor: {e}")
@@ -65,21 +99,40 @@ class AutorDAO:
         
         try:
             self.db.execute_query(query, (autor_id,))
+            if self.search_index is not None:
+                self.search_index.remove(autor_id)
             return True
         except Exception as e:
             raise Exception(f"Failed to delete autor: {e}")
     
-    def search_by_name(self, search_term):
-        """Search autori by name"""
-        query = """
-            SELECT * FROM autori 
-            WHERE jmeno LIKE %s OR prijmeni LIKE %s
-            ORDER BY prijmeni, jmeno
-        """
-        search_pattern = f"%{search_term}%"
+    def search_by_name(self, search_term, limit=None):
+        """Search autori by name (ranked when a search index or FULLTEXT is used)"""
+        if self.search_index is not None:
+            return self._search_index_lookup(search_term, limit)
+        
+        boolean_query = fulltext_query(search_term) if self.fulltext else None
+        if boolean_query:
+            query = """
+                SELECT * FROM autori 
+                WHERE MATCH(jmeno, prijmeni) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY MATCH(jmeno, prijmeni) AGAINST (%s IN BOOLEAN MODE) DESC, prijmeni, jmeno
+            """
+            params = [boolean_query, boolean_query]
+        else:
+            query = """
+                SELECT * FROM autori 
+                WHERE jmeno LIKE %s OR prijmeni LIKE %s
+                ORDER BY prijmeni, jmeno
+            """
+            search_pattern = f"%{search_term}%"
+            params = [search_pattern, search_pattern]
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
         
         try:
-            results = self.db.execute_select(query, (search_pattern, search_pattern))
+            results = self.db.execute_select(query, tuple(params))
             return [self._map_to_object(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to search autori: {e}")
@@ -94,3 +147,7 @@ class AutorDAO:
             zeme_puvodu=row['zeme_puvodu'],
             created_at=row['created_at']
         )
+    
+    def _map_tuple(self, row):
+        """Map positional row (AUTOR_COLUMNS order) to Autor object"""
+        return Autor(*row)
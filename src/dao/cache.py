@@ -0,0 +1,298 @@
+import copy
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def freeze_value(value):
+    """Value as stored: a list becomes a tuple of private copies, a model a private copy"""
+    if isinstance(value, list):
+        return tuple(copy.copy(item) for item in value)
+    return copy.copy(value)
+
+
+def copy_value(value):
+    """
+    Value handed to a caller. A model is copied so callers can edit it;
+    a list comes back as the shared read-only tuple, copying it on every
+    hit cost more than the query it saves.
+    """
+    if isinstance(value, tuple):
+        return value
+    return copy.copy(value)
+
+
+class SqliteCacheBackend:
+    """
+    Second cache level shared between processes through a local SQLite file.
+    Entries expire by wall-clock time; values are pickled.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                expires REAL,
+                value BLOB NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        """)
+
+    def _connection(self):
+        # sqlite3 connections must stay on the thread that opened them
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, namespace, key):
+        row = self._connection().execute(
+            "SELECT expires, value FROM cache WHERE namespace = ? AND cache_key = ?",
+            (namespace, repr(key))
+        ).fetchone()
+        if row is None or (row[0] is not None and row[0] < time.time()):
+            return _MISSING
+        return pickle.loads(row[1])
+
+    def set(self, namespace, key, value, ttl):
+        expires = time.time() + ttl if ttl is not None else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (namespace, cache_key, expires, value) VALUES (?, ?, ?, ?)",
+            (namespace, repr(key), expires, pickle.dumps(value))
+        )
+
+    def delete(self, namespace, key):
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND cache_key = ?", (namespace, repr(key)))
+
+    def clear(self, namespace):
+        self._connection().execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL.
+
+    With a shared backend, local misses fall through to it and writes and
+    invalidations go to both levels. Other processes only see an
+    invalidation once their own local entry expires, so keep the TTL short
+    when several processes write.
+    """
+
+    def __init__(self, capacity=1000, ttl=300, backend=None, namespace='default'):
+        self.capacity = capacity
+        # Seconds an entry stays valid, None = until evicted or invalidated
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, a load that overlapped one is not stored
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._backend_hits = 0
+        self._backend_errors = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key, default=None):
+        """Get a copy of the cached value or default"""
+        value = self._get(key)
+        return default if value is _MISSING else copy_value(value)
+
+    def get_or_load(self, key, loader):
+        """Get a copy of the cached value, calling loader() on a miss (None is not cached)"""
+        with self._lock:
+            generation = self._generation
+        value = self._get(key)
+        if value is _MISSING:
+            value = loader()
+            if value is None:
+                return None
+            # Skipped when an invalidation ran during the load, value may be stale
+            value = self._set(key, value, generation)
+        return copy_value(value)
+
+    def set(self, key, value):
+        self._set(key, value)
+
+    def _set(self, key, value, generation=None):
+        """Store value (unless invalidated since generation), returns the stored form"""
+        value = freeze_value(value)
+        if not self._store(key, value, generation):
+            return value
+        if self.backend is not None:
+            try:
+                self.backend.set(self.namespace, key, value, self.ttl)
+                with self._lock:
+                    stale = generation is not None and generation != self._generation
+                if stale:
+                    # The invalidation may have deleted from the backend before this set
+                    self.backend.delete(self.namespace, key)
+            except Exception:
+                with self._lock:
+                    self._backend_errors += 1
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(self.namespace, key)
+            except Exception:
+                with self._lock:
+                    self._backend_errors += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+        if self.backend is not None:
+            try:
+                self.backend.clear(self.namespace)
+            except Exception:
+                with self._lock:
+                    self._backend_errors += 1
+
+    def get_stats(self):
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'backend_hits': self._backend_hits,
+                'backend_errors': self._backend_errors,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._expirations += 1
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(self.namespace, key)
+            except Exception:
+                value = _MISSING
+                with self._lock:
+                    self._backend_errors += 1
+            if value is not _MISSING:
+                self._store(key, value, generation)
+                with self._lock:
+                    self._hits += 1
+                    self._backend_hits += 1
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return _MISSING
+
+    def _store(self, key, value, generation=None):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return True
+
+
+class CachedZanrDAO:
+    """ZanrDAO with cached reads; any write drops the whole (small) zanry cache"""
+
+    def __init__(self, zanr_dao, cache):
+        self.dao = zanr_dao
+        self.cache = cache
+
+    def get_all(self):
+        """All zanry as a shared tuple, do not modify its items"""
+        return self.cache.get_or_load('all', self.dao.get_all)
+
+    def get_by_id(self, zanr_id):
+        return self.cache.get_or_load(('id', zanr_id), lambda: self.dao.get_by_id(zanr_id))
+
+    def create(self, zanr):
+        try:
+            return self.dao.create(zanr)
+        finally:
+            self.cache.clear()
+
+    def update(self, zanr):
+        try:
+            return self.dao.update(zanr)
+        finally:
+            self.cache.clear()
+
+    def delete(self, zanr_id):
+        try:
+            return self.dao.delete(zanr_id)
+        finally:
+            self.cache.clear()
+
+    def __getattr__(self, name):
+        # Everything else goes straight to the wrapped DAO
+        return getattr(self.dao, name)
+
+
+class CachedAutorDAO:
+    """AutorDAO with get_by_id served from the cache"""
+
+    def __init__(self, autor_dao, cache):
+        self.dao = autor_dao
+        self.cache = cache
+
+    def get_by_id(self, autor_id):
+        return self.cache.get_or_load(autor_id, lambda: self.dao.get_by_id(autor_id))
+
+    def create(self, autor):
+        autor = self.dao.create(autor)
+        self.cache.invalidate(autor.id)
+        return autor
+
+    def update(self, autor):
+        try:
+            return self.dao.update(autor)
+        finally:
+            self.cache.invalidate(autor.id)
+
+    def delete(self, autor_id):
+        try:
+            return self.dao.delete(autor_id)
+        finally:
+            self.cache.invalidate(autor_id)
+
+    def __getattr__(self, name):
+        return getattr(self.dao, name)
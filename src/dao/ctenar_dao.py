@@ -1,10 +1,23 @@
 from models.ctenar import Ctenar
+from dao.pagination import fetch_page
+from dao.search_index import fulltext_query, SearchIndexMixin
 
-class CtenarDAO:
+# Column order expected by CtenarDAO._map_tuple
+CTENAR_COLUMNS = "id, jmeno, prijmeni, email, telefon, registrovan_od, aktivni, created_at"
+
+SORT_KEYS = [('prijmeni', 'prijmeni', False), ('jmeno', 'jmeno', False), ('id', 'id', False)]
+
+class CtenarDAO(SearchIndexMixin):
     """Data Access Object for Ctenar table"""
     
-    def __init__(self, database):
+    SEARCH_TABLE = 'ctenari'
+    SEARCH_COLUMNS = ('jmeno', 'prijmeni')
+    
+    def __init__(self, database, search_index=None, fulltext=False):
         self.db = database
+        # In-process SearchIndex over jmeno and prijmeni, or MySQL FULLTEXT when fulltext is set
+        self.search_index = search_index
+        self.fulltext = fulltext
     
     def create(self, ctenar):
         """Insert new ctenar"""
@@ -18,6 +31,8 @@ class CtenarDAO:
         try:
             ctenar_id = self.db.execute_query(query, params)
             ctenar.id = ctenar_id
+            if self.search_index is not None:
+                self.search_index.add(ctenar.id, ctenar.jmeno, ctenar.prijmeni)
             return ctenar
         except Exception as e:
             raise Exception(f"Failed to create ctenar: {e}")
@@ -36,24 +51,45 @@ class CtenarDAO:
     
     def get_all(self):
         """Get all ctenari"""
-        query = "SELECT * FROM ctenari ORDER BY prijmeni, jmeno"
+        query = f"SELECT {CTENAR_COLUMNS} FROM ctenari ORDER BY prijmeni, jmeno"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get all ctenari: {e}")
     
+    def get_all_page(self, after=None, limit=50):
+        """Get one page of ctenari ordered by prijmeni, jmeno (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, "SELECT * FROM ctenari", SORT_KEYS,
+                self._map_to_object, after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get ctenari page: {e}")
+    
     def get_active(self):
         """Get active ctenari"""
-        query = "SELECT * FROM ctenari WHERE aktivni = TRUE ORDER BY prijmeni, jmeno"
+        query = f"SELECT {CTENAR_COLUMNS} FROM ctenari WHERE aktivni = TRUE ORDER BY prijmeni, jmeno"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get active ctenari: {e}")
     
+    def get_active_page(self, after=None, limit=50):
+        """Get one page of active ctenari (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, "SELECT * FROM ctenari", SORT_KEYS,
+                self._map_to_object, conditions=["aktivni = TRUE"],
+                after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get active ctenari page: {e}")
+    
     def update(self, ctenar):
         """Update ctenar"""
         query = """
@@ -67,6 +103,8 @@ class CtenarDAO:
         
         try:
             self.db.execute_query(query, params)
+            if self.search_index is not None:
+                self.search_index.add(ctenar.id, ctenar.jmeno, ctenar.prijmeni)
             return ctenar
         except Exception as e:
             raise Exception(f"Failed to update ctenar: {e}")
@@ -77,21 +115,40 @@ class CtenarDAO:
         
         try:
             self.db.execute_query(query, (ctenar_id,))
+            if self.search_index is not None:
+                self.search_index.remove(ctenar_id)
             return True
         except Exception as e:
             raise Exception(f"Failed to delete ctenar: {e}")
     
-    def search_by_name(self, search_term):
-        """Search ctenari by name"""
-        query = """
-            SELECT * FROM ctenari 
-            WHERE jmeno LIKE %s OR prijmeni LIKE %s
-            ORDER BY prijmeni, jmeno
-        """
-        search_pattern = f"%{search_term}%"
+    def search_by_name(self, search_term, limit=None):
+        """Search ctenari by name (ranked when a search index or FULLTEXT is used)"""
+        if self.search_index is not None:
+            return self._search_index_lookup(search_term, limit)
+        
+        boolean_query = fulltext_query(search_term) if self.fulltext else None
+        if boolean_query:
+            query = """
+                SELECT * FROM ctenari 
+                WHERE MATCH(jmeno, prijmeni) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY MATCH(jmeno, prijmeni) AGAINST (%s IN BOOLEAN MODE) DESC, prijmeni, jmeno
+            """
+            params = [boolean_query, boolean_query]
+        else:
+            query = """
+                SELECT * FROM ctenari 
+                WHERE jmeno LIKE %s OR prijmeni LIKE %s
+                ORDER BY prijmeni, jmeno
+            """
+            search_pattern = f"%{search_term}%"
+            params = [search_pattern, search_pattern]
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
         
         try:
-            results = self.db.execute_select(query, (search_pattern, search_pattern))
+            results = self.db.execute_select(query, tuple(params))
             return [self._map_to_object(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to search ctenari: {e}")
@@ -120,3 +177,9 @@ class CtenarDAO:
             aktivni=bool(row['aktivni']),
             created_at=row['created_at']
         )
+    
+    def _map_tuple(self, row):
+        """Map positional row (CTENAR_COLUMNS order) to Ctenar object"""
+        id, jmeno, prijmeni, email, telefon, registrovan_od, aktivni, created_at = row
+        return Ctenar(id, jmeno, prijmeni, email, telefon, registrovan_od,
+                      bool(aktivni), created_at)
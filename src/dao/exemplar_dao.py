@@ -0,0 +1,138 @@
+from models.exemplar import Exemplar
+
+
+class BookAlreadyLentError(Exception):
+    """Kniha is not available, another vypujcka holds it"""
+
+
+def claim_exemplar(cursor, kniha_id):
+    """
+    Take one available exemplar of a kniha for a new vypujcka and return
+    its ID. The conditional update locks the kniha row first, concurrent
+    borrowers of the same kniha wait and then see the decremented counter.
+    Raises BookAlreadyLentError when no exemplar is available.
+    """
+    cursor.execute("""
+        UPDATE knihy
+        SET dostupna = (dostupne_exemplare > 1), dostupne_exemplare = dostupne_exemplare - 1
+        WHERE id = %s AND dostupne_exemplare > 0
+    """, (kniha_id,))
+    if cursor.rowcount == 0:
+        cursor.execute("SELECT id FROM knihy WHERE id = %s", (kniha_id,))
+        if not cursor.fetchall():
+            raise Exception(f"Kniha {kniha_id} not found")
+        raise BookAlreadyLentError(f"Kniha {kniha_id} is already lent")
+    
+    cursor.execute("""
+        SELECT id FROM exemplare
+        WHERE kniha_id = %s AND stav = 'dostupny'
+        ORDER BY id LIMIT 1
+    """, (kniha_id,))
+    row = cursor.fetchone()
+    if row is None:
+        raise Exception(f"Kniha {kniha_id} has no available exemplar")
+    cursor.execute("UPDATE exemplare SET stav = 'vypujceny' WHERE id = %s", (row[0],))
+    return row[0]
+
+
+def release_exemplar(cursor, kniha_id, exemplar_id):
+    """
+    Put the exemplar of a just-closed vypujcka back on the shelf.
+    Locks knihy before exemplare, like every other writer.
+    """
+    if exemplar_id is None:
+        # The exemplar was deleted while lent, nothing to give back
+        return
+    cursor.execute("""
+        UPDATE knihy SET dostupne_exemplare = dostupne_exemplare + 1, dostupna = TRUE
+        WHERE id = %s
+    """, (kniha_id,))
+    cursor.execute("UPDATE exemplare SET stav = 'dostupny' WHERE id = %s", (exemplar_id,))
+
+
+class ExemplarDAO:
+    """Data Access Object for Exemplar table (keeps knihy counters in sync)"""
+    
+    def __init__(self, database):
+        self.db = database
+    
+    def create(self, exemplar):
+        """Insert new exemplar and count it as available"""
+        query = "INSERT INTO exemplare (kniha_id, inventarni_cislo, stav) VALUES (%s, %s, 'dostupny')"
+        
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (exemplar.kniha_id, exemplar.inventarni_cislo))
+                exemplar.id = cursor.lastrowid
+                cursor.execute("""
+                    UPDATE knihy
+                    SET pocet_exemplaru = pocet_exemplaru + 1,
+                        dostupne_exemplare = dostupne_exemplare + 1,
+                        dostupna = TRUE
+                    WHERE id = %s
+                """, (exemplar.kniha_id,))
+            exemplar.stav = 'dostupny'
+            return exemplar
+        except Exception as e:
+            raise Exception(f"Failed to create exemplar: {e}")
+    
+    def get_by_id(self, exemplar_id):
+        """Get exemplar by ID"""
+        query = "SELECT * FROM exemplare WHERE id = %s"
+        
+        try:
+            results = self.db.execute_select(query, (exemplar_id,))
+            if results:
+                return self._map_to_object(results[0])
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to get exemplar: {e}")
+    
+    def get_by_kniha(self, kniha_id):
+        """Get all exemplare of a kniha"""
+        query = "SELECT * FROM exemplare WHERE kniha_id = %s ORDER BY id"
+        
+        try:
+            results = self.db.execute_select(query, (kniha_id,))
+            return [self._map_to_object(row) for row in results]
+        except Exception as e:
+            raise Exception(f"Failed to get exemplare: {e}")
+    
+    def vyradit(self, exemplar_id):
+        """Withdraw an available exemplar from circulation"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("SELECT kniha_id FROM exemplare WHERE id = %s", (exemplar_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    raise Exception(f"Exemplar {exemplar_id} not found")
+                kniha_id = row[0]
+                # Lock order matches TransactionService: knihy before exemplare
+                cursor.execute("SELECT dostupne_exemplare FROM knihy WHERE id = %s FOR UPDATE", (kniha_id,))
+                dostupne = cursor.fetchone()[0]
+                cursor.execute("""
+                    UPDATE exemplare SET stav = 'vyrazeny'
+                    WHERE id = %s AND stav = 'dostupny'
+                """, (exemplar_id,))
+                if cursor.rowcount == 0:
+                    raise Exception(f"Exemplar {exemplar_id} is not available")
+                cursor.execute("""
+                    UPDATE knihy
+                    SET pocet_exemplaru = pocet_exemplaru - 1,
+                        dostupne_exemplare = dostupne_exemplare - 1,
+                        dostupna = %s
+                    WHERE id = %s
+                """, (dostupne > 1, kniha_id))
+            return True
+        except Exception as e:
+            raise Exception(f"Failed to withdraw exemplar: {e}")
+    
+    def _map_to_object(self, row):
+        """Map database row to Exemplar object"""
+        return Exemplar(
+            id=row['id'],
+            kniha_id=row['kniha_id'],
+            inventarni_cislo=row['inventarni_cislo'],
+            stav=row['stav'],
+            created_at=row['created_at']
+        )
@@ -0,0 +1,47 @@
+import functools
+import re
+
+_SEPARATORS = re.compile(r'[\s\-‐‑–]')
+# Leading "ISBN", "ISBN-13:" etc. as typed by hand or printed on labels
+_PREFIX = re.compile(r'^ISBN(?:-?1[03])?:?', re.I)
+
+
+def isbn13_check_digit(digits):
+    """Check digit for the first 12 digits of an ISBN-13 / EAN-13"""
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def isbn10_check_digit(digits):
+    """Check digit (0-9 or X) for the first 9 digits of an ISBN-10"""
+    total = sum(int(d) * (10 - i) for i, d in enumerate(digits[:9]))
+    check = (11 - total % 11) % 11
+    return 'X' if check == 10 else str(check)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_isbn(value):
+    """
+    Canonical ISBN-13 (13 digits, no hyphens) of an ISBN-10 or ISBN-13 as
+    typed or scanned, None when value is not a valid ISBN.
+    A barcode scan may carry a 2 or 5 digit price add-on, it is dropped.
+    """
+    if not value:
+        return None
+    code = _SEPARATORS.sub('', _PREFIX.sub('', str(value).strip())).upper()
+
+    if len(code) in (15, 18) and code.isdigit():
+        code = code[:13]
+
+    if len(code) == 13 and code.isdigit():
+        if code[:3] in ('978', '979') and isbn13_check_digit(code) == code[12]:
+            return code
+        return None
+
+    if len(code) == 10 and code[:9].isdigit() and (code[9].isdigit() or code[9] == 'X'):
+        if isbn10_check_digit(code) != code[9]:
+            return None
+        digits = '978' + code[:9]
+        return digits + isbn13_check_digit(digits)
+
+    return None
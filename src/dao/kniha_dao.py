@@ -1,23 +1,70 @@
 from models.kniha import Kniha
+from models.autor import Autor
+from dao.pagination import fetch_page
+from dao.search_index import fulltext_query, fetch_by_ids, SearchIndexMixin, IN_CHUNK_SIZE
+from dao.isbn import normalize_isbn
 
-class KnihaDAO:
+SELECT_KNIHY = """
+    SELECT k.*, z.nazev as zanr_nazev
+    FROM knihy k
+    LEFT JOIN zanry z ON k.zanr_id = z.id
+"""
+SORT_KEYS = [('k.nazev', 'nazev', False), ('k.id', 'id', False)]
+# Column order expected by KnihaDAO._map_tuple
+SELECT_KNIHY_COLUMNS = """
+    SELECT k.id, k.nazev, k.isbn, k.rok_vydani, k.pocet_stran, k.hodnoceni,
+           k.dostupna, k.zanr_id, k.created_at, k.pocet_exemplaru, k.dostupne_exemplare, z.nazev
+    FROM knihy k
+    LEFT JOIN zanry z ON k.zanr_id = z.id
+"""
+INSERT_KNIHA_QUERY = """
+    INSERT INTO knihy (nazev, isbn, isbn13, rok_vydani, pocet_stran, hodnoceni, dostupna,
+                       pocet_exemplaru, dostupne_exemplare, zanr_id)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+INSERT_EXEMPLAR_QUERY = "INSERT INTO exemplare (kniha_id) VALUES (%s)"
+
+
+def exemplar_count(kniha):
+    """Number of exemplare to create with a new kniha (none when created as unavailable)"""
+    return (kniha.pocet_exemplaru or 0) if kniha.dostupna else 0
+
+
+def kniha_params(kniha):
+    """Parameters for INSERT_KNIHA_QUERY, all exemplare start as available"""
+    pocet = exemplar_count(kniha)
+    return (kniha.nazev, kniha.isbn, normalize_isbn(kniha.isbn), kniha.rok_vydani, kniha.pocet_stran,
+            kniha.hodnoceni, pocet > 0, pocet, pocet, kniha.zanr_id)
+
+
+class KnihaDAO(SearchIndexMixin):
     """Data Access Object for Kniha table"""
     
-    def __init__(self, database):
+    SEARCH_TABLE = 'knihy'
+    SEARCH_COLUMNS = ('nazev',)
+    SEARCH_SELECT = SELECT_KNIHY
+    SEARCH_ID_COLUMN = 'k.id'
+    
+    def __init__(self, database, search_index=None, fulltext=False):
         self.db = database
+        # In-process SearchIndex over nazev, or MySQL FULLTEXT when fulltext is set
+        self.search_index = search_index
+        self.fulltext = fulltext
     
     def create(self, kniha):
-        """Insert new kniha"""
-        query = """
-            INSERT INTO knihy (nazev, isbn, rok_vydani, pocet_stran, hodnoceni, dostupna, zanr_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        params = (kniha.nazev, kniha.isbn, kniha.rok_vydani, kniha.pocet_stran,
-                 kniha.hodnoceni, kniha.dostupna, kniha.zanr_id)
+        """Insert new kniha together with its pocet_exemplaru exemplare"""
+        pocet = exemplar_count(kniha)
         
         try:
-            kniha_id = self.db.execute_query(query, params)
-            kniha.id = kniha_id
+            with self.db.transaction() as cursor:
+                cursor.execute(INSERT_KNIHA_QUERY, kniha_params(kniha))
+                kniha.id = cursor.lastrowid
+                if pocet:
+                    cursor.executemany(INSERT_EXEMPLAR_QUERY, [(kniha.id,)] * pocet)
+            kniha.pocet_exemplaru = kniha.dostupne_exemplare = pocet
+            kniha.dostupna = pocet > 0
+            if self.search_index is not None:
+                self.search_index.add(kniha.id, kniha.nazev)
             return kniha
         except Exception as e:
             raise Exception(f"Failed to create kniha: {e}")
@@ -39,50 +86,120 @@ class KnihaDAO:
         except Exception as e:
             raise Exception(f"Failed to get kniha: {e}")
     
-    def get_all(self):
-        """Get all knihy with zanr info"""
-        query = """
-            SELECT k.*, z.nazev as zanr_nazev
-            FROM knihy k
-            LEFT JOIN zanry z ON k.zanr_id = z.id
-            ORDER BY k.nazev
+    def get_by_isbn(self, isbn):
+        """
+        Exact-match lookup of a typed or scanned ISBN-10 / ISBN-13 (hyphens
+        allowed) through the canonical isbn13 key, one unique index read.
+        A code that is not a valid ISBN is matched against the stored isbn
+        as is.
         """
+        isbn13 = normalize_isbn(isbn)
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            if isbn13 is None:
+                results = self.db.execute_select(SELECT_KNIHY + "WHERE k.isbn = %s", (str(isbn).strip(),))
+                return self._map_to_object(results[0]) if results else None
+            
+            results = self.db.execute_select(SELECT_KNIHY + "WHERE k.isbn13 = %s", (isbn13,))
+            return self._map_to_object(results[0]) if results else None
         except Exception as e:
-            raise Exception(f"Failed to get all knihy: {e}")
+            raise Exception(f"Failed to get kniha by ISBN: {e}")
     
-    def get_available(self):
-        """Get available knihy"""
-        query = """
-            SELECT k.*, z.nazev as zanr_nazev
-            FROM knihy k
-            LEFT JOIN zanry z ON k.zanr_id = z.id
-            WHERE k.dostupna = TRUE
-            ORDER BY k.nazev
+    def backfill_isbn13(self, batch_size=1000):
         """
+        Fill isbn13 of knihy stored before the column existed.
+        Returns counts of updated rows, invalid ISBNs and duplicates
+        (rows whose ISBN is another form of an ISBN already taken).
+        """
+        counts = {'updated': 0, 'invalid': 0, 'duplicate': 0}
+        
+        try:
+            taken = {row[0] for row in self.db.execute_select_tuples(
+                "SELECT isbn13 FROM knihy WHERE isbn13 IS NOT NULL")}
+            rows = self.db.execute_select_tuples(
+                "SELECT id, isbn FROM knihy WHERE isbn13 IS NULL AND isbn IS NOT NULL ORDER BY id")
+            
+            updates = []
+            for kniha_id, isbn in rows:
+                isbn13 = normalize_isbn(isbn)
+                if isbn13 is None:
+                    counts['invalid'] += 1
+                elif isbn13 in taken:
+                    counts['duplicate'] += 1
+                else:
+                    taken.add(isbn13)
+                    updates.append((isbn13, kniha_id))
+            
+            for start in range(0, len(updates), batch_size):
+                chunk = updates[start:start + batch_size]
+                self.db.execute_many("UPDATE knihy SET isbn13 = %s WHERE id = %s", chunk)
+                counts['updated'] += len(chunk)
+            return counts
+        except Exception as e:
+            raise Exception(f"Failed to backfill isbn13: {e}")
+    
+    def get_all(self, with_autori=False):
+        """Get all knihy with zanr info (and autori when with_autori is set)"""
+        query = SELECT_KNIHY_COLUMNS + "ORDER BY k.nazev"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            knihy = [self._map_tuple(row) for row in results]
+            if with_autori:
+                self.load_autori(knihy)
+            return knihy
+        except Exception as e:
+            raise Exception(f"Failed to get all knihy: {e}")
+    
+    def get_all_page(self, after=None, limit=50):
+        """Get one page of knihy ordered by nazev (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, SELECT_KNIHY, SORT_KEYS,
+                self._map_to_object, after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get knihy page: {e}")
+    
+    def get_available(self, with_autori=False):
+        """Get available knihy (with autori when with_autori is set)"""
+        query = SELECT_KNIHY_COLUMNS + "WHERE k.dostupna = TRUE ORDER BY k.nazev"
+        
+        try:
+            results = self.db.execute_select_tuples(query)
+            knihy = [self._map_tuple(row) for row in results]
+            if with_autori:
+                self.load_autori(knihy)
+            return knihy
         except Exception as e:
             raise Exception(f"Failed to get available knihy: {e}")
     
+    def get_available_page(self, after=None, limit=50):
+        """Get one page of available knihy (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, SELECT_KNIHY, SORT_KEYS,
+                self._map_to_object, conditions=["k.dostupna = TRUE"],
+                after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get available knihy page: {e}")
+    
     def update(self, kniha):
-        """Update kniha"""
+        """Update kniha (availability follows its exemplare, see ExemplarDAO)"""
         query = """
             UPDATE knihy 
-            SET nazev = %s, isbn = %s, rok_vydani = %s, pocet_stran = %s,
-                hodnoceni = %s, dostupna = %s, zanr_id = %s
+            SET nazev = %s, isbn = %s, isbn13 = %s, rok_vydani = %s, pocet_stran = %s,
+                hodnoceni = %s, zanr_id = %s
             WHERE id = %s
         """
-        params = (kniha.nazev, kniha.isbn, kniha.rok_vydani, kniha.pocet_stran,
-                 kniha.hodnoceni, kniha.dostupna, kniha.zanr_id, kniha.id)
+        params = (kniha.nazev, kniha.isbn, normalize_isbn(kniha.isbn), kniha.rok_vydani,
+                 kniha.pocet_stran, kniha.hodnoceni, kniha.zanr_id, kniha.id)
         
         try:
             self.db.execute_query(query, params)
+            if self.search_index is not None:
+                self.search_index.add(kniha.id, kniha.nazev)
             return kniha
         except Exception as e:
             raise Exception(f"Failed to update kniha: {e}")
@@ -93,36 +210,62 @@ class KnihaDAO:
         
         try:
             self.db.execute_query(query, (kniha_id,))
+            if self.search_index is not None:
+                self.search_index.remove(kniha_id)
             return True
         except Exception as e:
             raise Exception(f"Failed to delete kniha: {e}")
     
-    def set_availability(self, kniha_id, dostupna):
-        """Set kniha availability"""
-        query = "UPDATE knihy SET dostupna = %s WHERE id = %s"
+    def search_by_title(self, search_term, limit=None, with_autori=False):
+        """Search knihy by title (ranked when a search index or FULLTEXT is used)"""
+        if self.search_index is not None:
+            knihy = self._search_index_lookup(search_term, limit)
+            if with_autori:
+                self.load_autori(knihy)
+            return knihy
+        
+        boolean_query = fulltext_query(search_term) if self.fulltext else None
+        if boolean_query:
+            query = """
+                SELECT k.*, z.nazev as zanr_nazev
+                FROM knihy k
+                LEFT JOIN zanry z ON k.zanr_id = z.id
+                WHERE MATCH(k.nazev) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY MATCH(k.nazev) AGAINST (%s IN BOOLEAN MODE) DESC, k.nazev
+            """
+            params = [boolean_query, boolean_query]
+        else:
+            query = """
+                SELECT k.*, z.nazev as zanr_nazev
+                FROM knihy k
+                LEFT JOIN zanry z ON k.zanr_id = z.id
+                WHERE k.nazev LIKE %s
+                ORDER BY k.nazev
+            """
+            params = [f"%{search_term}%"]
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
         
         try:
-            self.db.execute_query(query, (dostupna, kniha_id))
-            return True
+            results = self.db.execute_select(query, tuple(params))
+            knihy = [self._map_to_object(row) for row in results]
+            if with_autori:
+                self.load_autori(knihy)
+            return knihy
         except Exception as e:
-            raise Exception(f"Failed to set availability: {e}")
+            raise Exception(f"Failed to search knihy: {e}")
     
-    def search_by_title(self, search_term):
-        """Search knihy by title"""
-        query = """
-            SELECT k.*, z.nazev as zanr_nazev
-            FROM knihy k
-            LEFT JOIN zanry z ON k.zanr_id = z.id
-            WHERE k.nazev LIKE %s
-            ORDER BY k.nazev
-        """
-        search_pattern = f"%{search_term}%"
+    def get_by_ids(self, kniha_ids):
+        """Get knihy by list of IDs, in the given order"""
+        if not kniha_ids:
+            return []
         
         try:
-            results = self.db.execute_select(query, (search_pattern,))
-            return [self._map_to_object(row) for row in results]
+            return fetch_by_ids(self.db, SELECT_KNIHY, 'k.id', kniha_ids, self._map_to_object)
         except Exception as e:
-            raise Exception(f"Failed to search knihy: {e}")
+            raise Exception(f"Failed to get knihy by ids: {e}")
     
     def add_autor(self, kniha_id, autor_id, poradi=1):
         """Link kniha with autor (M:N)"""
@@ -154,19 +297,50 @@ class KnihaDAO:
         """
         
         try:
-            from models.autor import Autor
             results = self.db.execute_select(query, (kniha_id,))
-            return [Autor(
-                id=row['id'],
-                jmeno=row['jmeno'],
-                prijmeni=row['prijmeni'],
-                datum_narozeni=row['datum_narozeni'],
-                zeme_puvodu=row['zeme_puvodu'],
-                created_at=row['created_at']
-            ) for row in results]
+            return [self._map_autor(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get kniha autori: {e}")
     
+    def get_autori_for_many(self, kniha_ids):
+        """Get autori for many knihy at once, returns {kniha_id: [Autor, ...]} ordered by poradi"""
+        autori_by_kniha = {kniha_id: [] for kniha_id in kniha_ids}
+        unique_ids = list(autori_by_kniha)
+        
+        try:
+            for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+                chunk = unique_ids[start:start + IN_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                query = f"""
+                    SELECT ka.kniha_id, a.* FROM knihy_autori ka
+                    JOIN autori a ON a.id = ka.autor_id
+                    WHERE ka.kniha_id IN ({placeholders})
+                    ORDER BY ka.kniha_id, ka.poradi
+                """
+                for row in self.db.execute_select(query, tuple(chunk)):
+                    autori_by_kniha[row['kniha_id']].append(self._map_autor(row))
+            return autori_by_kniha
+        except Exception as e:
+            raise Exception(f"Failed to get autori for knihy: {e}")
+    
+    def load_autori(self, knihy):
+        """Fill kniha.autori for every kniha in one query per IN_CHUNK_SIZE knihy"""
+        autori_by_kniha = self.get_autori_for_many([kniha.id for kniha in knihy])
+        for kniha in knihy:
+            kniha.autori = autori_by_kniha[kniha.id]
+        return knihy
+    
+    def _map_autor(self, row):
+        """Map database row to Autor object"""
+        return Autor(
+            id=row['id'],
+            jmeno=row['jmeno'],
+            prijmeni=row['prijmeni'],
+            datum_narozeni=row['datum_narozeni'],
+            zeme_puvodu=row['zeme_puvodu'],
+            created_at=row['created_at']
+        )
+    
     def _map_to_object(self, row):
         """Map database row to Kniha object"""
         kniha = Kniha(
@@ -178,7 +352,18 @@ class KnihaDAO:
             hodnoceni=row['hodnoceni'],
             dostupna=bool(row['dostupna']),
             zanr_id=row['zanr_id'],
-            created_at=row['created_at']
+            created_at=row['created_at'],
+            pocet_exemplaru=row['pocet_exemplaru'],
+            dostupne_exemplare=row['dostupne_exemplare']
         )
         kniha.zanr_nazev = row.get('zanr_nazev')
         return kniha
+    
+    def _map_tuple(self, row):
+        """Map positional row (SELECT_KNIHY_COLUMNS order) to Kniha object"""
+        (id, nazev, isbn, rok_vydani, pocet_stran, hodnoceni, dostupna, zanr_id, created_at,
+         pocet_exemplaru, dostupne_exemplare, zanr_nazev) = row
+        kniha = Kniha(id, nazev, isbn, rok_vydani, pocet_stran, hodnoceni,
+                      bool(dostupna), zanr_id, created_at, pocet_exemplaru, dostupne_exemplare)
+        kniha.zanr_nazev = zanr_nazev
+        return kniha
@@ -0,0 +1,96 @@
+def keyset_condition(sort_keys, after):
+    """
+    Build the seek predicate for rows following the cursor `after`.
+    sort_keys is a list of (column, row_key, descending) in ORDER BY order.
+    Returns (sql, params).
+    """
+    clauses = []
+    params = []
+
+    for i, (column, _, descending) in enumerate(sort_keys):
+        parts = [f"{prev_column} = %s" for prev_column, _, _ in sort_keys[:i]]
+        parts.append(f"{column} {'<' if descending else '>'} %s")
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(after[:i + 1])
+
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def order_by(sort_keys, outer=False):
+    """ORDER BY list of sort_keys, by result column name when outer is set"""
+    return ", ".join(
+        f"{row_key if outer else column}{' DESC' if descending else ''}"
+        for column, row_key, descending in sort_keys
+    )
+
+
+def fetch_page(db, select, sort_keys, map_row, conditions=None, params=None,
+               after=None, limit=50):
+    """
+    Fetch one page using keyset (seek) pagination, never OFFSET.
+    Returns {'items': [...], 'next_cursor': tuple or None}; pass next_cursor
+    back as `after` to get the following page.
+    """
+    conditions = list(conditions or [])
+    params = list(params or [])
+
+    if after is not None:
+        condition, condition_params = keyset_condition(sort_keys, after)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    query = select
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY " + order_by(sort_keys)
+    # One extra row tells whether another page exists
+    query += " LIMIT %s"
+    params.append(limit + 1)
+
+    rows = db.execute_select(query, tuple(params))
+    return _page(rows, sort_keys, map_row, limit)
+
+
+def fetch_union_page(db, selects, sort_keys, map_row, conditions=None, params=None,
+                     after=None, limit=50):
+    """
+    Fetch one keyset page of the UNION ALL of selects (same result columns,
+    e.g. a live and an archive table). The conditions, seek predicate,
+    ORDER BY and LIMIT go into every branch, so each one reads at most one
+    page from its own index; the branches are then merged and limited again.
+    Returns the same dict as fetch_page.
+    """
+    conditions = list(conditions or [])
+    params = list(params or [])
+
+    if after is not None:
+        condition, condition_params = keyset_condition(sort_keys, after)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    # A branch needs its own derived table to keep ORDER BY / LIMIT inside the union
+    branches = [
+        f"SELECT * FROM ({select}{where} ORDER BY {order_by(sort_keys)} LIMIT %s) b{i}"
+        for i, select in enumerate(selects)
+    ]
+    query = (f"SELECT * FROM ({' UNION ALL '.join(branches)}) u"
+             f" ORDER BY {order_by(sort_keys, outer=True)} LIMIT %s")
+    all_params = (params + [limit + 1]) * len(selects) + [limit + 1]
+
+    rows = db.execute_select(query, tuple(all_params))
+    return _page(rows, sort_keys, map_row, limit)
+
+
+def _page(rows, sort_keys, map_row, limit):
+    """Cut the extra row fetched past limit and turn it into next_cursor"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = tuple(last[row_key] for _, row_key, _ in sort_keys)
+
+    return {
+        'items': [map_row(row) for row in rows],
+        'next_cursor': next_cursor
+    }
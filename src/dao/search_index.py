@@ -0,0 +1,248 @@
+import bisect
+import re
+import threading
+import unicodedata
+
+# Shortest token MySQL FULLTEXT indexes by default (innodb_ft_min_token_size)
+FULLTEXT_MIN_TOKEN = 3
+# Below this many candidates the remaining words are checked per document
+CANDIDATE_SCAN_LIMIT = 1000
+# Maximum number of IDs sent in one IN (...) list
+IN_CHUNK_SIZE = 1000
+
+
+def fold_text(text):
+    """Lowercase text and strip diacritics ("Čapek" -> "capek")"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    """Split text into folded word tokens"""
+    return re.findall(r'\w+', fold_text(text))
+
+
+def fulltext_query(search_term):
+    """
+    Build a MySQL boolean-mode query requiring every word as a prefix.
+    Returns None when no word is long enough for the FULLTEXT index.
+    """
+    words = re.findall(r'\w+', (search_term or '').lower())
+    if not words or all(len(word) < FULLTEXT_MIN_TOKEN for word in words):
+        return None
+    return ' '.join(f"+{word}*" for word in words if len(word) >= FULLTEXT_MIN_TOKEN)
+
+
+class SearchIndex:
+    """In-process inverted index with accent folding, prefix matching and ranking"""
+
+    def __init__(self):
+        self._postings = {}
+        self._documents = {}
+        # Sorted vocabulary for prefix lookups
+        self._vocabulary = []
+        self._lock = threading.RLock()
+        self.built = False
+        # Bumped by invalidate(), a build only counts if it did not change meanwhile
+        self._generation = 0
+        # Held by the owner for a whole rebuild (SearchIndexMixin.build_search_index)
+        self.build_lock = threading.RLock()
+
+    def add(self, doc_id, *fields):
+        """Index (or re-index) a document"""
+        tokens = tuple(tokenize(' '.join(field for field in fields if field)))
+
+        with self._lock:
+            self._remove(doc_id)
+            self._documents[doc_id] = tokens
+            for token in set(tokens):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    bisect.insort(self._vocabulary, token)
+                postings.add(doc_id)
+
+    def remove(self, doc_id):
+        """Remove a document from the index"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def clear(self):
+        """
+        Drop all documents and mark the index as not built. Returns the
+        generation to pass to mark_built() once the documents are re-added.
+        """
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._vocabulary = []
+            self.built = False
+            return self._generation
+
+    def mark_built(self, generation):
+        """Mark a rebuild started at generation as complete, unless invalidate() ran since"""
+        with self._lock:
+            if generation == self._generation:
+                self.built = True
+            return self.built
+
+    def invalidate(self):
+        """Mark the index as stale so the owner rebuilds it before the next search"""
+        with self._lock:
+            self._generation += 1
+            self.built = False
+
+    def search(self, query, limit=None):
+        """
+        Return document IDs matching every query word as a prefix.
+        Exact word matches rank above prefix matches, shorter documents
+        rank above longer ones.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Longer words are more selective, narrow the candidates with them first
+        words.sort(key=len, reverse=True)
+
+        with self._lock:
+            scores = None
+            for word in words:
+                if scores is not None and len(scores) <= CANDIDATE_SCAN_LIMIT:
+                    word_scores = self._score_candidates(word, scores)
+                else:
+                    word_scores = self._score_postings(word)
+
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {doc_id: score + word_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in word_scores}
+                if not scores:
+                    return []
+
+            ranked = sorted(
+                scores,
+                key=lambda doc_id: (-scores[doc_id], len(self._documents[doc_id]), doc_id)
+            )
+
+        return ranked[:limit] if limit else ranked
+
+    def _score_postings(self, word):
+        """Score all documents containing word as a prefix (caller holds lock)"""
+        word_scores = {}
+        for token in self._prefix_tokens(word):
+            weight = 2 if token == word else 1
+            for doc_id in self._postings[token]:
+                if word_scores.get(doc_id, 0) < weight:
+                    word_scores[doc_id] = weight
+        return word_scores
+
+    def _score_candidates(self, word, candidates):
+        """Score only the given documents against word (caller holds lock)"""
+        word_scores = {}
+        for doc_id in candidates:
+            weight = 0
+            for token in self._documents[doc_id]:
+                if token == word:
+                    weight = 2
+                    break
+                if token.startswith(word):
+                    weight = 1
+            if weight:
+                word_scores[doc_id] = weight
+        return word_scores
+
+    def _prefix_tokens(self, prefix):
+        """Vocabulary tokens starting with prefix (caller holds lock)"""
+        vocabulary = self._vocabulary
+        index = bisect.bisect_left(vocabulary, prefix)
+        tokens = []
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            tokens.append(vocabulary[index])
+            index += 1
+        return tokens
+
+    def _remove(self, doc_id):
+        tokens = self._documents.pop(doc_id, None)
+        if not tokens:
+            return
+
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                index = bisect.bisect_left(self._vocabulary, token)
+                if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                    del self._vocabulary[index]
+
+    def __len__(self):
+        return len(self._documents)
+
+
+def fetch_by_ids(db, select, id_column, ids, map_row):
+    """Rows of select with id_column in ids, mapped and in the order of ids (one query per IN_CHUNK_SIZE)"""
+    by_id = {}
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        for row in db.execute_select(select + f" WHERE {id_column} IN ({placeholders})", tuple(chunk)):
+            by_id[row['id']] = map_row(row)
+    return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+
+class SearchIndexMixin:
+    """
+    build_search_index / _search_index_lookup for a DAO with self.db,
+    self.search_index and _map_to_object. The DAO names its table and the
+    indexed columns; SEARCH_SELECT (filtered on SEARCH_ID_COLUMN) loads
+    the matching rows, by default every column of the table.
+    """
+
+    SEARCH_TABLE = None
+    SEARCH_COLUMNS = ()
+    SEARCH_SELECT = None
+    SEARCH_ID_COLUMN = 'id'
+
+    def build_search_index(self):
+        """
+        (Re)build the in-process search index from the table. Returns
+        False when the index was invalidated during the build (e.g. by a
+        bulk import), it then stays unbuilt and the next search rebuilds it.
+        """
+        if self.search_index is None:
+            return False
+
+        query = f"SELECT id, {', '.join(self.SEARCH_COLUMNS)} FROM {self.SEARCH_TABLE}"
+        index = self.search_index
+        try:
+            with index.build_lock:
+                generation = index.clear()
+                for rows in self.db.stream_select(query):
+                    for row in rows:
+                        index.add(row['id'], *(row[column] for column in self.SEARCH_COLUMNS))
+                return index.mark_built(generation)
+        except Exception as e:
+            raise Exception(f"Failed to build {self.SEARCH_TABLE} search index: {e}")
+
+    def _search_index_lookup(self, search_term, limit):
+        """Search the in-process index, building it on first use"""
+        index = self.search_index
+        if not index.built:
+            with index.build_lock:
+                # Another thread may have built it while this one waited
+                if not index.built:
+                    self.build_search_index()
+
+        doc_ids = index.search(search_term, limit)
+        if not doc_ids:
+            return []
+
+        select = self.SEARCH_SELECT or f"SELECT * FROM {self.SEARCH_TABLE}"
+        try:
+            return fetch_by_ids(self.db, select, self.SEARCH_ID_COLUMN, doc_ids, self._map_to_object)
+        except Exception as e:
+            raise Exception(f"Failed to search {self.SEARCH_TABLE}: {e}")
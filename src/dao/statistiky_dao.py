@@ -0,0 +1,151 @@
+from datetime import datetime
+
+# Counter column for each vypujcka stav
+STAV_COLUMNS = {
+    'active': 'aktivnich_vypujcek',
+    'returned': 'vraceno',
+    'overdue': 'po_terminu',
+    'cancelled': 'zruseno'
+}
+COUNTER_COLUMNS = ('pocet_vypujcek', 'aktivnich_vypujcek', 'vraceno', 'po_terminu', 'zruseno')
+
+UPSERT_QUERY = """
+    INSERT INTO {table} ({key}, pocet_vypujcek, aktivnich_vypujcek, vraceno,
+                         po_terminu, zruseno, posledni_vypujcka)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        pocet_vypujcek = pocet_vypujcek + VALUES(pocet_vypujcek),
+        aktivnich_vypujcek = aktivnich_vypujcek + VALUES(aktivnich_vypujcek),
+        vraceno = vraceno + VALUES(vraceno),
+        po_terminu = po_terminu + VALUES(po_terminu),
+        zruseno = zruseno + VALUES(zruseno),
+        posledni_vypujcka = GREATEST(COALESCE(posledni_vypujcka, VALUES(posledni_vypujcka)),
+                                     COALESCE(VALUES(posledni_vypujcka), posledni_vypujcka))
+"""
+
+REBUILD_QUERY = """
+    INSERT INTO {table} ({key}, pocet_vypujcek, aktivnich_vypujcek, vraceno,
+                         po_terminu, zruseno, posledni_vypujcka)
+    SELECT {key}, COUNT(*),
+           SUM(CASE WHEN stav = 'active' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN stav = 'returned' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN stav = 'overdue' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN stav = 'cancelled' THEN 1 ELSE 0 END),
+           MAX(datum_vypujceni)
+    FROM (SELECT {key}, stav, datum_vypujceni FROM vypujcky
+          UNION ALL
+          SELECT {key}, stav, datum_vypujceni FROM vypujcky_archiv) v
+    GROUP BY {key}
+"""
+
+# (table, key column) of each statistics table
+TABLES = (('statistiky_knih', 'kniha_id'), ('statistiky_ctenaru', 'ctenar_id'))
+
+
+def as_datetime(value):
+    """datum_vypujceni as datetime, so dates and datetimes compare"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime(value.year, value.month, value.day)
+
+
+class StatistikyDelta:
+    """
+    Loan counter changes collected during one transaction and written to
+    statistiky_knih / statistiky_ctenaru with one upsert per table.
+    
+    posledni_vypujcka only ever moves forward; a removed loan leaves it as
+    it was until the next rebuild.
+    """
+    
+    def __init__(self):
+        # kniha_id / ctenar_id -> [counters..., posledni_vypujcka]
+        self.knihy = {}
+        self.ctenari = {}
+    
+    def add_loan(self, kniha_id, ctenar_id, stav, datum_vypujceni=None):
+        """Count a new vypujcka"""
+        for rows, key in ((self.knihy, kniha_id), (self.ctenari, ctenar_id)):
+            row = self._row(rows, key)
+            row[0] += 1
+            row[COUNTER_COLUMNS.index(STAV_COLUMNS[stav])] += 1
+            datum = as_datetime(datum_vypujceni)
+            if datum is not None and (row[-1] is None or datum > row[-1]):
+                row[-1] = datum
+    
+    def remove_loan(self, kniha_id, ctenar_id, stav):
+        """Uncount a vypujcka (before it is changed or deleted)"""
+        for rows, key in ((self.knihy, kniha_id), (self.ctenari, ctenar_id)):
+            row = self._row(rows, key)
+            row[0] -= 1
+            row[COUNTER_COLUMNS.index(STAV_COLUMNS[stav])] -= 1
+    
+    def change_stav(self, kniha_id, ctenar_id, old_stav, new_stav):
+        """Move a vypujcka from one stav counter to another"""
+        if old_stav == new_stav:
+            return
+        for rows, key in ((self.knihy, kniha_id), (self.ctenari, ctenar_id)):
+            row = self._row(rows, key)
+            row[COUNTER_COLUMNS.index(STAV_COLUMNS[old_stav])] -= 1
+            row[COUNTER_COLUMNS.index(STAV_COLUMNS[new_stav])] += 1
+    
+    def apply(self, cursor):
+        """Write the collected changes on the transaction's cursor"""
+        for (table, key), rows in zip(TABLES, (self.knihy, self.ctenari)):
+            # Sorted keys keep the row lock order the same in every transaction
+            params = [(row_id, *row) for row_id, row in sorted(rows.items())
+                      if any(row[:-1]) or row[-1] is not None]
+            if params:
+                cursor.executemany(UPSERT_QUERY.format(table=table, key=key), params)
+        self.knihy.clear()
+        self.ctenari.clear()
+    
+    @staticmethod
+    def _row(rows, key):
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = [0] * len(COUNTER_COLUMNS) + [None]
+        return row
+
+
+class StatistikyDAO:
+    """Data Access Object for the statistiky_knih and statistiky_ctenaru tables"""
+    
+    def __init__(self, database):
+        self.db = database
+    
+    def rebuild(self):
+        """Recompute both tables from vypujcky and vypujcky_archiv, returns number of rows per table"""
+        counts = {}
+        
+        try:
+            with self.db.transaction() as cursor:
+                for table, key in TABLES:
+                    cursor.execute(f"DELETE FROM {table}")
+                    cursor.execute(REBUILD_QUERY.format(table=table, key=key))
+                    counts[table] = cursor.rowcount
+            return counts
+        except Exception as e:
+            raise Exception(f"Failed to rebuild statistics: {e}")
+    
+    def get_by_kniha(self, kniha_id):
+        """Get loan counters of a kniha (zeros when it was never lent)"""
+        return self._get('statistiky_knih', 'kniha_id', kniha_id)
+    
+    def get_by_ctenar(self, ctenar_id):
+        """Get loan counters of a ctenar (zeros when nothing was borrowed)"""
+        return self._get('statistiky_ctenaru', 'ctenar_id', ctenar_id)
+    
+    def _get(self, table, key, row_id):
+        query = f"SELECT * FROM {table} WHERE {key} = %s"
+        
+        try:
+            results = self.db.execute_select(query, (row_id,))
+            if results:
+                return results[0]
+            return dict({key: row_id, 'posledni_vypujcka': None},
+                        **{column: 0 for column in COUNTER_COLUMNS})
+        except Exception as e:
+            raise Exception(f"Failed to get statistics: {e}")
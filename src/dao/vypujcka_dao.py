@@ -1,4 +1,83 @@
 from models.vypujcka import Vypujcka
+from dao.pagination import fetch_page, fetch_union_page
+from dao.statistiky_dao import StatistikyDelta
+from dao.exemplar_dao import BookAlreadyLentError, claim_exemplar, release_exemplar
+
+# Columns shared by vypujcky and vypujcky_archiv
+VYPUJCKA_FIELDS = ("id, kniha_id, ctenar_id, datum_vypujceni, datum_vraceni, predpokladane_vraceni, "
+                   "stav, poznamka, created_at, exemplar_id")
+# Loan columns with kniha and ctenar names, in the order VypujckaDAO._map_tuple expects
+VYPUJCKA_COLUMNS = (", ".join(f"v.{field}" for field in VYPUJCKA_FIELDS.split(", "))
+                    + ", k.nazev as kniha_nazev, CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno")
+# Live loans first, then the archive
+VYPUJCKA_TABLES = ('vypujcky', 'vypujcky_archiv')
+# Newest loans first
+HISTORY_SORT_KEYS = [('v.datum_vypujceni', 'datum_vypujceni', True), ('v.id', 'id', True)]
+# Nearest due date first
+DUE_SORT_KEYS = [('v.predpokladane_vraceni', 'predpokladane_vraceni', False), ('v.id', 'id', False)]
+# Loans that hold an exemplar
+OPEN_STAV = ('active', 'overdue')
+
+
+def select_vypujcky(table='vypujcky', columns=VYPUJCKA_COLUMNS):
+    """SELECT of loans in table (vypujcky or vypujcky_archiv) as v, joined with knihy k and ctenari c"""
+    return f"""
+    SELECT {columns}
+    FROM {table} v
+    JOIN knihy k ON v.kniha_id = k.id
+    JOIN ctenari c ON v.ctenar_id = c.id
+"""
+
+
+def select_with_archive(columns=VYPUJCKA_COLUMNS, condition=None, order_by=None):
+    """
+    Query over live and archived loans: the same select_vypujcky for both
+    tables with condition (on v columns) inside each branch, so each table
+    filters on its own index, merged with UNION ALL and ordered by order_by
+    (result column names). Pass the condition parameters once per table.
+    """
+    where = f"WHERE {condition}" if condition else ""
+    union = " UNION ALL ".join(select_vypujcky(table, columns) + where for table in VYPUJCKA_TABLES)
+    query = f"SELECT * FROM ({union}) u"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return query
+
+
+SELECT_VYPUJCKY = select_vypujcky()
+# One branch per table for fetch_union_page
+SELECT_VYPUJCKY_ARCHIVE = [select_vypujcky(table) for table in VYPUJCKA_TABLES]
+
+
+class VypujckaNotActiveError(Exception):
+    """Vypujcka was already returned or cancelled"""
+
+
+def close_vypujcka(cursor, vypujcka_id, stav, datum_vraceni=None):
+    """
+    Close an open vypujcka (returned / cancelled), give its exemplar back
+    and update the loan statistics.
+    Raises VypujckaNotActiveError when the vypujcka is not open.
+    """
+    cursor.execute(
+        "SELECT kniha_id, ctenar_id, exemplar_id, stav FROM vypujcky WHERE id = %s FOR UPDATE",
+        (vypujcka_id,)
+    )
+    row = cursor.fetchone()
+    if row is None or row[3] not in OPEN_STAV:
+        raise VypujckaNotActiveError(f"Vypujcka {vypujcka_id} is not active")
+    kniha_id, ctenar_id, exemplar_id, old_stav = row
+    
+    cursor.execute(
+        "UPDATE vypujcky SET stav = %s, datum_vraceni = COALESCE(%s, datum_vraceni) WHERE id = %s",
+        (stav, datum_vraceni, vypujcka_id)
+    )
+    release_exemplar(cursor, kniha_id, exemplar_id)
+    
+    delta = StatistikyDelta()
+    delta.change_stav(kniha_id, ctenar_id, old_stav, stav)
+    delta.apply(cursor)
+
 
 class VypujckaDAO:
     """Data Access Object for Vypujcka table"""
@@ -7,198 +86,357 @@ class VypujckaDAO:
         self.db = database
     
     def create(self, vypujcka):
-        """Insert new vypujcka"""
+        """
+        Insert new vypujcka and count it in the statistics. An open one
+        (active / overdue) claims an available exemplar of the kniha.
+        Raises BookAlreadyLentError when there is none.
+        """
         query = """
-            INSERT INTO vypujcky (kniha_id, ctenar_id, datum_vypujceni, 
+            INSERT INTO vypujcky (kniha_id, exemplar_id, ctenar_id, datum_vypujceni, 
                                  datum_vraceni, predpokladane_vraceni, stav, poznamka)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
-        params = (vypujcka.kniha_id, vypujcka.ctenar_id, vypujcka.datum_vypujceni,
-                 vypujcka.datum_vraceni, vypujcka.predpokladane_vraceni, 
-                 vypujcka.stav, vypujcka.poznamka)
         
         try:
-            vypujcka_id = self.db.execute_query(query, params)
-            vypujcka.id = vypujcka_id
+            with self.db.transaction() as cursor:
+                if vypujcka.stav in OPEN_STAV:
+                    vypujcka.exemplar_id = claim_exemplar(cursor, vypujcka.kniha_id)
+                params = (vypujcka.kniha_id, vypujcka.exemplar_id, vypujcka.ctenar_id, vypujcka.datum_vypujceni,
+                         vypujcka.datum_vraceni, vypujcka.predpokladane_vraceni, 
+                         vypujcka.stav, vypujcka.poznamka)
+                cursor.execute(query, params)
+                vypujcka.id = cursor.lastrowid
+                delta = StatistikyDelta()
+                delta.add_loan(vypujcka.kniha_id, vypujcka.ctenar_id, vypujcka.stav,
+                               vypujcka.datum_vypujceni)
+                delta.apply(cursor)
             return vypujcka
+        except BookAlreadyLentError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to create vypujcka: {e}")
     
     def get_by_id(self, vypujcka_id):
         """Get vypujcka by ID with kniha and ctenar info"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.id = %s
-        """
-        
         try:
-            results = self.db.execute_select(query, (vypujcka_id,))
+            results = self.db.execute_select(SELECT_VYPUJCKY + "WHERE v.id = %s", (vypujcka_id,))
+            if not results:
+                # Closed loans may have been moved to the archive
+                results = self.db.execute_select(
+                    select_vypujcky('vypujcky_archiv') + "WHERE v.id = %s", (vypujcka_id,))
             if results:
                 return self._map_to_object(results[0])
             return None
         except Exception as e:
             raise Exception(f"Failed to get vypujcka: {e}")
     
-    def get_all(self):
-        """Get all vypujcky"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            ORDER BY v.datum_vypujceni DESC
-        """
+    def get_all(self, include_archive=False):
+        """Get all live vypujcky (archived ones too when include_archive is set)"""
+        query = SELECT_VYPUJCKY + "ORDER BY v.datum_vypujceni DESC"
+        if include_archive:
+            query = select_with_archive(order_by="datum_vypujceni DESC")
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get all vypujcky: {e}")
     
+    def get_all_page(self, after=None, limit=50, include_archive=False):
+        """Get one page of vypujcky, newest first (keyset pagination)"""
+        try:
+            return self._history_page(None, None, after, limit, include_archive)
+        except Exception as e:
+            raise Exception(f"Failed to get vypujcky page: {e}")
+    
     def get_active(self):
         """Get active vypujcky"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.stav = 'active'
-            ORDER BY v.predpokladane_vraceni
-        """
+        query = SELECT_VYPUJCKY + "WHERE v.stav = 'active' ORDER BY v.predpokladane_vraceni"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get active vypujcky: {e}")
     
-    def get_by_ctenar(self, ctenar_id):
-        """Get vypujcky by ctenar"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.ctenar_id = %s
-            ORDER BY v.datum_vypujceni DESC
-        """
+    def get_active_page(self, after=None, limit=50):
+        """Get one page of active vypujcky, nearest due date first (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, SELECT_VYPUJCKY, DUE_SORT_KEYS,
+                self._map_to_object, conditions=["v.stav = 'active'"],
+                after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get active vypujcky page: {e}")
+    
+    def get_by_ctenar(self, ctenar_id, include_archive=False):
+        """Get live vypujcky by ctenar (archived ones too when include_archive is set)"""
+        query = SELECT_VYPUJCKY + "WHERE v.ctenar_id = %s ORDER BY v.datum_vypujceni DESC"
+        params = (ctenar_id,)
+        if include_archive:
+            query = select_with_archive(condition="v.ctenar_id = %s", order_by="datum_vypujceni DESC")
+            params = (ctenar_id, ctenar_id)
         
         try:
-            results = self.db.execute_select(query, (ctenar_id,))
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query, params)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get vypujcky by ctenar: {e}")
     
-    def get_by_kniha(self, kniha_id):
-        """Get vypujcky by kniha"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.kniha_id = %s
-            ORDER BY v.datum_vypujceni DESC
-        """
+    def get_by_ctenar_page(self, ctenar_id, after=None, limit=50, include_archive=False):
+        """Get one page of vypujcky by ctenar, newest first (keyset pagination)"""
+        try:
+            return self._history_page(["v.ctenar_id = %s"], [ctenar_id], after, limit, include_archive)
+        except Exception as e:
+            raise Exception(f"Failed to get vypujcky page by ctenar: {e}")
+    
+    def get_by_kniha(self, kniha_id, include_archive=False):
+        """Get live vypujcky by kniha (archived ones too when include_archive is set)"""
+        query = SELECT_VYPUJCKY + "WHERE v.kniha_id = %s ORDER BY v.datum_vypujceni DESC"
+        params = (kniha_id,)
+        if include_archive:
+            query = select_with_archive(condition="v.kniha_id = %s", order_by="datum_vypujceni DESC")
+            params = (kniha_id, kniha_id)
         
         try:
-            results = self.db.execute_select(query, (kniha_id,))
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query, params)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get vypujcky by kniha: {e}")
     
+    def get_by_kniha_page(self, kniha_id, after=None, limit=50, include_archive=False):
+        """Get one page of vypujcky by kniha, newest first (keyset pagination)"""
+        try:
+            return self._history_page(["v.kniha_id = %s"], [kniha_id], after, limit, include_archive)
+        except Exception as e:
+            raise Exception(f"Failed to get vypujcky page by kniha: {e}")
+    
+    def _history_page(self, conditions, params, after, limit, include_archive):
+        """
+        One page of loans, newest first. With include_archive the seek and
+        LIMIT run in both the live and the archive branch, so a page reads
+        at most limit + 1 rows from each table.
+        """
+        if include_archive:
+            return fetch_union_page(
+                self.db, SELECT_VYPUJCKY_ARCHIVE, HISTORY_SORT_KEYS,
+                self._map_to_object, conditions=conditions,
+                params=params, after=after, limit=limit
+            )
+        return fetch_page(
+            self.db, SELECT_VYPUJCKY, HISTORY_SORT_KEYS,
+            self._map_to_object, conditions=conditions,
+            params=params, after=after, limit=limit
+        )
+    
     def update(self, vypujcka):
-        """Update vypujcka"""
+        """
+        Update vypujcka (the old version is uncounted, the new one counted).
+        exemplar_id follows the stav: closing the loan gives its exemplar
+        back, opening it or moving it to another kniha claims a new one.
+        """
         query = """
             UPDATE vypujcky 
-            SET kniha_id = %s, ctenar_id = %s, datum_vypujceni = %s,
+            SET kniha_id = %s, exemplar_id = %s, ctenar_id = %s, datum_vypujceni = %s,
                 datum_vraceni = %s, predpokladane_vraceni = %s, stav = %s, poznamka = %s
             WHERE id = %s
         """
-        params = (vypujcka.kniha_id, vypujcka.ctenar_id, vypujcka.datum_vypujceni,
-                 vypujcka.datum_vraceni, vypujcka.predpokladane_vraceni,
-                 vypujcka.stav, vypujcka.poznamka, vypujcka.id)
         
         try:
-            self.db.execute_query(query, params)
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "SELECT kniha_id, ctenar_id, stav, exemplar_id FROM vypujcky WHERE id = %s FOR UPDATE",
+                    (vypujcka.id,)
+                )
+                old = cursor.fetchone()
+                if old is None:
+                    return vypujcka
+                old_kniha_id, old_ctenar_id, old_stav, old_exemplar_id = old
+                
+                same_kniha = vypujcka.kniha_id == old_kniha_id
+                if old_stav in OPEN_STAV and vypujcka.stav in OPEN_STAV and same_kniha:
+                    exemplar_id = old_exemplar_id
+                else:
+                    if old_stav in OPEN_STAV:
+                        release_exemplar(cursor, old_kniha_id, old_exemplar_id)
+                    if vypujcka.stav in OPEN_STAV:
+                        exemplar_id = claim_exemplar(cursor, vypujcka.kniha_id)
+                    else:
+                        exemplar_id = old_exemplar_id if same_kniha else None
+                vypujcka.exemplar_id = exemplar_id
+                
+                cursor.execute(query, (
+                    vypujcka.kniha_id, vypujcka.exemplar_id, vypujcka.ctenar_id, vypujcka.datum_vypujceni,
+                    vypujcka.datum_vraceni, vypujcka.predpokladane_vraceni,
+                    vypujcka.stav, vypujcka.poznamka, vypujcka.id
+                ))
+                delta = StatistikyDelta()
+                delta.remove_loan(old_kniha_id, old_ctenar_id, old_stav)
+                delta.add_loan(vypujcka.kniha_id, vypujcka.ctenar_id, vypujcka.stav,
+                               vypujcka.datum_vypujceni)
+                delta.apply(cursor)
             return vypujcka
+        except BookAlreadyLentError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to update vypujcka: {e}")
     
     def return_book(self, vypujcka_id, datum_vraceni):
-        """Mark vypujcka as returned"""
-        query = """
-            UPDATE vypujcky 
-            SET datum_vraceni = %s, stav = 'returned'
-            WHERE id = %s
-        """
-        
+        """Mark vypujcka as returned and give its exemplar back"""
         try:
-            self.db.execute_query(query, (datum_vraceni, vypujcka_id))
+            with self.db.transaction() as cursor:
+                close_vypujcka(cursor, vypujcka_id, 'returned', datum_vraceni)
             return True
+        except VypujckaNotActiveError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to return book: {e}")
     
     def mark_overdue(self, vypujcka_id):
         """Mark vypujcka as overdue"""
-        query = "UPDATE vypujcky SET stav = 'overdue' WHERE id = %s"
-        
         try:
-            self.db.execute_query(query, (vypujcka_id,))
+            self._change_stav(vypujcka_id, 'overdue')
             return True
+        except VypujckaNotActiveError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to mark overdue: {e}")
 
     def delete(self, vypujcka_id):
-        """Cancel vypujcka (change state to cancelled)"""
-        query = "UPDATE vypujcky SET stav = 'cancelled' WHERE id = %s"
-        
+        """Cancel vypujcka (change state to cancelled) and give its exemplar back"""
         try:
-            self.db.execute_query(query, (vypujcka_id,))
+            with self.db.transaction() as cursor:
+                close_vypujcka(cursor, vypujcka_id, 'cancelled')
             return True
+        except VypujckaNotActiveError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to cancel vypujcka: {e}")
     
     def update_overdue_loans(self):
         """Update overdue loans automatically"""
-        query = """
-            UPDATE vypujcky 
-            SET stav = 'overdue'
-            WHERE stav = 'active' 
-            AND predpokladane_vraceni < CURDATE()
-        """
-        
         try:
-            self.db.execute_query(query)
+            self.sweep_overdue_loans()
             return True
         except Exception as e:
             raise Exception(f"Failed to update overdue loans: {e}")
     
+    def sweep_overdue_loans(self, batch_size=500):
+        """
+        Mark active loans past predpokladane_vraceni as overdue in bounded batches.
+        Each batch is its own short transaction (statistics included); rows
+        locked by a concurrent return are skipped. Returns IDs of the loans
+        that changed.
+        """
+        select_query = """
+            SELECT id, kniha_id, ctenar_id FROM vypujcky
+            WHERE stav = 'active' AND predpokladane_vraceni < CURDATE()
+            ORDER BY predpokladane_vraceni, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """
+        changed_ids = []
+        
+        try:
+            while True:
+                with self.db.transaction() as cursor:
+                    cursor.execute(select_query, (batch_size,))
+                    rows = cursor.fetchall()
+                    batch_ids = [row[0] for row in rows]
+                    
+                    if batch_ids:
+                        placeholders = ', '.join(['%s'] * len(batch_ids))
+                        cursor.execute(
+                            f"UPDATE vypujcky SET stav = 'overdue' WHERE id IN ({placeholders}) AND stav = 'active'",
+                            tuple(batch_ids)
+                        )
+                        delta = StatistikyDelta()
+                        for _, kniha_id, ctenar_id in rows:
+                            delta.change_stav(kniha_id, ctenar_id, 'active', 'overdue')
+                        delta.apply(cursor)
+                
+                changed_ids.extend(batch_ids)
+                if len(batch_ids) < batch_size:
+                    return changed_ids
+        except Exception as e:
+            raise Exception(f"Failed to sweep overdue loans: {e}")
+    
+    def archive_closed_loans(self, before, batch_size=1000):
+        """
+        Move returned / cancelled loans borrowed before `before` to
+        vypujcky_archiv in batches, each its own short transaction. They
+        stay counted in the statistics. Returns the number of moved loans.
+        """
+        select_query = """
+            SELECT id FROM vypujcky
+            WHERE datum_vypujceni < %s AND stav IN ('returned', 'cancelled')
+            ORDER BY datum_vypujceni, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """
+        moved = 0
+        
+        try:
+            while True:
+                with self.db.transaction() as cursor:
+                    cursor.execute(select_query, (before, batch_size))
+                    batch_ids = tuple(row[0] for row in cursor.fetchall())
+                    
+                    if batch_ids:
+                        placeholders = ', '.join(['%s'] * len(batch_ids))
+                        cursor.execute(
+                            f"INSERT INTO vypujcky_archiv ({VYPUJCKA_FIELDS}) "
+                            f"SELECT {VYPUJCKA_FIELDS} FROM vypujcky WHERE id IN ({placeholders})",
+                            batch_ids
+                        )
+                        cursor.execute(f"DELETE FROM vypujcky WHERE id IN ({placeholders})", batch_ids)
+                
+                moved += len(batch_ids)
+                if len(batch_ids) < batch_size:
+                    return moved
+        except Exception as e:
+            raise Exception(f"Failed to archive vypujcky: {e}")
+    
     def get_overdue(self):
         """Get overdue vypujcky"""
-        query = """
-            SELECT v.*, k.nazev as kniha_nazev, 
-                   CONCAT(c.jmeno, ' ', c.prijmeni) as ctenar_jmeno
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.stav = 'overdue'
-            ORDER BY v.predpokladane_vraceni
-        """
+        query = SELECT_VYPUJCKY + "WHERE v.stav = 'overdue' ORDER BY v.predpokladane_vraceni"
         
         try:
-            results = self.db.execute_select(query)
-            return [self._map_to_object(row) for row in results]
+            results = self.db.execute_select_tuples(query)
+            return [self._map_tuple(row) for row in results]
         except Exception as e:
             raise Exception(f"Failed to get overdue vypujcky: {e}")
     
+    def get_overdue_page(self, after=None, limit=50):
+        """Get one page of overdue vypujcky, oldest due date first (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, SELECT_VYPUJCKY, DUE_SORT_KEYS,
+                self._map_to_object, conditions=["v.stav = 'overdue'"],
+                after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get overdue vypujcky page: {e}")
+    
+    def _change_stav(self, vypujcka_id, stav):
+        """
+        Move an open vypujcka to another open stav together with its
+        statistics; the exemplar stays lent. Closing goes through close_vypujcka.
+        """
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                "SELECT kniha_id, ctenar_id, stav FROM vypujcky WHERE id = %s FOR UPDATE",
+                (vypujcka_id,)
+            )
+            row = cursor.fetchone()
+            if row is None or row[2] not in OPEN_STAV:
+                raise VypujckaNotActiveError(f"Vypujcka {vypujcka_id} is not active")
+            cursor.execute("UPDATE vypujcky SET stav = %s WHERE id = %s", (stav, vypujcka_id))
+            delta = StatistikyDelta()
+            delta.change_stav(row[0], row[1], row[2], stav)
+            delta.apply(cursor)
+    
     def _map_to_object(self, row):
         """Map database row to Vypujcka object"""
         vypujcka = Vypujcka(
@@ -210,8 +448,16 @@ class VypujckaDAO:
             predpokladane_vraceni=row['predpokladane_vraceni'],
             stav=row['stav'],
             poznamka=row['poznamka'],
-            created_at=row['created_at']
+            created_at=row['created_at'],
+            exemplar_id=row['exemplar_id']
         )
         vypujcka.kniha_nazev = row.get('kniha_nazev')
         vypujcka.ctenar_jmeno = row.get('ctenar_jmeno')
         return vypujcka
+    
+    def _map_tuple(self, row):
+        """Map positional row (SELECT_VYPUJCKY order) to Vypujcka object"""
+        vypujcka = Vypujcka(*row[:10])
+        vypujcka.kniha_nazev = row[10]
+        vypujcka.ctenar_jmeno = row[11]
+        return vypujcka
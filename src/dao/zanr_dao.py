@@ -1,4 +1,5 @@
 from models.zanr import Zanr
+from dao.pagination import fetch_page
 
 class ZanrDAO:
     """Data Access Object for Zanr table"""
@@ -40,6 +41,25 @@ class ZanrDAO:
         except Exception as e:
             raise Exception(f"Failed to get all zanry: {e}")
     
+    def get_all_page(self, after=None, limit=50):
+        """Get one page of zanry ordered by nazev (keyset pagination)"""
+        try:
+            return fetch_page(
+                self.db, "SELECT * FROM zanry",
+                [('nazev', 'nazev', False), ('id', 'id', False)],
+                self._map_to_object, after=after, limit=limit
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get zanry page: {e}")
+    
+    def count(self):
+        """Get number of zanry"""
+        try:
+            results = self.db.execute_select("SELECT COUNT(*) AS pocet FROM zanry")
+            return results[0]['pocet']
+        except Exception as e:
+            raise Exception(f"Failed to count zanry: {e}")
+    
     def update(self, zanr):
         """Update zanr"""
         query = "UPDATE zanry SET nazev = %s, popis = %s WHERE id = %s"
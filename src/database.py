@@ -1,92 +1,394 @@
-import mysql.connector
-from mysql.connector import Error
+from contextlib import contextmanager
 import sys
+import threading
+import time
+from backends import create_backend
+from connection_pool import ConnectionPool
+from query_stats import QueryStats, InstrumentedCursor
+from statement_cache import StatementCache
 
 class Database:
     """Database connection manager with error handling"""
     
     def __init__(self, config):
         self.config = config
+        # Storage engine (MySQL server or embedded SQLite file)
+        self.backend = create_backend(config)
+        self.Error = self.backend.Error
         self.connection = None
-        self.connect()
+        self.pool = None
+        # Connection pinned to the current thread by session()
+        self._local = threading.local()
+        # Guards the shared connection when pooling is disabled
+        self._lock = threading.RLock()
+        
+        # Server-side prepared statements for execute_query / execute_select*,
+        # cached per connection and keyed by SQL text (server engines only)
+        self.prepared_statements = (config.get('prepared_statements', False)
+                                    and self.backend.supports_prepared)
+        self.statement_cache_size = config.get('statement_cache_size', 64)
+        # Keyed by connection, dropped when the connection is closed or discarded
+        self._statement_caches = {}
+        self._statement_caches_lock = threading.Lock()
+        
+        # Per-statement timings and slow query log, None when disabled
+        self.query_stats = QueryStats.from_config(config.get('query_stats'))
+        
+        pool_config = config.get('pool') or {}
+        if pool_config.get('enabled', False):
+            self.create_pool(pool_config)
+        else:
+            self.connect()
+    
+    def _open_connection(self):
+        """Open a new raw connection"""
+        return self.backend.connect()
     
     def connect(self):
         """Establish database connection"""
+        if self.connection is not None:
+            self._drop_statement_cache(self.connection)
         try:
-            self.connection = mysql.connector.connect(
-                host=self.config['host'],
-                port=self.config.get('port', 3306),
-                database=self.config['database'],
-                user=self.config['user'],
-                password=self.config['password']
-            )
+            self.connection = self._open_connection()
             
             if self.connection.is_connected():
                 print("Successfully connected to database")
                 
-        except Error as e:
+        except self.Error as e:
+            print(f"ERROR: Failed to connect to database: {e}")
+            print(self.backend.connect_hint)
+            sys.exit(1)
+    
+    def create_pool(self, pool_config):
+        """Create connection pool and verify that the database is reachable"""
+        self.pool = ConnectionPool(
+            self._open_connection,
+            size=pool_config.get('size', 5),
+            max_overflow=pool_config.get('max_overflow', 10),
+            idle_timeout=pool_config.get('idle_timeout', 300),
+            pre_ping=pool_config.get('pre_ping', True),
+            timeout=pool_config.get('timeout', 30),
+            on_close=self._drop_statement_cache
+        )
+        
+        try:
+            connection = self.pool.acquire()
+            self.pool.release(connection)
+            print(f"Successfully connected to database (pool size {self.pool.size})")
+        except self.Error as e:
             print(f"ERROR: Failed to connect to database: {e}")
-            print("Please check your database configuration and ensure MySQL is running")
+            print(self.backend.connect_hint)
             sys.exit(1)
     
     def get_connection(self):
         """Get database connection"""
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            return bound
+        if self.pool is not None:
+            raise Exception("Pooled database has no shared connection, use session()")
         if not self.connection or not self.connection.is_connected():
             self.connect()
         return self.connection
     
+    @contextmanager
+    def _checkout(self):
+        """Borrow a connection for a single call or unit of work"""
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            yield bound
+            return
+        
+        if self.pool is None:
+            with self._lock:
+                yield self.get_connection()
+            return
+        
+        connection = self.pool.acquire()
+        discard = False
+        try:
+            yield connection
+            # Do not hand a stale read snapshot to the next borrower
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            discard = not self._is_alive(connection)
+            raise
+        finally:
+            self.pool.release(connection, discard=discard)
+    
+    @contextmanager
+    def session(self):
+        """Pin one connection to the current thread for a unit of work"""
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            yield bound
+            return
+        
+        with self._checkout() as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+    
+    def get_pool_stats(self):
+        """Get connection pool statistics (None when pooling is disabled)"""
+        if self.pool is None:
+            return None
+        return self.pool.get_stats()
+    
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            return connection.is_connected()
+        except Exception:
+            return False
+    
     def execute_query(self, query, params=None):
         """Execute a query (INSERT, UPDATE, DELETE)"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            self.connection.commit()
-            last_id = cursor.lastrowid
-            cursor.close()
-            return last_id
-        except Error as e:
-            self.connection.rollback()
-            raise Exception(f"Query execution failed: {e}")
+        started = time.perf_counter() if self.query_stats else None
+        with self._checkout() as connection:
+            try:
+                if self.prepared_statements:
+                    cursor = self._execute_prepared(connection, query, params)
+                    connection.commit()
+                    if started is not None:
+                        self._record(query, params, started, cursor.rowcount)
+                    return cursor.lastrowid
+                
+                cursor = connection.cursor()
+                cursor.execute(query, params or ())
+                connection.commit()
+                last_id = cursor.lastrowid
+                if started is not None:
+                    self._record(query, params, started, cursor.rowcount)
+                cursor.close()
+                return last_id
+            except self.Error as e:
+                connection.rollback()
+                if started is not None:
+                    self._record(query, params, started, error=True)
+                raise Exception(f"Query execution failed: {e}")
     
     def execute_select(self, query, params=None):
         """Execute a SELECT query and return results"""
+        started = time.perf_counter() if self.query_stats else None
+        with self._checkout() as connection:
+            try:
+                if self.prepared_statements:
+                    cursor = self._execute_prepared(connection, query, params)
+                    columns = cursor.column_names
+                    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                else:
+                    cursor = connection.cursor(dictionary=True)
+                    cursor.execute(query, params or ())
+                    results = cursor.fetchall()
+                    cursor.close()
+                if started is not None:
+                    self._record(query, params, started, len(results))
+                return results
+            except self.Error as e:
+                if started is not None:
+                    self._record(query, params, started, error=True)
+                raise Exception(f"Select query failed: {e}")
+    
+    def execute_select_tuples(self, query, params=None):
+        """Execute a SELECT query and return results as plain tuples"""
+        started = time.perf_counter() if self.query_stats else None
+        with self._checkout() as connection:
+            try:
+                if self.prepared_statements:
+                    cursor = self._execute_prepared(connection, query, params)
+                    results = cursor.fetchall()
+                else:
+                    cursor = connection.cursor()
+                    cursor.execute(query, params or ())
+                    results = cursor.fetchall()
+                    cursor.close()
+                if started is not None:
+                    self._record(query, params, started, len(results))
+                return results
+            except self.Error as e:
+                if started is not None:
+                    self._record(query, params, started, error=True)
+                raise Exception(f"Select query failed: {e}")
+    
+    def _record(self, query, params, started, rows=None, error=False):
+        """Account a statement started at started (perf_counter) in query_stats"""
+        self.query_stats.record(query, time.perf_counter() - started, rows, error, params)
+    
+    def _cursor(self, connection):
+        """Plain cursor, recording every statement when query_stats is enabled"""
+        cursor = connection.cursor()
+        if self.query_stats is not None:
+            return InstrumentedCursor(cursor, self.query_stats)
+        return cursor
+    
+    def get_query_stats(self, limit=None, order_by='total_ms'):
+        """Get per-statement timings, the most expensive first (None when disabled)"""
+        if self.query_stats is None:
+            return None
+        return self.query_stats.snapshot(limit, order_by)
+    
+    def reset_query_stats(self):
+        """Start collecting query timings from scratch"""
+        if self.query_stats is not None:
+            self.query_stats.reset()
+    
+    def _statement_cache(self, connection):
+        """Prepared statement cache of a connection"""
+        with self._statement_caches_lock:
+            cache = self._statement_caches.get(connection)
+            if cache is None:
+                cache = StatementCache(self.statement_cache_size)
+                self._statement_caches[connection] = cache
+            return cache
+    
+    def _drop_statement_cache(self, connection):
+        """Close the prepared cursors of a connection that is being closed"""
+        with self._statement_caches_lock:
+            cache = self._statement_caches.pop(connection, None)
+        if cache is not None:
+            cache.clear()
+    
+    def _execute_prepared(self, connection, query, params):
+        """Execute query on its cached prepared cursor and return the cursor"""
+        cache = self._statement_cache(connection)
+        cursor, sql = cache.get(connection, query)
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            results = cursor.fetchall()
-            cursor.close()
-            return results
-        except Error as e:
-            raise Exception(f"Select query failed: {e}")
+            cursor.execute(sql, params or ())
+        except self.Error:
+            cache.discard(query)
+            raise
+        return cursor
+    
+    def get_statement_cache_stats(self):
+        """Get prepared statement cache counters summed over open connections"""
+        with self._statement_caches_lock:
+            caches = list(self._statement_caches.values())
+        return {
+            'enabled': self.prepared_statements,
+            'connections': len(caches),
+            'statements': sum(len(cache) for cache in caches),
+            'hits': sum(cache.hits for cache in caches),
+            'misses': sum(cache.misses for cache in caches)
+        }
+    
+    def stream_select(self, query, params=None, batch_size=1000):
+        """Execute a SELECT query and yield results in fetchmany batches
+        
+        Uses an unbuffered cursor so rows are read from the server as they
+        are consumed instead of being materialized at once.
+        """
+        with self._checkout() as connection:
+            cursor = None
+            finished = False
+            # Only time spent in the database counts, not in the consumer
+            stats = self.query_stats
+            elapsed = 0.0
+            count = 0
+            try:
+                started = time.perf_counter()
+                cursor = connection.cursor(dictionary=True, buffered=False)
+                cursor.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    elapsed += time.perf_counter() - started
+                    count += len(rows)
+                    yield rows
+                    started = time.perf_counter()
+                elapsed += time.perf_counter() - started
+                finished = True
+                if stats is not None:
+                    stats.record(query, elapsed, count, params=params)
+            except self.Error as e:
+                if stats is not None:
+                    stats.record(query, elapsed, count, error=True, params=params)
+                raise Exception(f"Select query failed: {e}")
+            finally:
+                if cursor:
+                    # Drain rows left on the wire when the consumer stopped early
+                    if not finished:
+                        try:
+                            connection.consume_results()
+                        except self.Error:
+                            pass
+                    cursor.close()
     
     def execute_transaction(self, queries):
         """Execute multiple queries in a transaction"""
-        cursor = None
-        try:
-            cursor = self.connection.cursor()
-            self.connection.start_transaction()
-            
-            results = []
-            for query, params in queries:
-                cursor.execute(query, params or ())
-                if query.strip().upper().startswith('INSERT'):
-                    results.append(cursor.lastrowid)
-                else:
-                    results.append(cursor.rowcount)
-            
-            self.connection.commit()
-            cursor.close()
-            return results
-            
-        except Error as e:
-            if self.connection:
-                self.connection.rollback()
-            if cursor:
+        with self._checkout() as connection:
+            cursor = None
+            try:
+                cursor = self._cursor(connection)
+                connection.start_transaction()
+                
+                results = []
+                for query, params in queries:
+                    cursor.execute(query, params or ())
+                    if query.strip().upper().startswith('INSERT'):
+                        results.append(cursor.lastrowid)
+                    else:
+                        results.append(cursor.rowcount)
+                
+                connection.commit()
+                cursor.close()
+                return results
+                
+            except self.Error as e:
+                if connection:
+                    connection.rollback()
+                if cursor:
+                    cursor.close()
+                raise Exception(f"Transaction failed: {e}")
+    
+    def execute_many(self, query, params_list):
+        """Execute the same statement for many parameter sets in one transaction"""
+        with self._checkout() as connection:
+            cursor = None
+            try:
+                cursor = self._cursor(connection)
+                cursor.executemany(query, params_list)
+                connection.commit()
+                rowcount = cursor.rowcount
+                cursor.close()
+                return rowcount
+            except self.Error as e:
+                connection.rollback()
+                if cursor:
+                    cursor.close()
+                raise Exception(f"Batch execution failed: {e}")
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements on one cursor in a single transaction"""
+        with self._checkout() as connection:
+            cursor = self._cursor(connection)
+            try:
+                connection.start_transaction()
+                yield cursor
+                connection.commit()
+            except self.Error as e:
+                connection.rollback()
+                raise Exception(f"Transaction failed: {e}") from e
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
                 cursor.close()
-            raise Exception(f"Transaction failed: {e}")
     
     def close(self):
         """Close database connection"""
+        if self.query_stats is not None:
+            self.query_stats.close()
+        if self.pool is not None:
+            self.pool.close()
+            print("Database connection pool closed")
+        if self.connection is not None:
+            self._drop_statement_cache(self.connection)
         if self.connection and self.connection.is_connected():
             self.connection.close()
             print("Database connection closed")
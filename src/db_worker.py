@@ -0,0 +1,106 @@
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+class DbWorker:
+    """
+    Runs database calls on a thread pool and delivers results on the Tk main loop.
+
+    Worker threads never touch Tk: finished calls are queued and picked up
+    by a root.after() poll, which then runs on_success / on_error. Each call
+    borrows its own connection from the Database pool (or waits for the
+    shared connection lock when pooling is disabled).
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=50, on_busy_change=None):
+        self.root = root
+        self.poll_interval = poll_interval
+        # Called on the main loop with True when work starts, False when all is done
+        self.on_busy_change = on_busy_change
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        # Latest generation and future per key, older ones are stale
+        self._generations = {}
+        self._pending = {}
+        self._busy = 0
+        self._closed = False
+
+        self.root.after(self.poll_interval, self._poll)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, key=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the background.
+        A newer submission with the same key cancels the older one if it has
+        not started yet, and drops its result if it has.
+        """
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._pending.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+
+        self._set_busy(self._busy + 1)
+        future = self._executor.submit(fn, *args, **kwargs)
+        if key is not None:
+            self._pending[key] = future
+
+        future.add_done_callback(
+            lambda done: self._results.put((done, key, generation, on_success, on_error))
+        )
+        return future
+
+    def cancel(self, key):
+        """Cancel or drop the pending call submitted under key"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+    def shutdown(self):
+        """Stop polling and wait for running calls to finish"""
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def busy(self):
+        return self._busy > 0
+
+    def _poll(self):
+        """Deliver finished calls on the main loop"""
+        while True:
+            try:
+                future, key, generation, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._set_busy(self._busy - 1)
+
+            if key is not None:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+                if self._generations.get(key) != generation:
+                    continue
+            if future.cancelled():
+                continue
+
+            try:
+                error = future.exception()
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                elif on_success:
+                    on_success(future.result())
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+        if not self._closed:
+            self.root.after(self.poll_interval, self._poll)
+
+    def _set_busy(self, busy):
+        was_busy = self._busy > 0
+        self._busy = busy
+        if self.on_busy_change and was_busy != (busy > 0):
+            self.on_busy_change(busy > 0)
@@ -0,0 +1,67 @@
+"""Import knihy or autori from CSV files without the GUI.
+
+Knihy imports save a checkpoint after every committed batch; when a run
+is interrupted (connection lost, process killed), continue it with
+--resume instead of starting over:
+
+    python src/import_cli.py knihy data/knihy.csv --batch-size 1000
+    python src/import_cli.py knihy data/knihy.csv --resume
+    python src/import_cli.py autori data/autori.csv
+"""
+import argparse
+import sys
+import time
+
+from config import Config
+from database import Database
+from dao import AutorDAO, ZanrDAO, KnihaDAO
+from services import ImportService
+
+# Errors printed at the end of a run, the rest are only counted
+MAX_PRINTED_ERRORS = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import knihy or autori from CSV")
+    parser.add_argument('kind', choices=('knihy', 'autori'))
+    parser.add_argument('csv_file')
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--checkpoint', help="checkpoint file (default: <csv_file>.checkpoint)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue after the last committed batch of a previous run")
+    args = parser.parse_args()
+
+    db = Database(Config(args.config).get_database_config())
+    try:
+        service = ImportService(db, AutorDAO(db), KnihaDAO(db), ZanrDAO(db))
+        started = time.perf_counter()
+        if args.kind == 'knihy':
+            result = service.import_knihy_from_csv(
+                args.csv_file,
+                batch_size=args.batch_size,
+                checkpoint_file=args.checkpoint or args.csv_file + '.checkpoint',
+                resume=args.resume
+            )
+        else:
+            # Autori imports skip existing autori by natural key, re-running is safe
+            result = service.import_autori_from_csv(args.csv_file, batch_size=args.batch_size)
+
+        if result.get('resumed_from'):
+            print(f"Resumed after row {result['resumed_from']}")
+        print(f"Imported {result['imported']}, skipped {result['skipped']}, "
+              f"errors {len(result['errors'])} in {time.perf_counter() - started:.1f}s")
+        for error in result['errors'][:MAX_PRINTED_ERRORS]:
+            print(f"  {error}")
+        if len(result['errors']) > MAX_PRINTED_ERRORS:
+            print(f"  ... {len(result['errors']) - MAX_PRINTED_ERRORS} more")
+        return 0
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
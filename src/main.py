@@ -9,9 +9,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
 from database import Database
-from dao import AutorDAO, ZanrDAO, KnihaDAO, CtenarDAO, VypujckaDAO
+from dao import AutorDAO, ZanrDAO, KnihaDAO, CtenarDAO, VypujckaDAO, SearchIndex
+from dao import LRUCache, SqliteCacheBackend, CachedZanrDAO, CachedAutorDAO
 from models import Autor, Zanr, Kniha, Ctenar, Vypujcka
-from services import ImportService, ReportService, TransactionService
+from services import ImportService, ReportService, TransactionService, OverdueSweeper
+from db_worker import DbWorker
+from virtual_treeview import VirtualTreeview
 
 
 class LibraryApp:
@@ -32,21 +35,65 @@ class LibraryApp:
             sys.exit(1)
         
         # Initialize DAOs
-        self.autor_dao = AutorDAO(self.db)
+        # Search mode: "fulltext" (MySQL FULLTEXT), "memory" (in-process index) or "like"
+        search_mode = self.config.get('search', {}).get('mode', 'like')
+        if search_mode == 'fulltext' and not self.db.backend.supports_fulltext:
+            # Embedded SQLite has no FULLTEXT indexes
+            search_mode = 'memory'
+        fulltext = search_mode == 'fulltext'
+        memory = search_mode == 'memory'
+        
+        self.autor_dao = AutorDAO(self.db, SearchIndex() if memory else None, fulltext)
         self.zanr_dao = ZanrDAO(self.db)
-        self.kniha_dao = KnihaDAO(self.db)
-        self.ctenar_dao = CtenarDAO(self.db)
+        self.kniha_dao = KnihaDAO(self.db, SearchIndex() if memory else None, fulltext)
+        self.ctenar_dao = CtenarDAO(self.db, SearchIndex() if memory else None, fulltext)
         self.vypujcka_dao = VypujckaDAO(self.db)
         
+        # Read-through cache for zanry and autori, invalidated by writes through the DAOs
+        cache_config = self.config.get('cache', {})
+        if cache_config.get('enabled', False):
+            backend = None
+            if cache_config.get('backend_path'):
+                backend = SqliteCacheBackend(cache_config['backend_path'])
+            capacity = cache_config.get('capacity', {})
+            ttl = cache_config.get('ttl', 300)
+            self.zanr_dao = CachedZanrDAO(
+                self.zanr_dao, LRUCache(capacity.get('zanry', 100), ttl, backend, 'zanry'))
+            self.autor_dao = CachedAutorDAO(
+                self.autor_dao, LRUCache(capacity.get('autori', 10000), ttl, backend, 'autori'))
+        
         # Initialize Services
         self.import_service = ImportService(self.db, self.autor_dao, self.kniha_dao, self.zanr_dao)
         self.report_service = ReportService(self.db)
-        self.transaction_service = TransactionService(self.db, self.kniha_dao, self.vypujcka_dao)
+        self.transaction_service = TransactionService(self.db, self.kniha_dao, self.vypujcka_dao, self.report_service)
+        
+        # Periodic overdue sweep in a background thread
+        self.overdue_sweeper = None
+        sweeper_config = self.config.get('overdue_sweeper', {})
+        if sweeper_config.get('enabled', False):
+            self.overdue_sweeper = OverdueSweeper(
+                self.vypujcka_dao,
+                interval=sweeper_config.get('interval', 3600),
+                jitter=sweeper_config.get('jitter', 300),
+                batch_size=sweeper_config.get('batch_size', 500),
+                on_sweep=self.on_overdue_sweep
+            )
+            self.overdue_sweeper.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Create UI
         self.create_menu()
+        self.create_status_bar()
         self.create_main_frame()
         
+        # Database calls from the UI run in the background
+        ui_config = self.config.get('ui', {})
+        self.db_worker = DbWorker(
+            self.root,
+            max_workers=ui_config.get('db_workers', 4),
+            on_busy_change=self.set_busy
+        )
+        
         # Show welcome screen
         self.show_welcome()
     
@@ -102,6 +149,53 @@ class LibraryApp:
         report_menu.add_separator()
         report_menu.add_command(label="Souhrnné statistiky", command=self.show_statistics)
     
+    def create_status_bar(self):
+        """Create status bar with busy indicator"""
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 5))
+        
+        self.status_label = ttk.Label(status_frame, text="")
+        self.status_label.pack(side=tk.LEFT)
+        
+        self.busy_indicator = ttk.Progressbar(status_frame, mode="indeterminate", length=120)
+    
+    def set_busy(self, busy):
+        """Show or hide the busy indicator"""
+        if busy:
+            self.status_label.config(text="Načítání...")
+            self.busy_indicator.pack(side=tk.RIGHT)
+            self.busy_indicator.start(10)
+            self.root.config(cursor="watch")
+        else:
+            self.status_label.config(text="")
+            self.busy_indicator.stop()
+            self.busy_indicator.pack_forget()
+            self.root.config(cursor="")
+    
+    def run_in_background(self, fn, *args, on_success=None, error_title="Chyba", key=None):
+        """Run a DAO/service call off the main loop, report errors in a message box"""
+        return self.db_worker.submit(
+            fn, *args,
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror(error_title, str(e)),
+            key=key
+        )
+    
+    def load_view(self, fn, *args, on_success=None, error_title="Chyba"):
+        """Load data for the current screen; switching screens drops stale results"""
+        return self.run_in_background(fn, *args, on_success=on_success,
+                                      error_title=error_title, key="view")
+    
+    def create_virtual_tree(self, columns, row_values):
+        """Create a virtualized list in the main frame, loading through the DB worker"""
+        virtual_tree = VirtualTreeview(
+            self.main_frame, columns, row_values,
+            submit=self.db_worker.submit,
+            on_error=lambda e: messagebox.showerror("Chyba", str(e))
+        )
+        virtual_tree.pack(fill=tk.BOTH, expand=True, pady=10)
+        return virtual_tree
+    
     def create_main_frame(self):
         """Create main content frame"""
         self.main_frame = ttk.Frame(self.root)
@@ -109,9 +203,24 @@ class LibraryApp:
     
     def clear_main_frame(self):
         """Clear main frame content"""
+        # Results still loading for the previous screen have nowhere to go
+        self.db_worker.cancel("view")
         for widget in self.main_frame.winfo_children():
             widget.destroy()
     
+    def on_overdue_sweep(self, changed_ids):
+        """Called from the sweeper thread, must not touch Tk widgets"""
+        if changed_ids:
+            self.report_service.invalidate_summary_cache()
+    
+    def on_close(self):
+        """Stop background jobs and close the application"""
+        if self.overdue_sweeper:
+            self.overdue_sweeper.stop(timeout=5)
+        self.db_worker.shutdown()
+        self.db.close()
+        self.root.destroy()
+    
     def show_welcome(self):
         """Show welcome screen"""
         self.clear_main_frame()
@@ -131,8 +240,7 @@ class LibraryApp:
         info_label.pack(pady=20)
         
         # Show summary statistics
-        try:
-            stats = self.report_service.get_summary_statistics()
+        def show_statistics(stats):
             stats_frame = ttk.LabelFrame(self.main_frame, text="Přehled", padding=20)
             stats_frame.pack(pady=20)
             
@@ -142,8 +250,13 @@ class LibraryApp:
             ttk.Label(stats_frame, text=f"Celkem čtenářů: {stats['total_ctenari']}", font=("Arial", 12)).grid(row=3, column=0, sticky="w", pady=5)
             ttk.Label(stats_frame, text=f"Aktivních výpůjček: {stats['aktivni_vypujcky']}", font=("Arial", 12)).grid(row=4, column=0, sticky="w", pady=5)
             ttk.Label(stats_frame, text=f"Po termínu: {stats['overdue_vypujcky']}", font=("Arial", 12), foreground="red").grid(row=5, column=0, sticky="w", pady=5)
-        except Exception as e:
-            messagebox.showerror("Chyba", f"Nepodařilo se načíst statistiky: {e}")
+        
+        self.db_worker.submit(
+            self.report_service.get_summary_statistics,
+            on_success=show_statistics,
+            on_error=lambda e: messagebox.showerror("Chyba", f"Nepodařilo se načíst statistiky: {e}"),
+            key="view"
+        )
     
     # ==================== AUTOŘI ====================
     
@@ -172,39 +285,36 @@ class LibraryApp:
         def search_autori():
             term = search_var.get()
             if term:
-                try:
-                    autori = self.autor_dao.search_by_name(term)
-                    self.populate_autori_tree(tree, autori)
-                except Exception as e:
-                    messagebox.showerror("Chyba", str(e))
+                # A newer search supersedes the pending one
+                self.load_view(self.autor_dao.search_by_name, term,
+                               on_success=lambda autori: self.populate_autori_tree(autori_list, autori))
             else:
-                self.show_autori()
+                self.db_worker.cancel("view")
+                autori_list.set_source(self.autor_dao.get_all_page, self.autor_dao.count)
         
-        ttk.Button(search_frame, text="Hledat", command=search_autori).pack(side=tk.LEFT, padx=5)
+        # Search as you type, after a short pause
+        pending_search = []
         
-        # Treeview
-        tree_frame = ttk.Frame(self.main_frame)
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        def on_search_typed(event):
+            if pending_search:
+                self.root.after_cancel(pending_search.pop())
+            pending_search.append(self.root.after(300, search_autori))
+        
+        search_entry.bind("<KeyRelease>", on_search_typed)
         
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        ttk.Button(search_frame, text="Hledat", command=search_autori).pack(side=tk.LEFT, padx=5)
         
+        # Treeview, only visible rows are created and pages load on scroll
         columns = ("ID", "Jméno", "Příjmení", "Datum narození", "Země")
-        tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=scrollbar.set)
-        scrollbar.config(command=tree.yview)
+        autori_list = self.create_virtual_tree(columns, self.autor_row_values)
+        tree = autori_list.tree
         
         for col in columns:
             tree.heading(col, text=col)
             tree.column(col, width=150)
         
-        tree.pack(fill=tk.BOTH, expand=True)
-        
         # Load data
-        try:
-            autori = self.autor_dao.get_all()
-            self.populate_autori_tree(tree, autori)
-        except Exception as e:
-            messagebox.showerror("Chyba", str(e))
+        autori_list.set_source(self.autor_dao.get_all_page, self.autor_dao.count)
         
         # Context menu
         def on_right_click(event):
@@ -218,19 +328,20 @@ class LibraryApp:
         tree.bind("<Button-3>", on_right_click)
         tree.bind("<Double-1>", lambda e: self.edit_autor(tree))
     
-    def populate_autori_tree(self, tree, autori):
-        """Populate authors treeview"""
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        for autor in autori:
-            tree.insert("", tk.END, values=(
-                autor.id,
-                autor.jmeno,
-                autor.prijmeni,
-                autor.datum_narozeni or "",
-                autor.zeme_puvodu or ""
-            ))
+    def populate_autori_tree(self, autori_list, autori):
+        """Populate authors treeview with a fixed list (search results)"""
+        autori_list.set_items(autori)
+    
+    @staticmethod
+    def autor_row_values(autor):
+        """Treeview row values for an autor"""
+        return (
+            autor.id,
+            autor.jmeno,
+            autor.prijmeni,
+            autor.datum_narozeni or "",
+            autor.zeme_puvodu or ""
+        )
     
     def add_autor(self):
         """Add new author dialog"""
@@ -281,13 +392,12 @@ class LibraryApp:
                 zeme_puvodu=zeme_var.get().strip() or None
             )
             
-            try:
-                self.autor_dao.create(autor)
+            def saved(_):
                 messagebox.showinfo("Úspěch", "Autor byl přidán")
                 dialog.destroy()
                 self.show_autori()
-            except Exception as e:
-                messagebox.showerror("Chyba", str(e))
+            
+            self.run_in_background(self.autor_dao.create, autor, on_success=saved)
         
         # Buttons
         btn_frame = ttk.Frame(dialog)
@@ -306,15 +416,16 @@ class LibraryApp:
         item = tree.item(selection[0])
         autor_id = item['values'][0]
         
-        try:
-            autor = self.autor_dao.get_by_id(autor_id)
+        def loaded(autor):
             if not autor:
                 messagebox.showerror("Chyba", "Autor nenalezen")
                 return
-        except Exception as e:
-            messagebox.showerror("Chyba", str(e))
-            return
+            self.open_edit_autor_dialog(autor)
         
+        self.run_in_background(self.autor_dao.get_by_id, autor_id, on_success=loaded)
+    
+    def open_edit_autor_dialog(self, autor):
+        """Edit author form for a loaded autor"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Upravit autora")
         dialog.geometry("400x300")
@@ -360,13 +471,12 @@ class LibraryApp:
             autor.datum_narozeni = datum_narozeni
             autor.zeme_puvodu = zeme_var.get().strip() or None
             
-            try:
-                self.autor_dao.update(autor)
+            def saved(_):
                 messagebox.showinfo("Úspěch", "Autor byl upraven")
                 dialog.destroy()
                 self.show_autori()
-            except Exception as e:
-                messagebox.showerror("Chyba", str(e))
+            
+            self.run_in_background(self.autor_dao.update, autor, on_success=saved)
         
         btn_frame = ttk.Frame(dialog)
         btn_frame.grid(row=5, column=0, columnspan=2, pady=20)
@@ -386,12 +496,15 @@ class LibraryApp:
         autor_name = f"{item['values'][1]} {item['values'][2]}"
         
         if messagebox.askyesno("Potvrzení", f"Opravdu smazat autora {autor_name}?"):
-            try:
-                self.autor_dao.delete(autor_id)
+            def deleted(_):
                 messagebox.showinfo("Úspěch", "Autor byl smazán")
                 self.show_autori()
-            except Exception as e:
-                messagebox.showerror("Chyba", f"Nepodařilo se smazat autora: {e}")
+            
+            self.db_worker.submit(
+                self.autor_dao.delete, autor_id,
+                on_success=deleted,
+                on_error=lambda e: messagebox.showerror("Chyba", f"Nepodařilo se smazat autora: {e}")
+            )
     
     # ==================== ŽÁNRY ====================
     
@@ -408,15 +521,11 @@ class LibraryApp:
         ttk.Button(btn_frame, text="Obnovit", command=self.show_zanry).pack(side=tk.LEFT, padx=5)
         
         # Treeview
-        tree_frame = ttk.Frame(self.main_frame)
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
         columns = ("ID", "Název", "Popis")
-        tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=scrollbar.set)
-        scrollbar.config(command=tree.yview)
+        zanry_list = self.create_virtual_tree(
+            columns, lambda zanr: (zanr.id, zanr.nazev, zanr.popis or "")
+        )
+        tree = zanry_list.tree
         
         tree.heading("ID", text="ID")
         tree.heading("Název", text="Název")
@@ -426,18 +535,7 @@ class LibraryApp:
         tree.column("Název", width=200)
         tree.column("Popis", width=400)
         
-        tree.pack(fill=tk.BOTH, expand=True)
-        
-        try:
-            zanry = self.zanr_dao.get_all()
-            for zanr in zanry:
-                tree.insert("", tk.END, values=(
-                    zanr.id,
-                    zanr.nazev,
-                    zanr.popis or ""
-                ))
-        except Exception as e:
-            messagebox.showerror("Chyba", str(e))
+        zanry_list.set_source(self.zanr_dao.get_all_page, self.zanr_dao.count)
         
         def on_right_click(event):
             item = tree.selection()
@@ -477,13 +575,12 @@ class LibraryApp:
                 popis=popis_text.get("1.0", tk.END).strip() or None
             )
             
-            try:
-                self.zanr_dao.create(zanr)
+            def saved(_):
                 messagebox.showinfo("Úspěch", "Žánr byl přidán")
                 dialog.destroy()
                 self.show_zanry()
-            except Exception as e:
-                messagebox.showerror("Chyba", str(e))
+            
+            self.run_in_background(self.zanr_dao.create, zanr, on_success=saved)
         
         btn_frame = ttk.Frame(dialog)
         btn_frame.grid(row=2, column=0, columnspan=2, pady=20)
@@ -501,15 +598,16 @@ class LibraryApp:
         item = tree.item(selection[0])
         zanr_id = item['values'][0]
         
-        try:
-            zanr = self.zanr_dao.get_by_id(zanr_id)
+        def loaded(zanr):
             if not zanr:
                 messagebox.showerror("Chyba", "Žánr nenalezen")
                 return
-        except Exception as e:
-            messagebox.showerror("Chyba", str(e))
-            return
+            self.open_edit_zanr_dialog(zanr)
         
+        self.run_in_background(self.zanr_dao.get_by_id, zanr_id, on_success=loaded)
+    
+    def open_edit_zanr_dialog(self, zanr):
+        """Edit genre form for a loaded zanr"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Upravit žánr")
         dialog.geometry("400x250")
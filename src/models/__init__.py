@@ -3,5 +3,6 @@ from .zanr import Zanr
 from .kniha import Kniha
 from .ctenar import Ctenar
 from .vypujcka import Vypujcka
+from .exemplar import Exemplar
 
-__all__ = ['Autor', 'Zanr', 'Kniha', 'Ctenar', 'Vypujcka']
+__all__ = ['Autor', 'Zanr', 'Kniha', 'Ctenar', 'Vypujcka', 'Exemplar']
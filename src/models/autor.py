@@ -1,6 +1,8 @@
 class Autor:
     """Autor model"""
     
+    __slots__ = ('id', 'jmeno', 'prijmeni', 'datum_narozeni', 'zeme_puvodu', 'created_at')
+    
     def __init__(self, id=None, jmeno=None, prijmeni=None, datum_narozeni=None, 
                  zeme_puvodu=None, created_at=None):
         self.id = id
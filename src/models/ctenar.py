@@ -1,6 +1,8 @@
 class Ctenar:
     """Ctenar model"""
     
+    __slots__ = ('id', 'jmeno', 'prijmeni', 'email', 'telefon', 'registrovan_od', 'aktivni', 'created_at')
+    
     def __init__(self, id=None, jmeno=None, prijmeni=None, email=None, 
                  telefon=None, registrovan_od=None, aktivni=True, created_at=None):
         self.id = id
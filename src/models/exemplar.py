@@ -0,0 +1,18 @@
+class Exemplar:
+    """Exemplar model (one physical copy of a kniha)"""
+    
+    __slots__ = ('id', 'kniha_id', 'inventarni_cislo', 'stav', 'created_at')
+    
+    def __init__(self, id=None, kniha_id=None, inventarni_cislo=None,
+                 stav='dostupny', created_at=None):
+        self.id = id
+        self.kniha_id = kniha_id
+        self.inventarni_cislo = inventarni_cislo
+        self.stav = stav
+        self.created_at = created_at
+    
+    def __str__(self):
+        return f"Exemplar #{self.inventarni_cislo or self.id} - {self.stav}"
+    
+    def __repr__(self):
+        return f"Exemplar(id={self.id}, kniha_id={self.kniha_id}, stav='{self.stav}')"
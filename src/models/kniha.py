@@ -1,9 +1,13 @@
 class Kniha:
     """Kniha model"""
     
+    __slots__ = ('id', 'nazev', 'isbn', 'rok_vydani', 'pocet_stran', 'hodnoceni', 'dostupna',
+                 'zanr_id', 'created_at', 'pocet_exemplaru', 'dostupne_exemplare',
+                 'zanr_nazev', '_autori')
+    
     def __init__(self, id=None, nazev=None, isbn=None, rok_vydani=None, 
                  pocet_stran=None, hodnoceni=None, dostupna=True, 
-                 zanr_id=None, created_at=None):
+                 zanr_id=None, created_at=None, pocet_exemplaru=1, dostupne_exemplare=None):
         self.id = id
         self.nazev = nazev
         self.isbn = isbn
@@ -13,9 +17,23 @@ class Kniha:
         self.dostupna = dostupna
         self.zanr_id = zanr_id
         self.created_at = created_at
+        # Čítače nad tabulkou exemplare, dostupna = dostupne_exemplare > 0
+        self.pocet_exemplaru = pocet_exemplaru
+        self.dostupne_exemplare = pocet_exemplaru if dostupne_exemplare is None else dostupne_exemplare
         # Pro zobrazení
         self.zanr_nazev = None
-        self.autori = []
+        # Allocated on first access, most loaded knihy never touch it
+        self._autori = None
+    
+    @property
+    def autori(self):
+        if self._autori is None:
+            self._autori = []
+        return self._autori
+    
+    @autori.setter
+    def autori(self, value):
+        self._autori = value
     
     def __str__(self):
         return f"{self.nazev} ({self.rok_vydani})"
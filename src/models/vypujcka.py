@@ -1,10 +1,14 @@
 class Vypujcka:
     """Vypujcka model"""
     
+    __slots__ = ('id', 'kniha_id', 'ctenar_id', 'datum_vypujceni', 'datum_vraceni',
+                 'predpokladane_vraceni', 'stav', 'poznamka', 'created_at',
+                 'exemplar_id', 'kniha_nazev', 'ctenar_jmeno')
+    
     def __init__(self, id=None, kniha_id=None, ctenar_id=None, 
                  datum_vypujceni=None, datum_vraceni=None, 
                  predpokladane_vraceni=None, stav='active', 
-                 poznamka=None, created_at=None):
+                 poznamka=None, created_at=None, exemplar_id=None):
         self.id = id
         self.kniha_id = kniha_id
         self.ctenar_id = ctenar_id
@@ -14,6 +18,7 @@ class Vypujcka:
         self.stav = stav
         self.poznamka = poznamka
         self.created_at = created_at
+        self.exemplar_id = exemplar_id
         # Pro zobrazení
         self.kniha_nazev = None
         self.ctenar_jmeno = None
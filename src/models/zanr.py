@@ -1,6 +1,8 @@
 class Zanr:
     """Zanr model"""
     
+    __slots__ = ('id', 'nazev', 'popis', 'created_at')
+    
     def __init__(self, id=None, nazev=None, popis=None, created_at=None):
         self.id = id
         self.nazev = nazev
@@ -0,0 +1,222 @@
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Histogram bucket upper bounds in milliseconds, the last bucket is unbounded
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Frames of these modules are skipped when looking for the caller of a statement
+INTERNAL_MODULES = frozenset(('database', 'query_stats', 'contextlib', 'dao.pagination',
+                              'backends.sqlite_backend'))
+
+_COMMENT = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_ROWS = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+_SPACE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+    Normalize a statement so that executions differing only in values,
+    IN list lengths or whitespace share one entry:
+    "SELECT * FROM knihy WHERE id IN (?, ?, ?)" -> "SELECT * FROM knihy WHERE id IN (...)"
+    """
+    sql = _COMMENT.sub(' ', sql)
+    sql = _LITERAL.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _LIST.sub('(...)', sql)
+    sql = _ROWS.sub(r'\1', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def find_caller(depth=2):
+    """module:qualified name of the first frame outside the database layer"""
+    frame = sys._getframe(depth)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module not in INTERNAL_MODULES:
+            code = frame.f_code
+            return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return '?'
+
+
+class QueryEntry:
+    """Counters of one (fingerprint, caller) pair"""
+
+    __slots__ = ('fingerprint', 'caller', 'count', 'errors', 'rows', 'total',
+                 'min', 'max', 'buckets')
+
+    def __init__(self, fingerprint, caller):
+        self.fingerprint = fingerprint
+        self.caller = caller
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, elapsed, rows, error):
+        self.count += 1
+        self.total += elapsed
+        if self.min is None or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if error:
+            self.errors += 1
+        elif rows is not None and rows > 0:
+            self.rows += rows
+        elapsed_ms = elapsed * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction):
+        """Upper bucket bound (ms) below which the given fraction of executions fall"""
+        target = self.count * fraction
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else round(self.max * 1000, 3)
+        return 0.0
+
+    def as_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'caller': self.caller,
+            'count': self.count,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': round(self.total * 1000, 3),
+            'avg_ms': round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            'min_ms': round((self.min or 0.0) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'histogram': dict(zip([f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"],
+                                  self.buckets))
+        }
+
+
+class QueryStats:
+    """
+    Per-statement timings collected by Database while enabled: latency
+    histogram, rows returned / affected and errors, grouped by statement
+    fingerprint and the DAO method that ran it. Statements slower than
+    slow_query_ms are appended to the slow query log file.
+    """
+
+    def __init__(self, slow_query_ms=None, slow_query_log=None, log_params=False):
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = slow_query_log
+        self.log_params = log_params
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_file = None
+        self.started = datetime.now()
+
+    @classmethod
+    def from_config(cls, config):
+        """QueryStats for the database.query_stats section, None when disabled"""
+        if not config or not config.get('enabled', False):
+            return None
+        return cls(
+            slow_query_ms=config.get('slow_query_ms', 200),
+            slow_query_log=config.get('slow_query_log'),
+            log_params=config.get('log_params', False)
+        )
+
+    def record(self, query, elapsed, rows=None, error=False, params=None):
+        """Account one execution of query that took elapsed seconds"""
+        key = (fingerprint(query), find_caller(2))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = QueryEntry(*key)
+            entry.add(elapsed, rows, error)
+
+        if self.slow_query_ms is not None and elapsed * 1000 >= self.slow_query_ms:
+            self._log_slow(key, elapsed, rows, error, params)
+
+    def snapshot(self, limit=None, order_by='total_ms'):
+        """Entries as dicts, the most expensive first"""
+        with self._lock:
+            entries = [entry.as_dict() for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return {
+            'since': self.started.isoformat(timespec='seconds'),
+            'statements': sum(entry['count'] for entry in entries),
+            'total_ms': round(sum(entry['total_ms'] for entry in entries), 3),
+            'queries': entries[:limit] if limit else entries
+        }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.started = datetime.now()
+
+    def close(self):
+        with self._log_lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def _log_slow(self, key, elapsed, rows, error, params):
+        if not self.slow_query_log:
+            return
+        line = (f"{datetime.now().isoformat(timespec='milliseconds')} "
+                f"{elapsed * 1000:.1f}ms rows={rows if rows is not None else '-'}"
+                f"{' ERROR' if error else ''} caller={key[1]} sql={key[0]}")
+        if self.log_params and params is not None:
+            line += f" params={params!r}"
+        with self._log_lock:
+            if self._log_file is None:
+                directory = os.path.dirname(os.path.abspath(self.slow_query_log))
+                os.makedirs(directory, exist_ok=True)
+                self._log_file = open(self.slow_query_log, 'a', encoding='utf-8', buffering=1)
+            self._log_file.write(line + '\n')
+
+
+class InstrumentedCursor:
+    """Cursor proxy that records each execute / executemany in QueryStats"""
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, operation, params=None):
+        self._timed(self._cursor.execute, operation, params)
+
+    def executemany(self, operation, seq_params):
+        self._timed(self._cursor.executemany, operation, seq_params)
+
+    def _timed(self, method, operation, params):
+        started = time.perf_counter()
+        try:
+            method(operation, params or ())
+        except Exception:
+            self._stats.record(operation, time.perf_counter() - started, error=True, params=params)
+            raise
+        rowcount = self._cursor.rowcount
+        self._stats.record(operation, time.perf_counter() - started,
+                           rowcount if rowcount >= 0 else None, params=params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,38 @@
+"""Recompute the loan statistics tables from vypujcky.
+
+The tables are kept up to date by every loan transaction; run this after
+a migration, manual changes to vypujcky, or whenever they look off:
+
+    python src/rebuild_statistics.py --config config.json
+"""
+import argparse
+import sys
+import time
+
+from config import Config
+from database import Database
+from dao import StatistikyDAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild statistiky_knih and statistiky_ctenaru")
+    parser.add_argument('--config', default='config.json')
+    args = parser.parse_args()
+
+    db = Database(Config(args.config).get_database_config())
+    try:
+        started = time.perf_counter()
+        counts = StatistikyDAO(db).rebuild()
+        for table, count in counts.items():
+            print(f"{table}: {count} rows")
+        print(f"Rebuilt in {time.perf_counter() - started:.2f}s")
+        return 0
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
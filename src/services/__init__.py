@@ -1,5 +1,8 @@
 from .import_service import ImportService
 from .report_service import ReportService
-from .transaction_service import TransactionService
+from .transaction_service import TransactionService, BookAlreadyLentError, VypujckaNotActiveError
+from .overdue_sweeper import OverdueSweeper
+from .ingest_pipeline import IngestPipeline
 
-__all__ = ['ImportService', 'ReportService', 'TransactionService']
+__all__ = ['ImportService', 'ReportService', 'TransactionService', 'OverdueSweeper', 'IngestPipeline',
+           'BookAlreadyLentError', 'VypujckaNotActiveError']
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+CHECKPOINT_VERSION = 1
+
+
+class CsvOffsetReader:
+    """
+    csv.DictReader over a file opened in binary mode that knows the byte
+    offset after each row, so a later run can seek straight past the rows
+    already imported instead of parsing them again.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.header = None
+        self.offset = 0
+        self.row_num = 1
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'rb')
+        self.header = next(csv.reader(self._lines()), None)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+
+    def seek(self, offset, row_num):
+        """Continue after the row row_num that ended at byte offset"""
+        self._file.seek(offset)
+        self.offset = offset
+        self.row_num = row_num
+
+    def __iter__(self):
+        """Yield (row_num, row, offset after the row); row numbers match enumerate(DictReader, start=2)"""
+        if self.header is None:
+            return
+        for row in csv.DictReader(self._lines(), fieldnames=self.header):
+            self.row_num += 1
+            yield self.row_num, row, self.offset
+
+    def _lines(self):
+        # csv pulls lines only until a row is complete, so offset always
+        # points just past the last row handed out
+        while True:
+            line = self._file.readline()
+            if not line:
+                return
+            self.offset += len(line)
+            yield line.decode(self.encoding)
+
+
+class ImportCheckpoint:
+    """
+    Progress of a resumable CSV import in a local JSON file: byte offset
+    and row number of the last committed batch plus running totals.
+    The file is replaced atomically, a crash leaves the previous state.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Saved state, None when there is no checkpoint"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.path}")
+        return state
+
+    def start(self, csv_file, header):
+        """Fresh state for an import of csv_file from its first row"""
+        stat = os.stat(csv_file)
+        return {
+            'version': CHECKPOINT_VERSION,
+            'csv_file': os.path.abspath(csv_file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'header': header,
+            'offset': None,
+            'row_num': 1,
+            'imported': 0,
+            'skipped': 0,
+            'errors': 0,
+            'completed': False
+        }
+
+    def verify(self, state, csv_file, header):
+        """Raise ValueError when state does not belong to this (unchanged) file"""
+        stat = os.stat(csv_file)
+        if state['csv_file'] != os.path.abspath(csv_file):
+            raise ValueError(f"Checkpoint {self.path} belongs to {state['csv_file']}")
+        if (stat.st_size, stat.st_mtime_ns) != (state['size'], state['mtime_ns']) or state['header'] != header:
+            raise ValueError(f"CSV file {csv_file} changed since the checkpoint was written, "
+                             f"import it again without resume")
+
+    def save(self, state):
+        """Write state atomically (temporary file, fsync, rename)"""
+        state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
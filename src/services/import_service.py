@@ -3,6 +3,108 @@ import os
 from datetime import datetime
 from models.autor import Autor
 from models.kniha import Kniha
+from dao.kniha_dao import INSERT_KNIHA_QUERY, INSERT_EXEMPLAR_QUERY, IN_CHUNK_SIZE, kniha_params, exemplar_count
+from dao.isbn import normalize_isbn
+from services.import_checkpoint import CsvOffsetReader, ImportCheckpoint
+
+INSERT_AUTOR_QUERY = """
+    INSERT INTO autori (jmeno, prijmeni, datum_narozeni, zeme_puvodu)
+    VALUES (%s, %s, %s, %s)
+"""
+
+
+def autor_params(autor):
+    """Parameters for INSERT_AUTOR_QUERY"""
+    return (autor.jmeno, autor.prijmeni, autor.datum_narozeni, autor.zeme_puvodu)
+
+
+def autor_key(jmeno, prijmeni, datum_narozeni):
+    """Natural key of an autor: case-insensitive name and birth date"""
+    if datum_narozeni is not None and not isinstance(datum_narozeni, str):
+        datum_narozeni = datum_narozeni.isoformat()
+    return (
+        (jmeno or '').strip().casefold(),
+        (prijmeni or '').strip().casefold(),
+        datum_narozeni or None
+    )
+
+
+def parse_autor_row(row):
+    """
+    Validate one CSV row and build an Autor from it.
+    Raises ValueError with the row error.
+    """
+    # Validate required fields
+    if not (row.get('jmeno') or '').strip() or not (row.get('prijmeni') or '').strip():
+        raise ValueError("Missing required fields (jmeno, prijmeni)")
+    
+    # Parse datum_narozeni
+    datum_narozeni = None
+    if row.get('datum_narozeni'):
+        try:
+            datum_narozeni = datetime.strptime(row['datum_narozeni'].strip(), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("Invalid date format for datum_narozeni (use YYYY-MM-DD)")
+    
+    return Autor(
+        jmeno=row['jmeno'].strip(),
+        prijmeni=row['prijmeni'].strip(),
+        datum_narozeni=datum_narozeni,
+        zeme_puvodu=(row.get('zeme_puvodu') or '').strip() or None
+    )
+
+
+def parse_kniha_row(row, zanry_by_name):
+    """
+    Validate one CSV row and build a Kniha from it.
+    Returns (kniha, autor_prijmeni), raises ValueError with the row error.
+    """
+    # Validate required fields
+    if not row.get('nazev'):
+        raise ValueError("Missing required field (nazev)")
+    
+    # Parse numeric fields
+    try:
+        rok_vydani = int(row['rok_vydani']) if row.get('rok_vydani') else None
+        pocet_stran = int(row['pocet_stran']) if row.get('pocet_stran') else None
+        hodnoceni = float(row['hodnoceni']) if row.get('hodnoceni') else 0.0
+        pocet_exemplaru = int(row['pocet_exemplaru']) if row.get('pocet_exemplaru') else 1
+    except ValueError as e:
+        raise ValueError(f"Invalid number format - {str(e)}")
+    
+    if pocet_exemplaru < 0:
+        raise ValueError("Pocet_exemplaru must not be negative")
+    
+    # Validate hodnoceni range
+    if hodnoceni < 0.0 or hodnoceni > 5.0:
+        raise ValueError("Hodnoceni must be between 0.0 and 5.0")
+    
+    # Find zanr by name
+    zanr_id = None
+    if row.get('zanr_nazev'):
+        zanr_id = zanry_by_name.get(row['zanr_nazev'].strip().lower())
+        if not zanr_id:
+            raise ValueError(f"Zanr '{row['zanr_nazev']}' not found")
+    
+    # Parse dostupna
+    dostupna = True
+    if row.get('dostupna'):
+        dostupna = row['dostupna'].strip().lower() in ('true', '1', 'ano', 'yes')
+    
+    kniha = Kniha(
+        nazev=row['nazev'].strip(),
+        isbn=(row.get('isbn') or '').strip() or None,
+        rok_vydani=rok_vydani,
+        pocet_stran=pocet_stran,
+        hodnoceni=hodnoceni,
+        dostupna=dostupna and pocet_exemplaru > 0,
+        zanr_id=zanr_id,
+        pocet_exemplaru=pocet_exemplaru
+    )
+    
+    autor_prijmeni = (row.get('autor_prijmeni') or '').strip() or None
+    return kniha, autor_prijmeni
+
 
 class ImportService:
     """Service for importing data from CSV files"""
@@ -13,131 +115,132 @@ class ImportService:
         self.kniha_dao = kniha_dao
         self.zanr_dao = zanr_dao
     
-    def import_autori_from_csv(self, csv_file):
-        """Import autori from CSV file"""
+    def import_autori_from_csv(self, csv_file, batch_size=1000):
+        """Import autori from CSV file
+        
+        Idempotent: autori already present (same natural key, see autor_key)
+        and duplicates within the file are skipped. New rows are inserted
+        with executemany in chunks of batch_size, one transaction per chunk.
+        """
         if not os.path.exists(csv_file):
             raise FileNotFoundError(f"CSV file not found: {csv_file}")
         
         imported_count = 0
+        skipped_count = 0
         errors = []
         
         try:
+            existing_keys = self._load_autori_keys()
+            
             with open(csv_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
+                batch = []
                 
                 for row_num, row in enumerate(reader, start=2):
                     try:
-                        # Validate required fields
-                        if not row.get('jmeno') or not row.get('prijmeni'):
-                            errors.append(f"Row {row_num}: Missing required fields (jmeno, prijmeni)")
-                            continue
-                        
-                        # Parse datum_narozeni
-                        datum_narozeni = None
-                        if row.get('datum_narozeni'):
-                            try:
-                                datum_narozeni = datetime.strptime(row['datum_narozeni'], '%Y-%m-%d').date()
-                            except ValueError:
-                                errors.append(f"Row {row_num}: Invalid date format for datum_narozeni (use YYYY-MM-DD)")
-                                continue
-                        
-                        # Create Autor object
-                        autor = Autor(
-                            jmeno=row['jmeno'].strip(),
-                            prijmeni=row['prijmeni'].strip(),
-                            datum_narozeni=datum_narozeni,
-                            zeme_puvodu=row.get('zeme_puvodu', '').strip() or None
-                        )
-                        
-                        # Save to database
-                        self.autor_dao.create(autor)
-                        imported_count += 1
-                        
-                    except Exception as e:
+                        autor = parse_autor_row(row)
+                    except ValueError as e:
                         errors.append(f"Row {row_num}: {str(e)}")
+                        continue
+                    
+                    key = autor_key(autor.jmeno, autor.prijmeni, autor.datum_narozeni)
+                    if key in existing_keys:
+                        skipped_count += 1
+                        continue
+                    existing_keys.add(key)
+                    
+                    batch.append((row_num, autor))
+                    if len(batch) >= batch_size:
+                        imported_count += self._write_autori_batch(batch, errors)
+                        batch = []
+                
+                if batch:
+                    imported_count += self._write_autori_batch(batch, errors)
+            
+            # Bulk inserts bypass the DAO, let the search index rebuild lazily
+            if imported_count and self.autor_dao.search_index is not None:
+                self.autor_dao.search_index.invalidate()
             
             return {
                 'success': True,
                 'imported': imported_count,
+                'skipped': skipped_count,
                 'errors': errors
             }
             
         except Exception as e:
             raise Exception(f"Failed to import autori: {e}")
     
-    def import_knihy_from_csv(self, csv_file):
-        """Import knihy from CSV file"""
+    def _write_autori_batch(self, batch, errors):
+        """Write one chunk of new autori, return number of imported rows"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.executemany(INSERT_AUTOR_QUERY, [autor_params(autor) for _, autor in batch])
+            return len(batch)
+            
+        except Exception:
+            # Retry row by row to report the offending rows
+            imported_count = 0
+            for row_num, autor in batch:
+                try:
+                    autor.id = None
+                    self.autor_dao.create(autor)
+                    imported_count += 1
+                except Exception as e:
+                    errors.append(f"Row {row_num}: {str(e)}")
+            return imported_count
+    
+    def _load_autori_keys(self):
+        """Natural keys of all autori already in the database"""
+        keys = set()
+        for rows in self.db.stream_select("SELECT jmeno, prijmeni, datum_narozeni FROM autori"):
+            keys.update(autor_key(row['jmeno'], row['prijmeni'], row['datum_narozeni']) for row in rows)
+        return keys
+    
+    def import_knihy_from_csv(self, csv_file, batch_size=None, checkpoint_file=None, resume=False):
+        """Import knihy from CSV file
+        
+        With batch_size set, rows are written in chunks of that size
+        (see _import_knihy_batched) instead of one commit per row.
+        With checkpoint_file set, progress is recorded after every chunk
+        and resume continues where the last run stopped
+        (see _import_knihy_resumable).
+        """
         if not os.path.exists(csv_file):
             raise FileNotFoundError(f"CSV file not found: {csv_file}")
         
+        if checkpoint_file:
+            return self._import_knihy_resumable(csv_file, batch_size or 1000, checkpoint_file, resume)
+        
+        if batch_size:
+            return self._import_knihy_batched(csv_file, batch_size)
+        
         imported_count = 0
         errors = []
         
         try:
+            zanry_by_name = self._load_zanry_map()
+            
             with open(csv_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 
                 for row_num, row in enumerate(reader, start=2):
                     try:
-                        # Validate required fields
-                        if not row.get('nazev'):
-                            errors.append(f"Row {row_num}: Missing required field (nazev)")
-                            continue
-                        
-                        # Parse numeric fields
-                        rok_vydani = int(row['rok_vydani']) if row.get('rok_vydani') else None
-                        pocet_stran = int(row['pocet_stran']) if row.get('pocet_stran') else None
-                        hodnoceni = float(row['hodnoceni']) if row.get('hodnoceni') else 0.0
-                        
-                        # Validate hodnoceni range
-                        if hodnoceni < 0.0 or hodnoceni > 5.0:
-                            errors.append(f"Row {row_num}: Hodnoceni must be between 0.0 and 5.0")
-                            continue
-                        
-                        # Find zanr by name
-                        zanr_id = None
-                        if row.get('zanr_nazev'):
-                            zanry = self.zanr_dao.get_all()
-                            for zanr in zanry:
-                                if zanr.nazev.lower() == row['zanr_nazev'].strip().lower():
-                                    zanr_id = zanr.id
-                                    break
-                            
-                            if not zanr_id:
-                                errors.append(f"Row {row_num}: Zanr '{row['zanr_nazev']}' not found")
-                                continue
-                        
-                        # Parse dostupna
-                        dostupna = True
-                        if row.get('dostupna'):
-                            dostupna = row['dostupna'].strip().lower() in ('true', '1', 'ano', 'yes')
-                        
-                        # Create Kniha object
-                        kniha = Kniha(
-                            nazev=row['nazev'].strip(),
-                            isbn=row.get('isbn', '').strip() or None,
-                            rok_vydani=rok_vydani,
-                            pocet_stran=pocet_stran,
-                            hodnoceni=hodnoceni,
-                            dostupna=dostupna,
-                            zanr_id=zanr_id
-                        )
+                        kniha, autor_prijmeni = parse_kniha_row(row, zanry_by_name)
                         
                         # Save to database
                         self.kniha_dao.create(kniha)
                         
                         # Link with autor if specified
-                        if row.get('autor_prijmeni'):
-                            autori = self.autor_dao.search_by_name(row['autor_prijmeni'].strip())
+                        if autor_prijmeni:
+                            autori = self.autor_dao.search_by_name(autor_prijmeni)
                             if autori:
                                 self.kniha_dao.add_autor(kniha.id, autori[0].id)
                             else:
-                                errors.append(f"Row {row_num}: Autor '{row['autor_prijmeni']}' not found, kniha created without autor")
+                                errors.append(f"Row {row_num}: Autor '{autor_prijmeni}' not found, kniha created without autor")
                         
                         imported_count += 1
                         
-                    except ValueError as e:
-                        errors.append(f"Row {row_num}: Invalid number format - {str(e)}")
                     except Exception as e:
                         errors.append(f"Row {row_num}: {str(e)}")
             
@@ -150,6 +253,264 @@ class ImportService:
         except Exception as e:
             raise Exception(f"Failed to import knihy: {e}")
     
+    def _import_knihy_batched(self, csv_file, batch_size):
+        """
+        Import knihy in chunks:
+        1. Resolve zanry and autori once into lookup maps
+        2. Skip knihy whose ISBN is already stored (counted as skipped)
+        3. Insert each chunk with executemany in its own transaction
+        4. Retry a failed chunk row by row to report the offending rows
+        Autori are matched by exact prijmeni (case-insensitive).
+        """
+        imported_count = 0
+        skipped_count = 0
+        errors = []
+        
+        try:
+            zanry_by_name = self._load_zanry_map()
+            autori_by_prijmeni = self._load_autori_map()
+            
+            def write(batch):
+                nonlocal imported_count, skipped_count
+                # One stored ISBN would fail the executemany and send the
+                # whole chunk down the row-by-row path
+                batch, skipped = self._drop_existing_isbns(batch)
+                skipped_count += skipped
+                if batch:
+                    imported_count += self._write_knihy_batch(batch, autori_by_prijmeni, errors)
+            
+            with open(csv_file, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                batch = []
+                
+                for row_num, row in enumerate(reader, start=2):
+                    try:
+                        kniha, autor_prijmeni = parse_kniha_row(row, zanry_by_name)
+                    except ValueError as e:
+                        errors.append(f"Row {row_num}: {str(e)}")
+                        continue
+                    
+                    batch.append((row_num, kniha, autor_prijmeni))
+                    if len(batch) >= batch_size:
+                        write(batch)
+                        batch = []
+                
+                if batch:
+                    write(batch)
+            
+            # Bulk inserts bypass the DAO, let the search index rebuild lazily
+            if self.kniha_dao.search_index is not None:
+                self.kniha_dao.search_index.invalidate()
+            
+            return {
+                'success': True,
+                'imported': imported_count,
+                'skipped': skipped_count,
+                'errors': errors
+            }
+            
+        except Exception as e:
+            raise Exception(f"Failed to import knihy: {e}")
+    
+    def _import_knihy_resumable(self, csv_file, batch_size, checkpoint_file, resume):
+        """
+        Batched import that saves the byte offset and row number of the
+        last committed chunk to checkpoint_file. With resume, reading seeks
+        straight to that offset. Knihy whose ISBN is already in the database
+        are skipped, so a chunk committed just before a crash (but after the
+        last checkpoint) is not written twice; knihy without ISBN have no
+        natural key and could be in that one chunk.
+        """
+        checkpoint = ImportCheckpoint(checkpoint_file)
+        imported_count = 0
+        skipped_count = 0
+        errors = []
+        saved_errors = 0
+        
+        try:
+            zanry_by_name = self._load_zanry_map()
+            autori_by_prijmeni = self._load_autori_map()
+            
+            with CsvOffsetReader(csv_file) as reader:
+                state = checkpoint.load() if resume else None
+                resumed_from = None
+                if state is not None:
+                    checkpoint.verify(state, csv_file, reader.header)
+                    if state['offset'] is not None:
+                        reader.seek(state['offset'], state['row_num'])
+                        resumed_from = state['row_num']
+                else:
+                    state = checkpoint.start(csv_file, reader.header)
+                
+                def commit(batch, row_num, offset):
+                    nonlocal imported_count, skipped_count, saved_errors
+                    batch, skipped = self._drop_existing_isbns(batch)
+                    imported = self._write_knihy_batch(batch, autori_by_prijmeni, errors) if batch else 0
+                    imported_count += imported
+                    skipped_count += skipped
+                    state['imported'] += imported
+                    state['skipped'] += skipped
+                    state['errors'] += len(errors) - saved_errors
+                    saved_errors = len(errors)
+                    state['offset'] = offset
+                    state['row_num'] = row_num
+                    checkpoint.save(state)
+                
+                if not state['completed']:
+                    batch = []
+                    for row_num, row, offset in reader:
+                        try:
+                            kniha, autor_prijmeni = parse_kniha_row(row, zanry_by_name)
+                        except ValueError as e:
+                            errors.append(f"Row {row_num}: {str(e)}")
+                            continue
+                        
+                        batch.append((row_num, kniha, autor_prijmeni))
+                        if len(batch) >= batch_size:
+                            commit(batch, row_num, offset)
+                            batch = []
+                    
+                    state['completed'] = True
+                    commit(batch, reader.row_num, reader.offset)
+            
+            # Bulk inserts bypass the DAO, let the search index rebuild lazily
+            if imported_count and self.kniha_dao.search_index is not None:
+                self.kniha_dao.search_index.invalidate()
+            
+            return {
+                'success': True,
+                'imported': imported_count,
+                'skipped': skipped_count,
+                'errors': errors,
+                'resumed_from': resumed_from,
+                'total_imported': state['imported']
+            }
+            
+        except Exception as e:
+            raise Exception(f"Failed to import knihy: {e}")
+    
+    def _drop_existing_isbns(self, batch):
+        """
+        Remove knihy whose ISBN (in any ISBN-10 / ISBN-13 form) is already
+        stored or earlier in the batch, returns (batch, skipped)
+        """
+        isbns = list({kniha.isbn for _, kniha, _ in batch if kniha.isbn})
+        existing = set()
+        for start in range(0, len(isbns), IN_CHUNK_SIZE):
+            chunk = isbns[start:start + IN_CHUNK_SIZE]
+            canonical = [normalize_isbn(isbn) or isbn for isbn in chunk]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            rows = self.db.execute_select_tuples(
+                f"SELECT isbn, isbn13 FROM knihy WHERE isbn IN ({placeholders}) OR isbn13 IN ({placeholders})",
+                tuple(chunk) + tuple(canonical))
+            existing.update(isbn13 or isbn for isbn, isbn13 in rows)
+        
+        kept = []
+        for item in batch:
+            isbn = item[1].isbn
+            if isbn:
+                key = normalize_isbn(isbn) or isbn
+                if key in existing:
+                    continue
+                existing.add(key)
+            kept.append(item)
+        return kept, len(batch) - len(kept)
+    
+    def _write_knihy_batch(self, batch, autori_by_prijmeni, errors):
+        """Write one chunk of parsed knihy, return number of imported rows"""
+        link_errors = []
+        
+        try:
+            with self.db.transaction() as cursor:
+                # Knihy without ISBN that need an autor link or exemplare are
+                # inserted one by one to get their IDs, all others go through
+                # executemany
+                bulk = []
+                links = []
+                exemplare = []
+                for row_num, kniha, autor_prijmeni in batch:
+                    autor_id = None
+                    if autor_prijmeni:
+                        autor_id = autori_by_prijmeni.get(autor_prijmeni.lower())
+                        if autor_id is None:
+                            link_errors.append(f"Row {row_num}: Autor '{autor_prijmeni}' not found, kniha created without autor")
+                    
+                    if not kniha.isbn and (autor_id is not None or exemplar_count(kniha)):
+                        cursor.execute(INSERT_KNIHA_QUERY, kniha_params(kniha))
+                        kniha.id = cursor.lastrowid
+                        if autor_id is not None:
+                            links.append((kniha.id, autor_id, 1))
+                        exemplare.extend([(kniha.id,)] * exemplar_count(kniha))
+                    else:
+                        bulk.append((kniha, autor_id))
+                
+                if bulk:
+                    cursor.executemany(INSERT_KNIHA_QUERY, [kniha_params(kniha) for kniha, _ in bulk])
+                
+                # Resolve IDs of bulk-inserted knihy through their unique ISBN
+                by_isbn = {kniha.isbn: (kniha, autor_id) for kniha, autor_id in bulk
+                           if autor_id is not None or exemplar_count(kniha)}
+                if by_isbn:
+                    placeholders = ', '.join(['%s'] * len(by_isbn))
+                    cursor.execute(
+                        f"SELECT id, isbn FROM knihy WHERE isbn IN ({placeholders})",
+                        tuple(by_isbn)
+                    )
+                    for kniha_id, isbn in cursor.fetchall():
+                        kniha, autor_id = by_isbn[isbn]
+                        if autor_id is not None:
+                            links.append((kniha_id, autor_id, 1))
+                        exemplare.extend([(kniha_id,)] * exemplar_count(kniha))
+                
+                if exemplare:
+                    cursor.executemany(INSERT_EXEMPLAR_QUERY, exemplare)
+                
+                if links:
+                    cursor.executemany(
+                        "INSERT INTO knihy_autori (kniha_id, autor_id, poradi) VALUES (%s, %s, %s)",
+                        links
+                    )
+            
+            errors.extend(link_errors)
+            return len(batch)
+            
+        except Exception:
+            return self._write_knihy_rows(batch, autori_by_prijmeni, errors)
+    
+    def _write_knihy_rows(self, batch, autori_by_prijmeni, errors):
+        """Fallback for a failed chunk: write rows one by one"""
+        imported_count = 0
+        
+        for row_num, kniha, autor_prijmeni in batch:
+            try:
+                kniha.id = None
+                self.kniha_dao.create(kniha)
+                
+                if autor_prijmeni:
+                    autor_id = autori_by_prijmeni.get(autor_prijmeni.lower())
+                    if autor_id is not None:
+                        self.kniha_dao.add_autor(kniha.id, autor_id)
+                    else:
+                        errors.append(f"Row {row_num}: Autor '{autor_prijmeni}' not found, kniha created without autor")
+                
+                imported_count += 1
+                
+            except Exception as e:
+                errors.append(f"Row {row_num}: {str(e)}")
+        
+        return imported_count
+    
+    def _load_zanry_map(self):
+        """Map lowercased zanr nazev to zanr ID"""
+        return {zanr.nazev.lower(): zanr.id for zanr in self.zanr_dao.get_all()}
+    
+    def _load_autori_map(self):
+        """Map lowercased prijmeni to the first matching autor ID"""
+        autori_by_prijmeni = {}
+        for autor in self.autor_dao.get_all():
+            autori_by_prijmeni.setdefault(autor.prijmeni.lower(), autor.id)
+        return autori_by_prijmeni
+    
     def validate_csv_format(self, csv_file, required_columns):
         """Validate CSV file format"""
         if not os.path.exists(csv_file):
@@ -0,0 +1,262 @@
+import csv
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from services.import_service import parse_kniha_row, parse_autor_row, autor_key
+
+
+def parse_knihy_chunk(rows, zanry_by_name):
+    """Parse (row_num, row) pairs of a knihy file, runs in a worker process"""
+    parsed = []
+    errors = []
+    for row_num, row in rows:
+        try:
+            kniha, autor_prijmeni = parse_kniha_row(row, zanry_by_name)
+        except ValueError as e:
+            errors.append(f"Row {row_num}: {str(e)}")
+            continue
+        parsed.append((row_num, kniha, autor_prijmeni))
+    return parsed, errors
+
+
+def parse_autori_chunk(rows):
+    """Parse (row_num, row) pairs of an autori file, runs in a worker process"""
+    parsed = []
+    errors = []
+    for row_num, row in rows:
+        try:
+            parsed.append((row_num, parse_autor_row(row)))
+        except ValueError as e:
+            errors.append(f"Row {row_num}: {str(e)}")
+    return parsed, errors
+
+
+def collect_csv_files(paths):
+    """
+    Expand directories in paths to the *.csv files they contain.
+    Returns real paths (symlinks and ./ resolved), each file once.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith('.csv')
+            ))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"CSV file not found: {path}")
+    # A file given twice (directly and via its directory) is imported once
+    return list(dict.fromkeys(os.path.realpath(path) for path in files))
+
+
+class IngestPipeline:
+    """
+    Parallel import of many CSV files (initial migrations).
+
+    The calling thread reads rows and hands chunks to a process pool for
+    parsing and validation. Parsed batches go through a bounded queue to
+    writer threads, each holding its own pooled connection for the whole
+    run, and are written with ImportService's batch writers. Errors are
+    collected per file. Parallel writers need database.pool enabled,
+    without it the batches are written by a single writer.
+    """
+
+    def __init__(self, import_service, writers=4, parse_workers=None,
+                 batch_size=1000, queue_size=8):
+        self.import_service = import_service
+        self.db = import_service.db
+        self.writers = writers
+        # None = one process per CPU, 0 = parse on the reading thread
+        self.parse_workers = parse_workers
+        self.batch_size = batch_size
+        # Parsed batches waiting for a writer; bounds memory when the DB is the bottleneck
+        self.queue_size = queue_size
+        self.last_run_stats = None
+
+    def import_knihy(self, paths):
+        """Import knihy from CSV files and/or directories of CSV files"""
+        zanry_by_name = self.import_service._load_zanry_map()
+        autori_by_prijmeni = self.import_service._load_autori_map()
+
+        def write(batch, errors):
+            return self.import_service._write_knihy_batch(batch, autori_by_prijmeni, errors)
+
+        try:
+            result = self._run(paths, parse_knihy_chunk, (zanry_by_name,), write)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to import knihy: {e}")
+
+        kniha_dao = self.import_service.kniha_dao
+        if kniha_dao.search_index is not None:
+            kniha_dao.search_index.invalidate()
+        return result
+
+    def import_autori(self, paths):
+        """Import autori from CSV files and/or directories, skipping existing ones"""
+        existing_keys = self.import_service._load_autori_keys()
+
+        def deduplicate(parsed):
+            # Runs on the reading thread only, so the key set needs no lock
+            new_rows = []
+            for row_num, autor in parsed:
+                key = autor_key(autor.jmeno, autor.prijmeni, autor.datum_narozeni)
+                if key not in existing_keys:
+                    existing_keys.add(key)
+                    new_rows.append((row_num, autor))
+            return new_rows
+
+        try:
+            result = self._run(paths, parse_autori_chunk, (), self.import_service._write_autori_batch,
+                               deduplicate)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to import autori: {e}")
+
+        autor_dao = self.import_service.autor_dao
+        if autor_dao.search_index is not None:
+            autor_dao.search_index.invalidate()
+        return result
+
+    def _writer_count(self):
+        """
+        Writers that can really run in parallel: without a pool session()
+        hands every thread the one shared connection under the database
+        lock, and a pool cannot lend more than size + max_overflow.
+        """
+        if self.writers <= 1:
+            return 1
+        pool = self.db.pool
+        if pool is None:
+            print(f"WARNING: database.pool is disabled, importing with 1 writer instead of {self.writers}")
+            return 1
+        limit = pool.size + pool.max_overflow
+        if self.writers > limit:
+            print(f"WARNING: connection pool allows {limit} connections, importing with {limit} writers "
+                  f"instead of {self.writers}")
+            return limit
+        return self.writers
+
+    def _run(self, paths, parse_chunk, parse_args, write_batch, filter_parsed=None):
+        started = time.perf_counter()
+        files = collect_csv_files(paths)
+        writer_count = self._writer_count()
+        reports = {path: {'imported': 0, 'skipped': 0, 'errors': []} for path in files}
+        reports_lock = threading.Lock()
+        batches = queue.Queue(maxsize=self.queue_size)
+        writer_errors = []
+
+        def writer():
+            # One pinned connection per writer for the whole run
+            with self.db.session():
+                while True:
+                    item = batches.get()
+                    if item is None:
+                        return
+                    path, batch = item
+                    errors = []
+                    try:
+                        imported = write_batch(batch, errors)
+                    except Exception as e:
+                        imported = 0
+                        errors.append(f"Rows {batch[0][0]}-{batch[-1][0]}: {str(e)}")
+                    with reports_lock:
+                        reports[path]['imported'] += imported
+                        reports[path]['errors'].extend(errors)
+
+        def run_writer():
+            try:
+                writer()
+            except Exception as e:
+                writer_errors.append(e)
+                # Keep draining so the reading thread never blocks on a full queue
+                while batches.get() is not None:
+                    pass
+
+        threads = [threading.Thread(target=run_writer, name=f"ingest-writer-{i}", daemon=True)
+                   for i in range(writer_count)]
+        for thread in threads:
+            thread.start()
+
+        executor = None
+        if self.parse_workers != 0:
+            executor = ProcessPoolExecutor(max_workers=self.parse_workers or os.cpu_count() or 1)
+
+        try:
+            # Parse chunks in flight, handed to writers in file order
+            in_flight = deque()
+            max_in_flight = (self.parse_workers or os.cpu_count() or 1) * 2
+
+            def hand_over(path, parsed, errors):
+                skipped = 0
+                if filter_parsed is not None:
+                    kept = filter_parsed(parsed)
+                    skipped = len(parsed) - len(kept)
+                    parsed = kept
+                with reports_lock:
+                    reports[path]['errors'].extend(errors)
+                    reports[path]['skipped'] += skipped
+                if parsed:
+                    batches.put((path, parsed))
+
+            def drain(limit):
+                while len(in_flight) > limit:
+                    path, future = in_flight.popleft()
+                    hand_over(path, *future.result())
+
+            for path in files:
+                for rows in self._read_chunks(path):
+                    if executor is None:
+                        hand_over(path, *parse_chunk(rows, *parse_args))
+                        continue
+                    in_flight.append((path, executor.submit(parse_chunk, rows, *parse_args)))
+                    drain(max_in_flight)
+            drain(0)
+        finally:
+            for _ in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if writer_errors:
+            raise writer_errors[0]
+
+        errors = []
+        for path in files:
+            name = os.path.basename(path)
+            errors.extend(f"{name}: {error}" for error in reports[path]['errors'])
+
+        self.last_run_stats = {
+            'files': len(files),
+            'writers': writer_count,
+            'elapsed': time.perf_counter() - started
+        }
+        return {
+            'success': True,
+            'imported': sum(report['imported'] for report in reports.values()),
+            'skipped': sum(report['skipped'] for report in reports.values()),
+            'errors': errors,
+            'files': reports
+        }
+
+    def _read_chunks(self, path):
+        """Yield lists of (row_num, row) of at most batch_size rows"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            chunk = []
+            for row_num, row in enumerate(reader, start=2):
+                chunk.append((row_num, row))
+                if len(chunk) >= self.batch_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
@@ -0,0 +1,60 @@
+import random
+import threading
+
+class OverdueSweeper:
+    """Background job that periodically marks overdue loans"""
+    
+    def __init__(self, vypujcka_dao, interval=3600, jitter=300, batch_size=500,
+                 on_sweep=None, on_error=None):
+        self.vypujcka_dao = vypujcka_dao
+        self.interval = interval
+        self.jitter = jitter
+        self.batch_size = batch_size
+        # Called from the worker thread with the list of changed loan IDs
+        self.on_sweep = on_sweep
+        # Called from the worker thread with the raised exception
+        self.on_error = on_error
+        
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_changed_ids = []
+    
+    def start(self):
+        """Start the sweeper thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="OverdueSweeper", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout=None):
+        """Stop the sweeper thread and wait for the running sweep to finish"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def run_once(self):
+        """Run one sweep synchronously, returns IDs of loans marked overdue"""
+        changed_ids = self.vypujcka_dao.sweep_overdue_loans(self.batch_size)
+        self.last_changed_ids = changed_ids
+        if self.on_sweep:
+            self.on_sweep(changed_ids)
+        return changed_ids
+    
+    def _next_delay(self, first=False):
+        """Seconds until the next sweep; jitter spreads sweeps of several clients apart"""
+        if first:
+            return random.uniform(0, self.jitter)
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+    
+    def _run(self):
+        delay = self._next_delay(first=True)
+        while not self._stop_event.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+            delay = self._next_delay()
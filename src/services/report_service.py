@@ -1,61 +1,59 @@
 import csv
+import gzip
+import time
 from datetime import datetime
 
+from dao.vypujcka_dao import select_vypujcky, select_with_archive
+
 class ReportService:
     """Service for generating reports"""
     
-    def __init__(self, database):
+    def __init__(self, database, batch_size=1000, summary_ttl=30):
         self.db = database
+        self.batch_size = batch_size
+        self.summary_ttl = summary_ttl
+        # (created_at, statistics) of the last summary query
+        self._summary_cache = None
+        # Rows written and elapsed seconds of the last generated report
+        self.last_report_stats = None
     
-    def generate_knihy_report(self, output_file='report_knihy.csv'):
-        """Generate knihy report with aggregated data from multiple tables"""
+    def generate_knihy_report(self, output_file='report_knihy.csv', compress=False, progress_callback=None):
+        """Generate knihy report (loan counters come from statistiky_knih)"""
         query = """
             SELECT 
                 k.id,
                 k.nazev,
                 k.isbn,
                 z.nazev as zanr,
-                GROUP_CONCAT(CONCAT(a.jmeno, ' ', a.prijmeni) SEPARATOR ', ') as autori,
+                (SELECT GROUP_CONCAT(CONCAT(a.jmeno, ' ', a.prijmeni) SEPARATOR ', ')
+                 FROM knihy_autori ka JOIN autori a ON ka.autor_id = a.id
+                 WHERE ka.kniha_id = k.id) as autori,
                 k.rok_vydani,
                 k.pocet_stran,
                 k.hodnoceni,
                 k.dostupna,
-                COUNT(DISTINCT v.id) as pocet_vypujcek,
-                COUNT(DISTINCT CASE WHEN v.stav = 'active' THEN v.id END) as aktivnich_vypujcek,
-                COUNT(DISTINCT CASE WHEN v.stav = 'returned' THEN v.id END) as vraceno,
-                COUNT(DISTINCT CASE WHEN v.stav = 'overdue' THEN v.id END) as po_terminu,
-                MAX(v.datum_vypujceni) as posledni_vypujcka
+                k.pocet_exemplaru,
+                k.dostupne_exemplare,
+                COALESCE(s.pocet_vypujcek, 0) as pocet_vypujcek,
+                COALESCE(s.aktivnich_vypujcek, 0) as aktivnich_vypujcek,
+                COALESCE(s.vraceno, 0) as vraceno,
+                COALESCE(s.po_terminu, 0) as po_terminu,
+                s.posledni_vypujcka
             FROM knihy k
             LEFT JOIN zanry z ON k.zanr_id = z.id
-            LEFT JOIN knihy_autori ka ON k.id = ka.kniha_id
-            LEFT JOIN autori a ON ka.autor_id = a.id
-            LEFT JOIN vypujcky v ON k.id = v.kniha_id
-            GROUP BY k.id, k.nazev, k.isbn, z.nazev, k.rok_vydani, k.pocet_stran, k.hodnoceni, k.dostupna
+            LEFT JOIN statistiky_knih s ON s.kniha_id = k.id
             ORDER BY pocet_vypujcek DESC, k.nazev
         """
         
         try:
-            results = self.db.execute_select(query)
-            
-            # Write to CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if not results:
-                    f.write("No data available\n")
-                    return output_file
-                
-                writer = csv.DictWriter(f, fieldnames=results[0].keys())
-                writer.writeheader()
-                writer.writerows(results)
-            
-            return output_file
-            
+            return self._write_csv(query, output_file, compress, progress_callback)
         except Exception as e:
             raise Exception(f"Failed to generate knihy report: {e}")
     
-    def generate_vypujcky_report(self, output_file='report_vypujcky.csv'):
+    def generate_vypujcky_report(self, output_file='report_vypujcky.csv', compress=False, progress_callback=None,
+                                 include_archive=False):
         """Generate vypujcky report with aggregated data from multiple tables"""
-        query = """
-            SELECT 
+        columns = """
                 v.id as vypujcka_id,
                 k.nazev as kniha,
                 k.isbn,
@@ -71,34 +69,19 @@ class ReportService:
                         THEN DATEDIFF(v.datum_vraceni, v.predpokladane_vraceni)
                     ELSE 0
                 END as dny_po_terminu,
-                v.poznamka
-            FROM vypujcky v
-            JOIN knihy k ON v.kniha_id = k.id
-            JOIN ctenari c ON v.ctenar_id = c.id
-            WHERE v.stav != 'cancelled'
-            ORDER BY v.datum_vypujceni DESC
-        """
+                v.poznamka"""
+        if include_archive:
+            query = select_with_archive(columns, "v.stav != 'cancelled'", "datum_vypujceni DESC")
+        else:
+            query = select_vypujcky('vypujcky', columns) + "WHERE v.stav != 'cancelled' ORDER BY v.datum_vypujceni DESC"
         
         try:
-            results = self.db.execute_select(query)
-            
-            # Write to CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if not results:
-                    f.write("No data available\n")
-                    return output_file
-                
-                writer = csv.DictWriter(f, fieldnames=results[0].keys())
-                writer.writeheader()
-                writer.writerows(results)
-            
-            return output_file
-            
+            return self._write_csv(query, output_file, compress, progress_callback)
         except Exception as e:
             raise Exception(f"Failed to generate vypujcky report: {e}")
     
-    def generate_ctenari_statistics(self, output_file='report_ctenari.csv'):
-        """Generate ctenari statistics report"""
+    def generate_ctenari_statistics(self, output_file='report_ctenari.csv', compress=False, progress_callback=None):
+        """Generate ctenari statistics report (loan counters come from statistiky_ctenaru)"""
         query = """
             SELECT 
                 c.id,
@@ -106,56 +89,85 @@ class ReportService:
                 c.email,
                 c.registrovan_od,
                 c.aktivni,
-                COUNT(DISTINCT v.id) as celkem_vypujcek,
-                COUNT(DISTINCT CASE WHEN v.stav = 'active' THEN v.id END) as aktivnich_vypujcek,
-                COUNT(DISTINCT CASE WHEN v.stav = 'overdue' THEN v.id END) as po_terminu,
-                COUNT(DISTINCT CASE WHEN v.stav = 'returned' THEN v.id END) as vraceno,
-                MAX(v.datum_vypujceni) as posledni_vypujcka
+                COALESCE(s.pocet_vypujcek, 0) as celkem_vypujcek,
+                COALESCE(s.aktivnich_vypujcek, 0) as aktivnich_vypujcek,
+                COALESCE(s.po_terminu, 0) as po_terminu,
+                COALESCE(s.vraceno, 0) as vraceno,
+                s.posledni_vypujcka
             FROM ctenari c
-            LEFT JOIN vypujcky v ON c.id = v.ctenar_id
-            GROUP BY c.id, c.jmeno, c.prijmeni, c.email, c.registrovan_od, c.aktivni
+            LEFT JOIN statistiky_ctenaru s ON s.ctenar_id = c.id
             ORDER BY celkem_vypujcek DESC
         """
         
         try:
-            results = self.db.execute_select(query)
-            
-            # Write to CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if not results:
-                    f.write("No data available\n")
-                    return output_file
-                
-                writer = csv.DictWriter(f, fieldnames=results[0].keys())
-                writer.writeheader()
-                writer.writerows(results)
-            
-            return output_file
-            
+            return self._write_csv(query, output_file, compress, progress_callback)
         except Exception as e:
             raise Exception(f"Failed to generate ctenari statistics: {e}")
     
     def get_summary_statistics(self):
-        """Get summary statistics from database"""
-        queries = {
-            'total_knihy': "SELECT COUNT(*) as count FROM knihy",
-            'dostupne_knihy': "SELECT COUNT(*) as count FROM knihy WHERE dostupna = TRUE",
-            'total_autori': "SELECT COUNT(*) as count FROM autori",
-            'total_ctenari': "SELECT COUNT(*) as count FROM ctenari",
-            'aktivni_ctenari': "SELECT COUNT(*) as count FROM ctenari WHERE aktivni = TRUE",
-            'aktivni_vypujcky': "SELECT COUNT(*) as count FROM vypujcky WHERE stav = 'active'",
-            'overdue_vypujcky': "SELECT COUNT(*) as count FROM vypujcky WHERE stav = 'overdue'",
-            'total_vypujcky': "SELECT COUNT(*) as count FROM vypujcky WHERE stav != 'cancelled'"
-        }
+        """Get summary statistics from database (one query, cached for summary_ttl seconds)"""
+        cached = self._summary_cache
+        if cached is not None and time.monotonic() - cached[0] < self.summary_ttl:
+            return dict(cached[1])
         
-        statistics = {}
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM knihy) as total_knihy,
+                (SELECT COUNT(*) FROM knihy WHERE dostupna = TRUE) as dostupne_knihy,
+                (SELECT SUM(dostupne_exemplare) FROM knihy) as dostupne_exemplare,
+                (SELECT COUNT(*) FROM autori) as total_autori,
+                (SELECT COUNT(*) FROM ctenari) as total_ctenari,
+                (SELECT COUNT(*) FROM ctenari WHERE aktivni = TRUE) as aktivni_ctenari,
+                (SELECT SUM(aktivnich_vypujcek) FROM statistiky_ctenaru) as aktivni_vypujcky,
+                (SELECT SUM(po_terminu) FROM statistiky_ctenaru) as overdue_vypujcky,
+                (SELECT SUM(pocet_vypujcek - zruseno) FROM statistiky_ctenaru) as total_vypujcky
+        """
         
         try:
-            for key, query in queries.items():
-                result = self.db.execute_select(query)
-                statistics[key] = result[0]['count'] if result else 0
+            result = self.db.execute_select(query)
+            statistics = {key: int(value or 0) for key, value in result[0].items()}
             
-            return statistics
+            self._summary_cache = (time.monotonic(), statistics)
+            return dict(statistics)
             
         except Exception as e:
             raise Exception(f"Failed to get summary statistics: {e}")
+    
+    def invalidate_summary_cache(self):
+        """Drop cached summary statistics after data changed"""
+        self._summary_cache = None
+    
+    def _write_csv(self, query, output_file, compress=False, progress_callback=None):
+        """
+        Stream query results into a CSV file batch by batch.
+        Output is gzip-compressed when compress is set or the file ends with .gz;
+        progress_callback(rows_written, elapsed_seconds) is called after every batch.
+        """
+        compress = compress or output_file.endswith('.gz')
+        if compress and not output_file.endswith('.gz'):
+            output_file += '.gz'
+        opener = gzip.open if compress else open
+        
+        started = time.monotonic()
+        rows_written = 0
+        
+        with opener(output_file, 'wt', newline='', encoding='utf-8') as f:
+            writer = None
+            for rows in self.db.stream_select(query, batch_size=self.batch_size):
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+                    writer.writeheader()
+                writer.writerows(rows)
+                rows_written += len(rows)
+                
+                if progress_callback:
+                    progress_callback(rows_written, time.monotonic() - started)
+            
+            if writer is None:
+                f.write("No data available\n")
+        
+        self.last_report_stats = {
+            'rows': rows_written,
+            'elapsed': time.monotonic() - started
+        }
+        return output_file
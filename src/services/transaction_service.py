@@ -1,36 +1,111 @@
+import random
+import time
+from collections import defaultdict
 from datetime import datetime
+from dao.statistiky_dao import StatistikyDelta
+from dao.exemplar_dao import BookAlreadyLentError, claim_exemplar
+from dao.vypujcka_dao import VypujckaNotActiveError, close_vypujcka
+
+# MySQL deadlock and lock wait timeout, the transaction can simply be retried
+RETRYABLE_ERRNOS = (1213, 1205)
+# Max IDs per IN (...) list in batch operations
+BATCH_CHUNK_SIZE = 1000
+
+
+def chunks(items, size=BATCH_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def unique_ids(ids, failed, key):
+    """Drop repeated IDs, reporting them in failed"""
+    seen = set()
+    result = []
+    for item_id in ids:
+        if item_id in seen:
+            failed.append({key: item_id, 'reason': 'duplicate'})
+            continue
+        seen.add(item_id)
+        result.append(item_id)
+    return result
+
+
+def is_retryable(error):
+    """True for deadlock / lock wait timeout errors raised by Database.transaction"""
+    cause = error
+    while cause is not None:
+        if getattr(cause, 'errno', None) in RETRYABLE_ERRNOS:
+            return True
+        cause = cause.__cause__
+    return False
+
 
 class TransactionService:
     """Service for handling database transactions"""
     
-    def __init__(self, database, kniha_dao, vypujcka_dao):
+    def __init__(self, database, kniha_dao, vypujcka_dao, report_service=None,
+                 max_retries=3, retry_backoff=0.05):
         self.db = database
         self.kniha_dao = kniha_dao
         self.vypujcka_dao = vypujcka_dao
+        # Summary statistics cache to invalidate after each transaction
+        self.report_service = report_service
+        # Deadlock retries, backoff doubles with each attempt (plus jitter)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+    
+    def _run_with_retry(self, work):
+        """Run work(cursor) in a transaction, retrying on deadlock / lock wait timeout"""
+        attempt = 0
+        while True:
+            try:
+                with self.db.transaction() as cursor:
+                    return work(cursor)
+            except (BookAlreadyLentError, VypujckaNotActiveError):
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+                attempt += 1
+    
+    def _invalidate_statistics(self):
+        """Invalidate cached summary statistics"""
+        if self.report_service:
+            self.report_service.invalidate_summary_cache()
     
     def create_vypujcka_transaction(self, kniha_id, ctenar_id, predpokladane_vraceni, poznamka=None):
         """
         Create new vypujcka with transaction:
-        1. Insert vypujcka record
-        2. Set kniha.dostupna = FALSE
-        Both operations must succeed or both fail
+        1. Claim one copy of the kniha (dostupne_exemplare - 1)
+        2. Mark an available exemplar as lent
+        3. Insert vypujcka record and count it in the statistics
+        All operations must succeed or all fail.
+        Raises BookAlreadyLentError when no exemplar is available.
         """
-        queries = [
-            # Insert vypujcka
-            ("""
-                INSERT INTO vypujcky (kniha_id, ctenar_id, datum_vypujceni, 
+        def borrow(cursor):
+            exemplar_id = claim_exemplar(cursor, kniha_id)
+            
+            datum_vypujceni = datetime.now()
+            cursor.execute("""
+                INSERT INTO vypujcky (kniha_id, exemplar_id, ctenar_id, datum_vypujceni, 
                                      predpokladane_vraceni, stav, poznamka)
-                VALUES (%s, %s, %s, %s, 'active', %s)
-            """, (kniha_id, ctenar_id, datetime.now(), predpokladane_vraceni, poznamka)),
+                VALUES (%s, %s, %s, %s, %s, 'active', %s)
+            """, (kniha_id, exemplar_id, ctenar_id, datum_vypujceni, predpokladane_vraceni, poznamka))
+            vypujcka_id = cursor.lastrowid
             
-            # Update kniha availability
-            ("UPDATE knihy SET dostupna = FALSE WHERE id = %s", (kniha_id,))
-        ]
+            delta = StatistikyDelta()
+            delta.add_loan(kniha_id, ctenar_id, 'active', datum_vypujceni)
+            delta.apply(cursor)
+            return vypujcka_id
         
         try:
-            results = self.db.execute_transaction(queries)
-            vypujcka_id = results[0]  # First query returns inserted ID
+            vypujcka_id = self._run_with_retry(borrow)
+            self._invalidate_statistics()
             return vypujcka_id
+        except BookAlreadyLentError:
+            raise
         except Exception as e:
             raise Exception(f"Transaction failed: {e}")
     
@@ -38,24 +113,22 @@ class TransactionService:
         """
         Return book with transaction:
         1. Update vypujcka (set returned, set datum_vraceni)
-        2. Set kniha.dostupna = TRUE
-        Both operations must succeed or both fail
+        2. Give its exemplar back (dostupne_exemplare + 1)
+        3. Move the loan to the returned statistics
+        All operations must succeed or all fail.
+        Raises VypujckaNotActiveError when the vypujcka is already closed,
+        so a repeated return cannot free a kniha lent again in the meantime.
         """
-        queries = [
-            # Update vypujcka
-            ("""
-                UPDATE vypujcky 
-                SET stav = 'returned', datum_vraceni = %s
-                WHERE id = %s
-            """, (datetime.now(), vypujcka_id)),
-            
-            # Update kniha availability
-            ("UPDATE knihy SET dostupna = TRUE WHERE id = %s", (kniha_id,))
-        ]
+        def return_book(cursor):
+            close_vypujcka(cursor, vypujcka_id, 'returned', datetime.now())
+            return True
         
         try:
-            self.db.execute_transaction(queries)
+            self._run_with_retry(return_book)
+            self._invalidate_statistics()
             return True
+        except VypujckaNotActiveError:
+            raise
         except Exception as e:
             raise Exception(f"Transaction failed: {e}")
     
@@ -63,19 +136,200 @@ class TransactionService:
         """
         Cancel vypujcka with transaction:
         1. Update vypujcka state to cancelled
-        2. Set kniha.dostupna = TRUE
-        Both operations must succeed or both fail
+        2. Give its exemplar back (dostupne_exemplare + 1)
+        3. Move the loan to the cancelled statistics
+        All operations must succeed or all fail.
+        Raises VypujckaNotActiveError when the vypujcka is already closed.
         """
-        queries = [
-            # Cancel vypujcka
-            ("UPDATE vypujcky SET stav = 'cancelled' WHERE id = %s", (vypujcka_id,)),
-            
-            # Update kniha availability
-            ("UPDATE knihy SET dostupna = TRUE WHERE id = %s", (kniha_id,))
-        ]
+        def cancel(cursor):
+            close_vypujcka(cursor, vypujcka_id, 'cancelled')
+            return True
         
         try:
-            self.db.execute_transaction(queries)
+            self._run_with_retry(cancel)
+            self._invalidate_statistics()
             return True
+        except VypujckaNotActiveError:
+            raise
+        except Exception as e:
+            raise Exception(f"Transaction failed: {e}")
+    
+    def borrow_books_transaction(self, kniha_ids, ctenar_id, predpokladane_vraceni, poznamka=None):
+        """
+        Lend many knihy to one ctenar in a single transaction:
+        1. Lock the requested knihy (SELECT ... FOR UPDATE)
+        2. Pick one available exemplar per kniha
+        3. Claim them with one UPDATE on knihy and one on exemplare
+        4. Insert all vypujcky with one executemany
+        5. Count them in the statistics
+        Returns {'succeeded': [{'kniha_id', 'vypujcka_id'}],
+                 'failed': [{'kniha_id', 'reason'}]} where reason is
+        'already_lent', 'not_found' or 'duplicate'.
+        """
+        def borrow(cursor):
+            failed = []
+            requested = unique_ids(list(kniha_ids), failed, 'kniha_id')
+            
+            dostupne_by_id = {}
+            exemplar_by_kniha = {}
+            for chunk in chunks(requested):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"SELECT id, dostupne_exemplare FROM knihy WHERE id IN ({placeholders}) FOR UPDATE",
+                    tuple(chunk)
+                )
+                dostupne_by_id.update(cursor.fetchall())
+                # Exemplare only change under their kniha's lock, which we hold
+                cursor.execute(f"""
+                    SELECT kniha_id, MIN(id) FROM exemplare
+                    WHERE stav = 'dostupny' AND kniha_id IN ({placeholders})
+                    GROUP BY kniha_id
+                """, tuple(chunk))
+                exemplar_by_kniha.update(cursor.fetchall())
+            
+            claimed = []
+            for kniha_id in requested:
+                if kniha_id not in dostupne_by_id:
+                    failed.append({'kniha_id': kniha_id, 'reason': 'not_found'})
+                elif dostupne_by_id[kniha_id] <= 0 or kniha_id not in exemplar_by_kniha:
+                    failed.append({'kniha_id': kniha_id, 'reason': 'already_lent'})
+                else:
+                    claimed.append(kniha_id)
+            
+            if not claimed:
+                return {'succeeded': [], 'failed': failed}
+            
+            for chunk in chunks(claimed):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"""
+                    UPDATE knihy
+                    SET dostupna = (dostupne_exemplare > 1), dostupne_exemplare = dostupne_exemplare - 1
+                    WHERE id IN ({placeholders})
+                """, tuple(chunk))
+                cursor.execute(
+                    f"UPDATE exemplare SET stav = 'vypujceny' WHERE id IN ({placeholders})",
+                    tuple(exemplar_by_kniha[kniha_id] for kniha_id in chunk)
+                )
+            
+            datum_vypujceni = datetime.now()
+            cursor.executemany("""
+                INSERT INTO vypujcky (kniha_id, exemplar_id, ctenar_id, datum_vypujceni, 
+                                     predpokladane_vraceni, stav, poznamka)
+                VALUES (%s, %s, %s, %s, %s, 'active', %s)
+            """, [(kniha_id, exemplar_by_kniha[kniha_id], ctenar_id, datum_vypujceni,
+                   predpokladane_vraceni, poznamka)
+                  for kniha_id in claimed])
+            
+            # Each claimed exemplar has exactly one active vypujcka now:
+            # the one just inserted
+            vypujcka_by_exemplar = {}
+            for chunk in chunks(claimed):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"SELECT exemplar_id, id FROM vypujcky WHERE stav = 'active' AND exemplar_id IN ({placeholders})",
+                    tuple(exemplar_by_kniha[kniha_id] for kniha_id in chunk)
+                )
+                vypujcka_by_exemplar.update(cursor.fetchall())
+            
+            delta = StatistikyDelta()
+            for kniha_id in claimed:
+                delta.add_loan(kniha_id, ctenar_id, 'active', datum_vypujceni)
+            delta.apply(cursor)
+            
+            succeeded = [{'kniha_id': kniha_id,
+                          'vypujcka_id': vypujcka_by_exemplar.get(exemplar_by_kniha[kniha_id])}
+                         for kniha_id in claimed]
+            return {'succeeded': succeeded, 'failed': failed}
+        
+        try:
+            result = self._run_with_retry(borrow)
+            if result['succeeded']:
+                self._invalidate_statistics()
+            return result
+        except Exception as e:
+            raise Exception(f"Transaction failed: {e}")
+    
+    def return_books_transaction(self, vypujcka_ids):
+        """
+        Return many vypujcky in a single transaction:
+        1. Lock the vypujcky (SELECT ... FOR UPDATE)
+        2. Close the open ones with one UPDATE
+        3. Give their exemplare back (knihy counters, then exemplare)
+        4. Move the loans to the returned statistics
+        Returns {'succeeded': [{'vypujcka_id', 'kniha_id'}],
+                 'failed': [{'vypujcka_id', 'reason'}]} where reason is
+        'not_active', 'not_found' or 'duplicate'.
+        """
+        def return_books(cursor):
+            failed = []
+            requested = unique_ids(list(vypujcka_ids), failed, 'vypujcka_id')
+            
+            loans = {}
+            for chunk in chunks(requested):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"SELECT id, kniha_id, stav, exemplar_id, ctenar_id FROM vypujcky WHERE id IN ({placeholders}) FOR UPDATE",
+                    tuple(chunk)
+                )
+                for vypujcka_id, *loan in cursor.fetchall():
+                    loans[vypujcka_id] = loan
+            
+            succeeded = []
+            for vypujcka_id in requested:
+                if vypujcka_id not in loans:
+                    failed.append({'vypujcka_id': vypujcka_id, 'reason': 'not_found'})
+                elif loans[vypujcka_id][1] not in ('active', 'overdue'):
+                    failed.append({'vypujcka_id': vypujcka_id, 'reason': 'not_active'})
+                else:
+                    succeeded.append({'vypujcka_id': vypujcka_id, 'kniha_id': loans[vypujcka_id][0]})
+            
+            datum_vraceni = datetime.now()
+            for chunk in chunks(succeeded):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"""
+                    UPDATE vypujcky 
+                    SET stav = 'returned', datum_vraceni = %s
+                    WHERE id IN ({placeholders})
+                """, (datum_vraceni, *[item['vypujcka_id'] for item in chunk]))
+            
+            # A kniha can get several exemplare back, one UPDATE per count
+            exemplar_ids = []
+            returned_by_kniha = defaultdict(int)
+            for item in succeeded:
+                exemplar_id = loans[item['vypujcka_id']][2]
+                if exemplar_id is not None:
+                    exemplar_ids.append(exemplar_id)
+                    returned_by_kniha[item['kniha_id']] += 1
+            knihy_by_count = defaultdict(list)
+            for kniha_id, count in returned_by_kniha.items():
+                knihy_by_count[count].append(kniha_id)
+            
+            for count, kniha_ids_for_count in knihy_by_count.items():
+                for chunk in chunks(kniha_ids_for_count):
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    cursor.execute(f"""
+                        UPDATE knihy SET dostupne_exemplare = dostupne_exemplare + %s, dostupna = TRUE
+                        WHERE id IN ({placeholders})
+                    """, (count, *chunk))
+            for chunk in chunks(exemplar_ids):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"UPDATE exemplare SET stav = 'dostupny' WHERE id IN ({placeholders})",
+                    tuple(chunk)
+                )
+            
+            delta = StatistikyDelta()
+            for item in succeeded:
+                kniha_id, stav, _, ctenar_id = loans[item['vypujcka_id']]
+                delta.change_stav(kniha_id, ctenar_id, stav, 'returned')
+            delta.apply(cursor)
+            
+            return {'succeeded': succeeded, 'failed': failed}
+        
+        try:
+            result = self._run_with_retry(return_books)
+            if result['succeeded']:
+                self._invalidate_statistics()
+            return result
         except Exception as e:
             raise Exception(f"Transaction failed: {e}")
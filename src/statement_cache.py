@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+
+class StatementCache:
+    """
+    Server-side prepared statements of one connection, keyed by SQL text.
+
+    Each statement lives in its own prepared cursor. The least recently
+    used one is closed (and deallocated on the server) when the cache is
+    full. A connection is used by one thread at a time, so no locking.
+    The cache does not keep its connection alive, the owner passes it to
+    get() and clears the cache when the connection is closed.
+    """
+
+    def __init__(self, size=64):
+        self.size = size
+        self._statements = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, connection, sql):
+        """
+        Return (cursor, sql) for the statement on connection. Execute with
+        the returned sql object: the driver re-prepares when it is not the
+        same object it last executed.
+        """
+        entry = self._statements.get(sql)
+        if entry is not None:
+            self._statements.move_to_end(sql)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = (connection.cursor(prepared=True), sql)
+        self._statements[sql] = entry
+        while len(self._statements) > self.size:
+            _, (cursor, _) = self._statements.popitem(last=False)
+            self._close(cursor)
+        return entry
+
+    def discard(self, sql):
+        """Drop a statement, e.g. after it failed"""
+        entry = self._statements.pop(sql, None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def clear(self):
+        for cursor, _ in self._statements.values():
+            self._close(cursor)
+        self._statements.clear()
+
+    def __len__(self):
+        return len(self._statements)
+
+    @staticmethod
+    def _close(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
@@ -0,0 +1,269 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Upper bound for one fetch when the user jumps far past the loaded rows
+MAX_FETCH = 5000
+
+
+def run_now(fn, *args, on_success=None, on_error=None, key=None, **kwargs):
+    """Synchronous stand-in for DbWorker.submit"""
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        if on_error is None:
+            raise
+        on_error(e)
+        return
+    if on_success:
+        on_success(result)
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    Treeview that only creates items for the visible rows.
+
+    A fixed set of row items is reused while scrolling: their values are
+    swapped for the records at the current position. Records come from a
+    keyset page source (a DAO *_page method) and are fetched lazily as the
+    view approaches the end of what has been loaded, or from a fixed list.
+    The scrollbar is driven by the virtual position, not by the Treeview.
+    """
+
+    def __init__(self, parent, columns, row_values, page_size=200, prefetch=50,
+                 submit=None, on_error=None):
+        super().__init__(parent)
+        # row_values(record) -> tuple of column values
+        self.row_values = row_values
+        self.page_size = page_size
+        # Start fetching when fewer than this many loaded rows remain below the view
+        self.prefetch = prefetch
+        # DbWorker.submit compatible callable, loads run synchronously without one
+        self.submit = submit or run_now
+        self.on_error = on_error
+
+        self.scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse")
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self._records = []
+        self._page_source = None
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._total = None
+        # Bumped on every new source so late results of the old one are dropped
+        self._generation = 0
+
+        # Virtual index of the first visible row and of the selected record
+        self._first = 0
+        self._selected = None
+        # Reused Treeview item IDs, one per visible row
+        self._slots = []
+        self._detached = set()
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_units(-self._visible_rows()))
+        self.tree.bind("<Next>", lambda e: self._scroll_units(self._visible_rows()))
+
+    def set_source(self, page_source, count_source=None):
+        """
+        Show records from page_source(after=..., limit=...) returning
+        {'items', 'next_cursor'}; count_source() sizes the scrollbar.
+        """
+        self._reset()
+        self._page_source = page_source
+        self._has_more = True
+        generation = self._generation
+
+        if count_source is not None:
+            self.submit(
+                count_source,
+                on_success=lambda total: self._count_loaded(generation, total),
+                on_error=lambda e: self._load_failed(generation, e)
+            )
+        self._ensure_loaded(self._visible_rows() + self.prefetch)
+        self._render()
+
+    def set_items(self, records):
+        """Show a fixed list of records"""
+        self._reset()
+        self._records = list(records)
+        self._total = len(self._records)
+        self._render()
+
+    def selected_record(self):
+        """Record of the selected row or None"""
+        if self._selected is None or self._selected >= len(self._records):
+            return None
+        return self._records[self._selected]
+
+    def __len__(self):
+        return len(self._records)
+
+    def _reset(self):
+        self._generation += 1
+        self._records = []
+        self._page_source = None
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._total = None
+        self._first = 0
+        self._selected = None
+
+    def _ensure_loaded(self, needed):
+        """Fetch pages until `needed` records are loaded or the source ends"""
+        if self._loading or not self._has_more or len(self._records) >= needed:
+            return
+
+        self._loading = True
+        generation = self._generation
+        limit = min(max(self.page_size, needed - len(self._records)), MAX_FETCH)
+        self.submit(
+            self._page_source, after=self._next_cursor, limit=limit,
+            on_success=lambda page: self._page_loaded(generation, page, needed),
+            on_error=lambda e: self._load_failed(generation, e)
+        )
+
+    def _page_loaded(self, generation, page, needed):
+        if generation != self._generation or not self.winfo_exists():
+            return
+
+        self._loading = False
+        self._records.extend(page['items'])
+        self._next_cursor = page['next_cursor']
+        self._has_more = self._next_cursor is not None
+        if not self._has_more:
+            self._total = len(self._records)
+
+        self._render()
+        # Rows below the view may have been requested while this page was loading
+        self._ensure_loaded(max(needed, self._first + self._visible_rows() + self.prefetch))
+
+    def _count_loaded(self, generation, total):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        if self._has_more:
+            self._total = total
+            self._update_scrollbar()
+
+    def _load_failed(self, generation, error):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self._loading = False
+        self._has_more = False
+        if self.on_error:
+            self.on_error(error)
+
+    def _row_count(self):
+        """Virtual number of rows the scrollbar spans"""
+        if self._total is not None:
+            return max(self._total, len(self._records))
+        return len(self._records) + (self.page_size if self._has_more else 0)
+
+    def _visible_rows(self):
+        return max(len(self._slots), 1)
+
+    def _on_configure(self, event):
+        """Keep one reused item per row that fits in the widget"""
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        header = rowheight
+        if self._slots:
+            bbox = self.tree.bbox(self._slots[0])
+            if bbox:
+                header = bbox[1]
+        rows = max(1, (event.height - header) // rowheight)
+
+        while len(self._slots) < rows:
+            self._slots.append(self.tree.insert("", tk.END, values=()))
+        while len(self._slots) > rows:
+            iid = self._slots.pop()
+            self._detached.discard(iid)
+            self.tree.delete(iid)
+
+        self._ensure_loaded(self._first + rows + self.prefetch)
+        self._render()
+
+    def _render(self):
+        """Fill the reused items with the records at the current position"""
+        visible = len(self._slots)
+        self._first = max(0, min(self._first, len(self._records) - visible))
+
+        for position, iid in enumerate(self._slots):
+            index = self._first + position
+            if index < len(self._records):
+                self.tree.item(iid, values=self.row_values(self._records[index]))
+                if iid in self._detached:
+                    self.tree.move(iid, "", position)
+                    self._detached.discard(iid)
+            elif iid not in self._detached:
+                self.tree.detach(iid)
+                self._detached.add(iid)
+
+        selected = None
+        if self._selected is not None and 0 <= self._selected - self._first < visible:
+            selected = self._slots[self._selected - self._first]
+        if selected is not None and selected not in self._detached:
+            if self.tree.selection() != (selected,):
+                self.tree.selection_set(selected)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        self.tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = self._row_count()
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self._first / total, min(1, (self._first + len(self._slots)) / total))
+
+    def _scroll_to(self, first):
+        self._first = max(0, first)
+        self._ensure_loaded(self._first + self._visible_rows() + self.prefetch)
+        self._render()
+
+    def _scroll_units(self, units):
+        self._scroll_to(self._first + units)
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * self._row_count()))
+        elif args[0] == "scroll":
+            step = self._visible_rows() if args[2] == "pages" else 1
+            self._scroll_to(self._first + int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        units = -(event.delta // 120) if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_units(units * 3)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._slots:
+            self._selected = self._first + self._slots.index(selection[0])
+
+    def _on_arrow(self, step):
+        """Move the selection past the edge of the view by scrolling"""
+        if self._selected is None:
+            return None
+
+        target = self._selected + step
+        if target < 0 or target >= len(self._records):
+            return "break"
+        self._selected = target
+        if not self._first <= target < self._first + len(self._slots):
+            self._scroll_to(target if step < 0 else target - len(self._slots) + 1)
+        else:
+            self._render()
+        self.tree.focus(self._slots[target - self._first])
+        return "break"